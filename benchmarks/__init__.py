@@ -0,0 +1,6 @@
+# Copyright: See the LICENSE file.
+
+"""Performance benchmarks for factory_boy.
+
+Run them with ``python -m benchmarks``; see ``python -m benchmarks --help``.
+"""
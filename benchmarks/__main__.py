@@ -0,0 +1,65 @@
+# Copyright: See the LICENSE file.
+
+import argparse
+import sys
+
+from . import alchemy_orm, core, django_orm  # noqa: F401 -- registers the benchmarks
+from .runner import compare_results, get_benchmarks, load_results, save_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run the factory_boy benchmarks.")
+    parser.add_argument(
+        'patterns', nargs='*',
+        help="Only run the benchmarks whose name contains one of these patterns.",
+    )
+    parser.add_argument('--list', action='store_true', help="List the benchmarks and exit.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs per benchmark (default: 5).")
+    parser.add_argument('--size', type=int, help="Override the number of objects generated per run.")
+    parser.add_argument('--save', metavar='PATH', help="Store the results in a JSON file.")
+    parser.add_argument('--compare', metavar='PATH', help="Compare the results with a stored JSON file.")
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help="Relative slowdown reported as a regression by --compare (default: 0.1).",
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = get_benchmarks(args.patterns)
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return 0
+    baseline = load_results(args.compare) if args.compare else None
+
+    results = {}
+    failures = []
+    print('%-40s %8s %14s %14s' % ('benchmark', 'size', 'objects/s', 'peak B/object'))
+    for bench in benchmarks:
+        try:
+            result = bench.measure(repeat=args.repeat, size=args.size)
+        except Exception as e:
+            failures.append(bench.name)
+            print('%-40s failed: %r' % (bench.name, e))
+            continue
+        results[bench.name] = result
+        print('%-40s %8d %14.0f %14.0f' % (
+            bench.name, result['size'], result['objects_per_second'], result['peak_bytes_per_object'],
+        ))
+
+    if args.save:
+        save_results(args.save, results)
+
+    status = 1 if failures else 0
+    if baseline is not None:
+        lines, regressions = compare_results(baseline, results, args.threshold)
+        print()
+        print('\n'.join(lines))
+        if regressions:
+            print()
+            print("Regressions over %d%%: %s" % (args.threshold * 100, ', '.join(regressions)))
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# Copyright: See the LICENSE file.
+
+"""Benchmarks of SQLAlchemyModelFactory, on an in-memory SQLite database."""
+
+try:
+    import sqlalchemy
+except ImportError:
+    sqlalchemy = None
+
+from .runner import benchmark
+
+if sqlalchemy is not None:
+    from sqlalchemy import Column, ForeignKey, Integer, Unicode, create_engine
+    from sqlalchemy.orm import (
+        declarative_base,
+        relationship,
+        scoped_session,
+        sessionmaker,
+    )
+
+    import factory.alchemy
+
+    engine = create_engine('sqlite://')
+    session = scoped_session(sessionmaker(bind=engine))
+    Base = declarative_base()
+
+    class Author(Base):
+        __tablename__ = 'author'
+
+        id = Column(Integer(), primary_key=True)
+        name = Column(Unicode(50))
+        email = Column(Unicode(100))
+
+    class Book(Base):
+        __tablename__ = 'book'
+
+        id = Column(Integer(), primary_key=True)
+        title = Column(Unicode(100))
+        pages = Column(Integer())
+        author_id = Column(Integer(), ForeignKey('author.id'))
+        author = relationship(Author)
+
+    Base.metadata.create_all(engine)
+
+    class AuthorFactory(factory.alchemy.SQLAlchemyModelFactory):
+        class Meta:
+            model = Author
+            sqlalchemy_session = session
+
+        name = factory.Sequence(lambda n: 'author%d' % n)
+        email = factory.LazyAttribute(lambda o: '%s@example.com' % o.name)
+
+    class FlushAuthorFactory(AuthorFactory):
+        class Meta:
+            sqlalchemy_session_persistence = 'flush'
+
+    class BookFactory(factory.alchemy.SQLAlchemyModelFactory):
+        class Meta:
+            model = Book
+            sqlalchemy_session = session
+
+        title = factory.Sequence(lambda n: 'book%d' % n)
+        pages = 300
+        author = factory.SubFactory(AuthorFactory)
+
+    def reset_tables():
+        session.rollback()
+        session.query(Book).delete()
+        session.query(Author).delete()
+        session.commit()
+
+    @benchmark(size=1000, setup=reset_tables)
+    def create(size):
+        AuthorFactory.create_batch(size)
+        session.flush()
+
+    @benchmark(size=1000, setup=reset_tables)
+    def create_flush(size):
+        FlushAuthorFactory.create_batch(size)
+
+    @benchmark(size=500, setup=reset_tables)
+    def create_subfactory(size):
+        BookFactory.create_batch(size)
+        session.flush()
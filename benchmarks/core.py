@@ -0,0 +1,185 @@
+# Copyright: See the LICENSE file.
+
+"""Benchmarks of the builder and declarations, without a database."""
+
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import factory
+from factory import fuzzy
+
+from .runner import benchmark
+
+
+class Record:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FlatFactory(factory.Factory):
+    class Meta:
+        model = Record
+
+    id = factory.Sequence(int)
+    name = factory.Sequence(lambda n: 'name%d' % n)
+    active = True
+    score = 42
+    label = factory.LazyAttribute(lambda o: '%s-%d' % (o.name, o.score))
+    slug = factory.SelfAttribute('name')
+
+
+@benchmark(size=5000)
+def flat_build(size):
+    FlatFactory.build_batch(size)
+
+
+class CompiledFlatFactory(FlatFactory):
+    class Meta:
+        compile = True
+
+
+@benchmark(size=5000)
+def flat_build_compiled(size):
+    CompiledFlatFactory.build_batch(size)
+
+
+@benchmark(size=5000)
+def flat_build_single(size):
+    for _ in range(size):
+        FlatFactory.build()
+
+
+@benchmark(size=5000)
+def flat_build_overrides(size):
+    for i in range(size):
+        FlatFactory.build(name='custom%d' % i, score=i)
+
+
+@benchmark(size=5000)
+def flat_iter_build(size):
+    for _obj in FlatFactory.iter_build(size):
+        pass
+
+
+def _make_chain(depth):
+    chain = FlatFactory
+    for level in range(depth):
+        chain = type('Level%dFactory' % level, (factory.Factory,), {
+            'Meta': type('Meta', (), {'model': Record}),
+            'id': factory.Sequence(int),
+            'level': level,
+            'child': factory.SubFactory(chain),
+            'parent_level': factory.SelfAttribute('child.id'),
+        })
+    return chain
+
+
+DeepFactory = _make_chain(10)
+
+
+@benchmark(size=500)
+def deep_subfactory_build(size):
+    DeepFactory.build_batch(size)
+
+
+@benchmark(size=500)
+def deep_subfactory_overrides(size):
+    DeepFactory.build_batch(size, child__child__child__level=-1, child__child__name='deep')
+
+
+class TraitFactory(factory.Factory):
+    class Meta:
+        model = Record
+
+    class Params:
+        admin = factory.Trait(role='admin', is_staff=True, permissions=factory.LazyFunction(lambda: ['all']))
+        banned = factory.Trait(active=False, reason='spam')
+        premium = factory.Trait(plan='premium', quota=factory.LazyAttribute(lambda o: o.base_quota * 10))
+        legacy = factory.Trait(plan='legacy', quota=0)
+
+    role = 'user'
+    is_staff = False
+    permissions = factory.LazyFunction(list)
+    active = True
+    reason = None
+    plan = 'free'
+    base_quota = 10
+    quota = factory.SelfAttribute('base_quota')
+    status = factory.Maybe('active', yes_declaration='ok', no_declaration='disabled')
+
+
+@benchmark(size=5000)
+def traits_default(size):
+    TraitFactory.build_batch(size)
+
+
+@benchmark(size=5000)
+def traits_enabled(size):
+    TraitFactory.build_batch(size, admin=True, premium=True)
+
+
+@benchmark(size=2000)
+def traits_mixed(size):
+    for i in range(size):
+        TraitFactory.build(admin=bool(i % 2), banned=bool(i % 3 == 0), premium=bool(i % 5 == 0))
+
+
+class FakerFactory(factory.Factory):
+    class Meta:
+        model = Record
+
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    email = factory.Faker('email')
+    address = factory.Faker('address')
+    birthday = factory.Faker('date_of_birth')
+    bio = factory.Faker('paragraph')
+
+
+@benchmark(size=1000)
+def faker_build(size):
+    FakerFactory.build_batch(size)
+
+
+class FuzzyFactory(factory.Factory):
+    class Meta:
+        model = Record
+
+    count = fuzzy.FuzzyInteger(0, 1000)
+    ratio = fuzzy.FuzzyFloat(0, 1)
+    amount = fuzzy.FuzzyDecimal(0, 1000)
+    code = fuzzy.FuzzyText(length=16)
+    kind = fuzzy.FuzzyChoice(['a', 'b', 'c', 'd'])
+    day = fuzzy.FuzzyDate(datetime.date(2000, 1, 1), datetime.date(2030, 1, 1))
+
+
+@benchmark(size=5000)
+def fuzzy_build(size):
+    FuzzyFactory.build_batch(size)
+
+
+if numpy is not None:
+    @benchmark(size=5000)
+    def fuzzy_build_numpy(size):
+        with fuzzy.use_numpy():
+            FuzzyFactory.build_batch(size)
+
+
+@benchmark(size=5000)
+def stub_batch(size):
+    FlatFactory.stub_batch(size)
+
+
+@benchmark(size=2000)
+def dict_and_list(size):
+    factory.build_batch(
+        dict,
+        size,
+        FACTORY_CLASS=factory.DictFactory,
+        tags=factory.List([factory.Sequence(lambda n: 'tag%d' % n) for _ in range(3)]),
+        meta=factory.Dict({'source': 'bench', 'rank': factory.Sequence(int)}),
+    )
@@ -0,0 +1,70 @@
+# Copyright: See the LICENSE file.
+
+"""Benchmarks of DjangoModelFactory, on an in-memory SQLite database."""
+
+try:
+    import django
+    from django.conf import settings
+except ImportError:
+    django = None
+
+from .runner import benchmark
+
+if django is not None:
+    if not settings.configured:
+        settings.configure(
+            DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+            INSTALLED_APPS=['django.contrib.contenttypes', 'benchmarks.djapp'],
+            DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+            USE_TZ=True,
+        )
+        django.setup()
+
+    from django.db import connection
+
+    import factory.django
+
+    from .djapp import models
+
+    class AuthorFactory(factory.django.DjangoModelFactory):
+        class Meta:
+            model = models.Author
+
+        name = factory.Sequence(lambda n: 'author%d' % n)
+        email = factory.LazyAttribute(lambda o: '%s@example.com' % o.name)
+
+    class BookFactory(factory.django.DjangoModelFactory):
+        class Meta:
+            model = models.Book
+
+        title = factory.Sequence(lambda n: 'book%d' % n)
+        pages = 300
+        author = factory.SubFactory(AuthorFactory)
+
+    class BulkAuthorFactory(AuthorFactory):
+        class Meta:
+            use_bulk_create = True
+
+    _tables_created = False
+
+    def reset_tables():
+        global _tables_created
+        if not _tables_created:
+            with connection.schema_editor() as editor:
+                editor.create_model(models.Author)
+                editor.create_model(models.Book)
+            _tables_created = True
+        models.Book.objects.all().delete()
+        models.Author.objects.all().delete()
+
+    @benchmark(size=1000, setup=reset_tables)
+    def create(size):
+        AuthorFactory.create_batch(size)
+
+    @benchmark(size=1000, setup=reset_tables)
+    def bulk_create(size):
+        BulkAuthorFactory.create_batch(size)
+
+    @benchmark(size=500, setup=reset_tables)
+    def create_subfactory(size):
+        BookFactory.create_batch(size)
@@ -0,0 +1,16 @@
+# Copyright: See the LICENSE file.
+
+"""Models for the Django benchmarks."""
+
+from django.db import models
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=100)
+    email = models.CharField(max_length=100)
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=100)
+    pages = models.IntegerField()
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
@@ -0,0 +1,164 @@
+# Copyright: See the LICENSE file.
+
+"""Run benchmarks, and store or compare their results."""
+
+import gc
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import factory
+
+#: Version of the results file format.
+RESULTS_VERSION = 1
+
+_registry = {}
+
+
+class Benchmark:
+    """A benchmark, generating ``size`` objects per run.
+
+    Attributes:
+        name (str): the benchmark name, '<group>.<function name>'
+        function (callable): generates the objects, receives the size
+        size (int): the number of objects generated per run
+        setup (callable or None): called before each run, outside of the
+            measurements (e.g. to empty database tables)
+    """
+
+    def __init__(self, name, function, size, setup=None):
+        self.name = name
+        self.function = function
+        self.size = size
+        self.setup = setup
+
+    def _run(self, size):
+        if self.setup is not None:
+            self.setup()
+        start = time.perf_counter()
+        self.function(size)
+        return time.perf_counter() - start
+
+    def measure(self, repeat=5, size=None):
+        """Run the benchmark.
+
+        The throughput is computed from the fastest of ``repeat`` runs; the
+        memory usage from an extra run, traced with tracemalloc.
+
+        Returns:
+            dict: the results
+        """
+        size = size or self.size
+        # Warm up caches (declaration plans, Faker providers, ...)
+        self._run(min(size, 10))
+
+        best = min(self._run(size) for _ in range(repeat))
+
+        if self.setup is not None:
+            self.setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self.function(size)
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'size': size,
+            'best_time': best,
+            'objects_per_second': size / best,
+            'peak_bytes_per_object': peak / size,
+        }
+
+    def __repr__(self):
+        return '<Benchmark %s>' % self.name
+
+
+def benchmark(size=1000, setup=None):
+    """Register a function as a benchmark.
+
+    The decorated function receives the number of objects to generate.
+    """
+    def decorator(function):
+        group = function.__module__.rsplit('.', 1)[-1]
+        name = '%s.%s' % (group, function.__name__)
+        _registry[name] = Benchmark(name, function, size=size, setup=setup)
+        return function
+    return decorator
+
+
+def get_benchmarks(patterns=()):
+    """Retrieve the registered benchmarks whose name contains one of the patterns."""
+    return [
+        bench for name, bench in sorted(_registry.items())
+        if not patterns or any(pattern in name for pattern in patterns)
+    ]
+
+
+def _get_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, check=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def collect_metadata():
+    return {
+        'version': RESULTS_VERSION,
+        'commit': _get_commit(),
+        'factory_boy': factory.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+    }
+
+
+def save_results(path, results):
+    data = dict(collect_metadata(), results=results)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('version') != RESULTS_VERSION:
+        raise ValueError("%s: unsupported results version %r." % (path, data.get('version')))
+    return data
+
+
+def compare_results(baseline, results, threshold):
+    """Compare results with a baseline.
+
+    Args:
+        baseline (dict): results, as loaded by load_results()
+        results (dict): maps benchmark names to their results
+        threshold (float): the relative slowdown flagged as a regression
+
+    Returns:
+        (str list, str list): the report lines, and the names of the
+            regressed benchmarks
+    """
+    lines = ['%-40s %14s %14s %9s' % ('benchmark', 'baseline (o/s)', 'current (o/s)', 'change')]
+    regressions = []
+    for name, result in results.items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            lines.append('%-40s %14s %14.0f %9s' % (name, '-', result['objects_per_second'], 'new'))
+            continue
+        change = result['objects_per_second'] / reference['objects_per_second'] - 1
+        flag = ''
+        if change < -threshold:
+            flag = ' !'
+            regressions.append(name)
+        lines.append('%-40s %14.0f %14.0f %+8.1f%%%s' % (
+            name, reference['objects_per_second'], result['objects_per_second'], change * 100, flag,
+        ))
+    return lines, regressions
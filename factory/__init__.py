@@ -1,6 +1,7 @@
 # Copyright: See the LICENSE file.
 
-import importlib.metadata
+import importlib
+from typing import TYPE_CHECKING
 
 from .base import (
     BaseDictFactory,
@@ -9,8 +10,11 @@ from .base import (
     Factory,
     ListFactory,
     StubFactory,
+    defer_finalization,
+    finalize_all,
     use_strategy,
 )
+from .compiler import compile
 from .declarations import (
     ContainerAttribute,
     Dict,
@@ -32,7 +36,6 @@ from .declarations import (
 )
 from .enums import BUILD_STRATEGY, CREATE_STRATEGY, STUB_STRATEGY
 from .errors import FactoryError
-from .faker import Faker
 from .helpers import (
     build,
     build_batch,
@@ -53,23 +56,44 @@ from .helpers import (
     stub,
     stub_batch,
 )
+from .profiling import profile
 
-try:
-    from . import alchemy
-except ImportError:
-    pass
-try:
-    from . import django
-except ImportError:
-    pass
-try:
-    from . import mogo
-except ImportError:
-    pass
-try:
-    from . import mongoengine
-except ImportError:
-    pass
+if TYPE_CHECKING:
+    # Expose the lazily loaded attributes to type checkers.
+    from . import alchemy, django, faker, mogo, mongoengine
+    from .faker import Faker
 
 __author__ = 'Raphaël Barrois <raphael.barrois+fboy@polytechnique.org>'
-__version__ = importlib.metadata.version("factory_boy")
+
+# Loaded on first access, as they import heavy third-party libraries:
+# maps names to a (module, attribute) pair; None stands for the module itself.
+_LAZY_ATTRIBUTES = {
+    'Faker': ('.faker', 'Faker'),
+    'faker': ('.faker', None),
+    'alchemy': ('.alchemy', None),
+    'django': ('.django', None),
+    'mogo': ('.mogo', None),
+    'mongoengine': ('.mongoengine', None),
+}
+
+
+def __getattr__(name):
+    if name == '__version__':
+        from importlib import metadata
+        value = metadata.version("factory_boy")
+    elif name in _LAZY_ATTRIBUTES:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        try:
+            module = importlib.import_module(module_name, __name__)
+        except ImportError as e:
+            # Integrations are only available when their library is installed.
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r} ({e})") from e
+        value = module if attribute is None else getattr(module, attribute)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | {'__version__'})
@@ -1,9 +1,18 @@
 # Copyright: See the LICENSE file.
 
+import asyncio
+import collections.abc
+import inspect
+import weakref
+
+from sqlalchemy import func
+from sqlalchemy import inspect as sqlalchemy_inspect
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query
 from sqlalchemy.orm.exc import NoResultFound
 
-from . import base, errors
+from . import base, declarations, errors, fuzzy
 
 SESSION_PERSISTENCE_COMMIT = 'commit'
 SESSION_PERSISTENCE_FLUSH = 'flush'
@@ -13,6 +22,16 @@ VALID_SESSION_PERSISTENCE_TYPES = [
     SESSION_PERSISTENCE_FLUSH,
 ]
 
+# An AsyncSession doesn't support concurrent operations: serialize them.
+_session_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_session_lock(session):
+    lock = _session_locks.get(session)
+    if lock is None:
+        lock = _session_locks[session] = asyncio.Lock()
+    return lock
+
 
 class SQLAlchemyOptions(base.FactoryOptions):
     def _check_sqlalchemy_session_persistence(self, meta, value):
@@ -59,6 +78,35 @@ class SQLAlchemyModelFactory(base.Factory):
         cls._original_params = params
         return super()._generate(strategy, params)
 
+    @classmethod
+    def _generate_batch(cls, strategy, size, params):
+        cls._original_params = params
+        return super()._generate_batch(strategy, size, params)
+
+    @classmethod
+    def _generate_iter(cls, strategy, size, params):
+        return cls._iter_with_original_params(super()._generate_iter(strategy, size, params), params)
+
+    @classmethod
+    def _iter_with_original_params(cls, instances, params):
+        # Factory calls made while the iterator is paused overwrite
+        # _original_params: restore it before each instance.
+        try:
+            while True:
+                cls._original_params = params
+                try:
+                    instance = next(instances)
+                except StopIteration:
+                    return
+                yield instance
+        finally:
+            instances.close()
+
+    @classmethod
+    async def _agenerate_batch(cls, strategy, size, params):
+        cls._original_params = params
+        return await super()._agenerate_batch(strategy, size, params)
+
     @classmethod
     def _get_or_create(cls, model_class, session, args, kwargs):
         key_fields = {}
@@ -101,8 +149,7 @@ class SQLAlchemyModelFactory(base.Factory):
         return obj
 
     @classmethod
-    def _create(cls, model_class, *args, **kwargs):
-        """Create an instance of the model, and save it to the database."""
+    def _get_session(cls):
         session_factory = cls._meta.sqlalchemy_session_factory
         if session_factory:
             cls._meta.sqlalchemy_session = session_factory()
@@ -111,10 +158,79 @@ class SQLAlchemyModelFactory(base.Factory):
 
         if session is None:
             raise RuntimeError("No session provided.")
+        return session
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        """Create an instance of the model, and save it to the database."""
+        session = cls._get_session()
         if cls._meta.sqlalchemy_get_or_create:
             return cls._get_or_create(model_class, session, args, kwargs)
         return cls._save(model_class, session, args, kwargs)
 
+    @classmethod
+    async def _acreate(cls, model_class, *args, **kwargs):
+        """Create an instance of the model, through an AsyncSession if provided.
+
+        An overridden _create() is called instead, so that acreate() matches
+        create(); it handles the session itself.
+        """
+        if inspect.unwrap(cls._create.__func__) is not SQLAlchemyModelFactory._create.__func__:
+            return cls._create(model_class, *args, **kwargs)
+
+        session = cls._get_session()
+        if not inspect.iscoroutinefunction(session.flush):
+            # A synchronous session
+            if cls._meta.sqlalchemy_get_or_create:
+                return cls._get_or_create(model_class, session, args, kwargs)
+            return cls._save(model_class, session, args, kwargs)
+
+        async with _get_session_lock(session):
+            if cls._meta.sqlalchemy_get_or_create:
+                return await cls._aget_or_create(model_class, session, args, kwargs)
+            return await cls._asave(model_class, session, args, kwargs)
+
+    @classmethod
+    async def _aget_or_create(cls, model_class, session, args, kwargs):
+        key_fields = {}
+        for field in cls._meta.sqlalchemy_get_or_create:
+            if field not in kwargs:
+                raise errors.FactoryError(
+                    "sqlalchemy_get_or_create - "
+                    "Unable to find initialization value for '%s' in factory %s" %
+                    (field, cls.__name__))
+            key_fields[field] = kwargs.pop(field)
+
+        result = await session.execute(select(model_class).filter_by(*args, **key_fields))
+        obj = result.scalars().one_or_none()
+
+        if not obj:
+            try:
+                obj = await cls._asave(model_class, session, args, {**key_fields, **kwargs})
+            except IntegrityError as e:
+                await session.rollback()
+
+                if cls._original_params is None:
+                    raise e
+
+                get_or_create_params = {
+                    lookup: value
+                    for lookup, value in cls._original_params.items()
+                    if lookup in cls._meta.sqlalchemy_get_or_create
+                }
+                if get_or_create_params:
+                    try:
+                        result = await session.execute(select(model_class).filter_by(**get_or_create_params))
+                        obj = result.scalars().one()
+                    except NoResultFound:
+                        # Original params are not a valid lookup and triggered a create(),
+                        # that resulted in an IntegrityError.
+                        raise e
+                else:
+                    raise e
+
+        return obj
+
     @classmethod
     def _save(cls, model_class, session, args, kwargs):
         session_persistence = cls._meta.sqlalchemy_session_persistence
@@ -126,3 +242,147 @@ class SQLAlchemyModelFactory(base.Factory):
         elif session_persistence == SESSION_PERSISTENCE_COMMIT:
             session.commit()
         return obj
+
+    @classmethod
+    async def _asave(cls, model_class, session, args, kwargs):
+        session_persistence = cls._meta.sqlalchemy_session_persistence
+
+        obj = model_class(*args, **kwargs)
+        session.add(obj)
+        if session_persistence == SESSION_PERSISTENCE_FLUSH:
+            await session.flush()
+        elif session_persistence == SESSION_PERSISTENCE_COMMIT:
+            await session.commit()
+        return obj
+
+
+class _LazySession:
+    """A session, or a factory providing it on first use."""
+
+    def __init__(self, session, session_factory):
+        if session is not None and session_factory is not None:
+            raise RuntimeError("Provide either a session or a session_factory, not both")
+        self.session = session
+        self.session_factory = session_factory
+
+    def get(self):
+        if self.session is None and self.session_factory is not None:
+            self.session = self.session_factory()
+        if self.session is None:
+            raise RuntimeError("No session provided.")
+        return self.session
+
+
+class _QuerySource(collections.abc.Sequence):
+    """The rows of a query, fetched in chunks on each iteration.
+
+    Indexing, as used within factory.random.keyed_random(), fetches a single row.
+    """
+
+    def __init__(self, query, session, chunk_size):
+        self.query = query
+        self.session = session
+        self.chunk_size = chunk_size
+        self._count = None
+
+    def _execute(self, statement):
+        result = self.session.get().execute(statement)
+        # select(Model) and select(Model.id) yield objects or values, not rows.
+        return result.scalars() if len(statement.column_descriptions) == 1 else result
+
+    def __iter__(self):
+        # Rows may have been added since the previous iteration.
+        self._count = None
+        if isinstance(self.query, Query):
+            return iter(self.query.yield_per(self.chunk_size))
+        return iter(self._execute(self.query.execution_options(yield_per=self.chunk_size)))
+
+    def __len__(self):
+        if self._count is None:
+            if isinstance(self.query, Query):
+                self._count = self.query.count()
+            else:
+                statement = select(func.count()).select_from(self.query.subquery())
+                self._count = self.session.get().execute(statement).scalar_one()
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(self.query, Query):
+            return self.query.offset(index).limit(1).one()
+        return self._execute(self.query.offset(index).limit(1)).one()
+
+    def __repr__(self):
+        return '<_QuerySource for %s>' % self.query
+
+
+class QueryIterator(declarations.Iterator):
+    """Fill a field with the rows of a query, fetched in chunks.
+
+    Rows are streamed with ``yield_per``, without being kept; each cycle
+    issues the query again.
+
+    Args:
+        query (Select or Query): the rows to iterate over; ``select(Model.id)``
+            fetches only the primary keys
+        session (Session or None): the session executing a Select statement
+        session_factory (callable or None): returns the session, on first use
+        chunk_size (int): the number of rows fetched at once
+        cycle (bool): whether to issue the query again once exhausted
+        getter (callable or None): a function to parse returned values
+    """
+
+    def __init__(self, query, session=None, session_factory=None, chunk_size=1000, cycle=True, getter=None):
+        source = _QuerySource(query, _LazySession(session, session_factory), chunk_size)
+        super().__init__(source, cycle=cycle, getter=getter)
+
+
+class FuzzyQueryChoice(fuzzy.BaseFuzzyRowChoice):
+    """Random choice among the rows of a model, or of a select() statement.
+
+    Only the primary keys of the rows are loaded; chosen objects are
+    fetched by batches.
+
+    Args:
+        query (model class or Select): the rows to choose from, e.g.
+            ``select(User).where(User.active)``
+        session (Session or None): the session executing the statements
+        session_factory (callable or None): returns the session, on first use
+        weights (str or column or None): a column holding the weight of each row
+        fetch (bool): whether to yield objects, or their primary keys
+        batch_size (int): the number of objects fetched at once
+        refresh_every (int or None): reload the primary keys after that many draws
+    """
+
+    def __init__(self, query, session=None, session_factory=None, weights=None, fetch=True, batch_size=100,
+                 refresh_every=None):
+        super().__init__(weights=weights, fetch=fetch, batch_size=batch_size, refresh_every=refresh_every)
+        if not hasattr(query, 'column_descriptions'):
+            query = select(query)
+        self.query = query
+        self.session = _LazySession(session, session_factory)
+
+    @property
+    def model(self):
+        return self.query.column_descriptions[0]['entity']
+
+    @property
+    def pk_column(self):
+        primary_key = sqlalchemy_inspect(self.model).primary_key
+        if len(primary_key) != 1:
+            raise errors.FactoryError("%s requires a model with a single primary key column." % type(self).__name__)
+        return primary_key[0]
+
+    def fetch_pks(self):
+        columns = [self.pk_column]
+        if self.weights is not None:
+            weights = getattr(self.model, self.weights) if isinstance(self.weights, str) else self.weights
+            columns.append(weights)
+        result = self.session.get().execute(self.query.with_only_columns(*columns))
+        # Rows unpack as (pk, weight) pairs.
+        return result.scalars() if self.weights is None else result
+
+    def fetch_objects(self, pks):
+        pk_column = self.pk_column
+        objects = self.session.get().execute(self.query.where(pk_column.in_(pks))).scalars()
+        key = self.model.__mapper__.get_property_by_column(pk_column).key
+        return {getattr(obj, key): obj for obj in objects}
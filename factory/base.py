@@ -3,15 +3,28 @@
 
 import collections
 import logging
+import threading
 import warnings
-from typing import Generic, List, Type, TypeVar
+import weakref
+from typing import Generic, Iterator, List, Optional, Type, TypeVar
 
-from . import builder, declarations, enums, errors, utils
+from . import builder, compiler, declarations, enums, errors, utils
 
 logger = logging.getLogger('factory.generate')
 
 T = TypeVar('T')
 
+# Guards the lazy initialization of sequence counters.
+_counter_lock = threading.RLock()
+
+# Guards the deferred finalization of factories.
+_finalize_lock = threading.RLock()
+_defer_finalization = False
+_deferred_factories: weakref.WeakSet = weakref.WeakSet()
+
+#: Number of objects generated by each task of a parallel batch.
+PARALLEL_CHUNK_SIZE = 1000
+
 # Factory metaclasses
 
 
@@ -28,6 +41,65 @@ def resolve_attribute(name, bases, default=None):
     return default
 
 
+def defer_finalization(enabled=True):
+    """Postpone the finalization of factories declared afterwards.
+
+    Reading the ``class Meta`` and ``class Params``, collecting inherited
+    declarations and parsing them then happens on the first use of each
+    factory, instead of when its module is imported.
+    """
+    global _defer_finalization
+    _defer_finalization = enabled
+
+
+def finalize_all():
+    """Finalize all factories whose finalization was deferred."""
+    while _deferred_factories:
+        for factory in list(_deferred_factories):
+            factory._meta
+
+
+class _DeferredOptions:
+    """Stand-in for the ``_meta`` of a factory until it is first used.
+
+    On first access, the actual FactoryOptions are built, then replace this
+    object in the class.
+    """
+
+    def __init__(self, options_class, bases, attrs, kwargs):
+        self.options_class = options_class
+        self.bases = bases
+        self.attrs = attrs
+        self.kwargs = kwargs
+        # The FactoryOptions being finalized, if any.
+        self.meta = None
+
+    def __get__(self, instance, owner):
+        with _finalize_lock:
+            current = vars(owner)['_meta']
+            if current is not self:
+                # Finalized by another thread meanwhile.
+                return current
+            if self.meta is not None:
+                # Accessed while finalizing.
+                return self.meta
+
+            self.meta = self.options_class()
+            try:
+                self.meta.contribute_to_class(
+                    owner,
+                    base_meta=resolve_attribute('_meta', self.bases),
+                    attrs=self.attrs,
+                    **self.kwargs,
+                )
+            except BaseException:
+                self.meta = None
+                raise
+            type.__setattr__(owner, '_meta', self.meta)
+            _deferred_factories.discard(owner)
+            return self.meta
+
+
 class FactoryMetaClass(type):
     """Factory metaclass for handling ordered declarations."""
 
@@ -71,9 +143,19 @@ class FactoryMetaClass(type):
         attrs_meta = attrs.pop('Meta', None)
         attrs_params = attrs.pop('Params', None)
 
-        base_meta = resolve_attribute('_meta', bases)
         options_class = resolve_attribute('_options_class', bases, FactoryOptions)
 
+        if _defer_finalization:
+            attrs['_meta'] = _DeferredOptions(options_class, bases, attrs=dict(attrs), kwargs=dict(
+                meta=attrs_meta,
+                base_factory=base_factory,
+                params=attrs_params,
+            ))
+            new_class = super().__new__(mcs, class_name, bases, attrs)
+            _deferred_factories.add(new_class)
+            return new_class
+
+        base_meta = resolve_attribute('_meta', bases)
         meta = options_class()
         attrs['_meta'] = meta
 
@@ -146,15 +228,31 @@ class FactoryOptions:
         self.parameters_dependencies = {}
         self.pre_declarations = builder.DeclarationSet()
         self.post_declarations = builder.DeclarationSet()
+        self._declaration_plans = {}
+        self._declaration_variants = {}
 
         self._counter = None
         self.counter_reference = None
 
     @property
     def declarations(self):
+        return self._get_declarations()
+
+    def _get_declarations(self, trait_flags=None):
+        """Compute the declarations, including those injected by parameters.
+
+        Args:
+            trait_flags (dict or None): maps the name of traits whose state is
+                known in advance to that state; their overrides are applied
+                directly, instead of through a Maybe declaration.
+        """
+        trait_flags = trait_flags or {}
         base_declarations = dict(self.base_declarations)
         for name, param in utils.sort_ordered_objects(self.parameters.items(), getter=lambda item: item[1]):
-            base_declarations.update(param.as_declarations(name, base_declarations))
+            if name in trait_flags:
+                base_declarations.update(param.as_static_declarations(name, base_declarations, trait_flags[name]))
+            else:
+                base_declarations.update(param.as_declarations(name, base_declarations))
         return base_declarations
 
     def _build_default_options(self):
@@ -178,6 +276,8 @@ class FactoryOptions:
             OptionDefault('inline_args', (), inherit=True),
             OptionDefault('exclude', (), inherit=True),
             OptionDefault('rename', {}, inherit=True),
+            OptionDefault('sequence_backend', None, inherit=True),
+            OptionDefault('compile', False, inherit=True),
         ]
 
     def _fill_from_meta(self, meta, base_meta):
@@ -203,7 +303,13 @@ class FactoryOptions:
                 "'class Meta' for %r got unknown attribute(s) %s"
                 % (self.factory, ','.join(sorted(meta_attrs.keys()))))
 
-    def contribute_to_class(self, factory, meta=None, base_meta=None, base_factory=None, params=None):
+    def contribute_to_class(self, factory, meta=None, base_meta=None, base_factory=None, params=None, attrs=None):
+        """Set up the options of a new factory class.
+
+        Args:
+            attrs (dict or None): the attributes of the class, as declared;
+                defaults to its current attributes.
+        """
 
         self.factory = factory
         self.base_factory = base_factory
@@ -224,7 +330,7 @@ class FactoryOptions:
             self.base_declarations.update(parent._meta.base_declarations)
             self.parameters.update(parent._meta.parameters)
 
-        for k, v in vars(self.factory).items():
+        for k, v in (vars(self.factory) if attrs is None else attrs).items():
             if self._is_declaration(k, v):
                 self.base_declarations[k] = v
 
@@ -236,6 +342,63 @@ class FactoryOptions:
         self._check_parameter_dependencies(self.parameters)
 
         self.pre_declarations, self.post_declarations = builder.parse_declarations(self.declarations)
+        # Cycles are reported by calls which don't override any of their declarations.
+        self._has_declaration_cycles = self._find_declaration_cycle(self.pre_declarations) is not None
+        self._declaration_plans = {}
+        self._declaration_variants = {}
+
+    def get_declaration_plan(self, extras):
+        """Find how to merge call-time declarations with the factory's declarations.
+
+        The way call-time declarations are dispatched is computed once for each
+        set of call-time names, then cached.
+
+        Traits enabled or disabled by a plain call-time value are applied
+        directly, from a set of declarations cached for each combination of
+        those traits.
+
+        Returns:
+            builder.DeclarationPlan
+        """
+        trait_flags = self._get_trait_flags(extras)
+        if trait_flags:
+            base_pre, base_post = self._get_declaration_variant(trait_flags)
+        else:
+            base_pre, base_post = self.pre_declarations, self.post_declarations
+
+        key = (builder.DeclarationPlan.get_key(extras), trait_flags)
+        plan = self._declaration_plans.get(key)
+        if plan is None or plan.base_pre is not base_pre or plan.base_post is not base_post:
+            if self._has_declaration_cycles or trait_flags:
+                self._check_declaration_dependencies(base_pre, extras)
+            plan = builder.DeclarationPlan(extras, base_pre, base_post)
+            self._declaration_plans[key] = plan
+        return plan
+
+    def compile_plan(self, plan, pre, hooked=False):
+        """Generate a function resolving the declarations of a plan; see compiler.compile_plan()."""
+        return compiler.compile_plan(self, plan, pre, hooked=hooked)
+
+    def _get_trait_flags(self, extras):
+        """Find the traits whose state is set by a plain call-time value.
+
+        Returns:
+            frozenset of (name, bool) pairs
+        """
+        return frozenset(
+            (name, bool(value))
+            for name, value in extras.items()
+            if isinstance(self.parameters.get(name), declarations.Trait)
+            and enums.get_builder_phase(value) is None
+        )
+
+    def _get_declaration_variant(self, trait_flags):
+        """Retrieve the pre- and post-declarations for a combination of trait states."""
+        variant = self._declaration_variants.get(trait_flags)
+        if variant is None:
+            variant = builder.parse_declarations(self._get_declarations(dict(trait_flags)))
+            self._declaration_variants[trait_flags] = variant
+        return variant
 
     def _get_counter_reference(self):
         """Identify which factory should be used for a shared counter."""
@@ -257,11 +420,20 @@ class FactoryOptions:
         if self._counter is not None:
             return
 
-        if self.counter_reference is self:
-            self._counter = _Counter(seq=self.factory._setup_next_sequence())
-        else:
-            self.counter_reference._initialize_counter()
-            self._counter = self.counter_reference._counter
+        with _counter_lock:
+            if self._counter is not None:
+                # Initialized by another thread in the meantime
+                return
+
+            if self.counter_reference is self:
+                start = self.factory._setup_next_sequence()
+                if self.sequence_backend is None:
+                    self._counter = _Counter(seq=start)
+                else:
+                    self._counter = self.sequence_backend.get_counter(self.factory, start)
+            else:
+                self.counter_reference._initialize_counter()
+                self._counter = self.counter_reference._counter
 
     def next_sequence(self):
         """Retrieve a new sequence ID.
@@ -274,6 +446,15 @@ class FactoryOptions:
         self._initialize_counter()
         return self._counter.next()
 
+    def reserve_sequences(self, size):
+        """Reserve a block of ``size`` consecutive sequence IDs.
+
+        Returns:
+            range: the reserved sequence IDs
+        """
+        self._initialize_counter()
+        return self._counter.reserve(size)
+
     def reset_sequence(self, value=None, force=False):
         self._initialize_counter()
 
@@ -322,6 +503,11 @@ class FactoryOptions:
             assert step.builder.strategy == enums.STUB_STRATEGY
             return StubObject(**kwargs)
 
+    async def ainstantiate(self, step, args, kwargs):
+        if step.builder.strategy == enums.CREATE_STRATEGY:
+            return await self.factory._acreate(self.get_model_class(), *args, **kwargs)
+        return self.instantiate(step, args, kwargs)
+
     def use_postgeneration_results(self, step, instance, results):
         self.factory._after_postgeneration(
             instance,
@@ -329,6 +515,13 @@ class FactoryOptions:
             results=results,
         )
 
+    async def ause_postgeneration_results(self, step, instance, results):
+        await self.factory._aafter_postgeneration(
+            instance,
+            create=step.builder.strategy == enums.CREATE_STRATEGY,
+            results=results,
+        )
+
     def _is_declaration(self, name, value):
         """Determines if a class attribute is a field value declaration.
 
@@ -370,6 +563,56 @@ class FactoryOptions:
                 % (self.factory, ', '.join(cyclic)))
         return deps
 
+    def _find_declaration_cycle(self, pre_declarations, overridden=()):
+        """Find a cycle among the statically known dependencies of declarations.
+
+        Declarations overridden at call time are left out: overriding any
+        declaration of a cycle breaks it.
+
+        Returns:
+            str list or None: the names around the cycle, if any
+        """
+        deps = {
+            name: [
+                dep for dep in builder.get_dependencies(pre_declarations.declarations[name])
+                if dep in pre_declarations and dep not in overridden
+            ]
+            for name in pre_declarations
+            if name not in overridden
+        }
+
+        # Depth-first walk; `visiting` holds the current path.
+        visited = set()
+        visiting = []
+
+        def visit(name):
+            if name in visiting:
+                return visiting[visiting.index(name):] + [name]
+            if name in visited:
+                return None
+            visiting.append(name)
+            for dep in deps[name]:
+                cycle = visit(dep)
+                if cycle is not None:
+                    return cycle
+            visiting.pop()
+            visited.add(name)
+            return None
+
+        for name in deps:
+            cycle = visit(name)
+            if cycle is not None:
+                return cycle
+        return None
+
+    def _check_declaration_dependencies(self, pre_declarations, overridden=()):
+        """Detect cycles surviving the call-time overrides, before evaluating anything."""
+        cycle = self._find_declaration_cycle(pre_declarations, overridden)
+        if cycle is not None:
+            raise errors.CyclicDefinitionError(
+                "Cyclic definition detected on %r; declarations around %s"
+                % (self.factory, ' -> '.join(cycle)))
+
     def get_model_class(self):
         """Extension point for loading model classes.
 
@@ -389,23 +632,35 @@ class FactoryOptions:
 
 
 class _Counter:
-    """Simple, naive counter.
+    """Simple, thread-safe counter.
 
     Attributes:
         for_class (obj): the class this counter related to
         seq (int): the next value
+        step (int): the difference between two successive values
     """
 
-    def __init__(self, seq):
+    def __init__(self, seq, step=1):
         self.seq = seq
+        self.step = step
+        self._lock = threading.Lock()
 
     def next(self):
-        value = self.seq
-        self.seq += 1
+        with self._lock:
+            value = self.seq
+            self.seq += self.step
         return value
 
+    def reserve(self, size):
+        """Reserve ``size`` successive values, as a range."""
+        with self._lock:
+            value = self.seq
+            self.seq += size * self.step
+        return range(value, value + size * self.step, self.step)
+
     def reset(self, next_value=0):
-        self.seq = next_value
+        with self._lock:
+            self.seq = next_value
 
 
 class BaseFactory(Generic[T]):
@@ -467,6 +722,126 @@ class BaseFactory(Generic[T]):
         step = builder.StepBuilder(cls._meta, params, strategy)
         return step.build()
 
+    @classmethod
+    def _generate_batch(cls, strategy, size, params):
+        """generate a batch of objects.
+
+        The declarations are parsed once, and shared by all generated objects.
+
+        Args:
+            strategy: the strategy to use
+            size (int): the number of objects to generate
+            params (dict): attributes to use for generating the objects
+        """
+        if cls._meta.abstract:
+            raise errors.FactoryError(
+                "Cannot generate instances of abstract factory %(f)s; "
+                "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+                "is either not set or False." % dict(f=cls.__name__))
+
+        step = builder.StepBuilder(cls._meta, params, strategy)
+        return step.build_batch(size)
+
+    @classmethod
+    def _generate_parallel(cls, strategy, size, params, workers):
+        """generate a batch of objects from several processes.
+
+        The batch is split in chunks of PARALLEL_CHUNK_SIZE objects, resolved
+        within keyed_random(): each value only depends on the seed and on the
+        sequence of its object, so the result matches a serial run in keyed
+        mode with the same seed. The factory and generated objects must be
+        picklable.
+
+        Workers can't share database connections: with the 'create' strategy,
+        they only resolve the declarations; objects are then created, and
+        their post-generation declarations run, in the current process.
+
+        Args:
+            strategy: the strategy to use
+            size (int): the number of objects to generate
+            params (dict): attributes to use for generating the objects
+            workers (int): the number of processes; with 1, chunks are generated
+                in the current process.
+        """
+        from . import random
+
+        if workers < 1:
+            raise ValueError("%s: workers must be a positive integer, got %r." % (cls.__name__, workers))
+
+        keyed = random.get_keyed_random()
+        seed = random.get_randgen().getrandbits(64) if keyed is None else keyed.seed
+
+        if workers == 1:
+            results = _generate_chunk(cls, strategy, size, params, None, seed)
+        else:
+            sequences = cls._meta.reserve_sequences(size)
+            import concurrent.futures
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _generate_chunk, cls, strategy, min(PARALLEL_CHUNK_SIZE, size - start), params,
+                        sequences[start:start + PARALLEL_CHUNK_SIZE], seed,
+                    )
+                    for start in range(0, size, PARALLEL_CHUNK_SIZE)
+                ]
+                results = [result for future in futures for result in future.result()]
+
+        if strategy != enums.CREATE_STRATEGY:
+            return results
+
+        with random.keyed_random(seed):
+            instances = []
+            for sequence, attributes in results:
+                # Resolved attributes replace the declarations (and the
+                # parameters) they came from; post-generation extras remain.
+                overrides = {
+                    name: value for name, value in params.items()
+                    if name.split(enums.SPLITTER, 1)[0] not in attributes
+                }
+                overrides.update(attributes)
+                overrides['__sequence'] = sequence
+                instances.append(cls._generate(strategy, overrides))
+            return instances
+
+    @classmethod
+    def _generate_iter(cls, strategy, size, params):
+        """generate objects lazily.
+
+        Args:
+            strategy: the strategy to use
+            size (int or None): the number of objects to generate; None for
+                an endless stream
+            params (dict): attributes to use for generating the objects
+        """
+        if cls._meta.abstract:
+            raise errors.FactoryError(
+                "Cannot generate instances of abstract factory %(f)s; "
+                "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+                "is either not set or False." % dict(f=cls.__name__))
+
+        step = builder.StepBuilder(cls._meta, params, strategy)
+        return step.iter_build(size)
+
+    @classmethod
+    async def _agenerate_batch(cls, strategy, size, params):
+        """Asynchronously generate a batch of objects.
+
+        Objects are generated concurrently; see _generate_batch().
+
+        Args:
+            strategy: the strategy to use
+            size (int): the number of objects to generate
+            params (dict): attributes to use for generating the objects
+        """
+        if cls._meta.abstract:
+            raise errors.FactoryError(
+                "Cannot generate instances of abstract factory %(f)s; "
+                "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
+                "is either not set or False." % dict(f=cls.__name__))
+
+        step = builder.StepBuilder(cls._meta, params, strategy)
+        return await step.abuild_batch(size)
+
     @classmethod
     def _after_postgeneration(cls, instance, create, results=None):
         """Hook called after post-generation declarations have been handled.
@@ -478,6 +853,14 @@ class BaseFactory(Generic[T]):
         """
         pass
 
+    @classmethod
+    async def _aafter_postgeneration(cls, instance, create, results=None):
+        """Asynchronous counterpart of _after_postgeneration(), used by acreate().
+
+        Defaults to calling _after_postgeneration().
+        """
+        cls._after_postgeneration(instance, create=create, results=results)
+
     @classmethod
     def _build(cls, model_class, *args, **kwargs):
         """Actually build an instance of the model_class.
@@ -508,6 +891,21 @@ class BaseFactory(Generic[T]):
         """
         return model_class(*args, **kwargs)
 
+    @classmethod
+    async def _acreate(cls, model_class, *args, **kwargs):
+        """Asynchronously create an instance of the model_class.
+
+        Customization point for acreate() and acreate_batch(), e.g. to use an
+        asynchronous ORM; defaults to calling _create().
+
+        Args:
+            model_class (type): the class for which an instance should be
+                created
+            args (tuple): arguments to use when creating the class
+            kwargs (dict): keyword arguments to use when creating the class
+        """
+        return cls._create(model_class, *args, **kwargs)
+
     @classmethod
     def build(cls, **kwargs) -> T:
         """Build an instance of the associated class, with overridden attrs.
@@ -528,7 +926,41 @@ class BaseFactory(Generic[T]):
         Returns:
             object list: the built instances
         """
-        return [cls.build(**kwargs) for _ in range(size)]
+        if _overrides(cls, 'build', BaseFactory):
+            return [cls.build(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.BUILD_STRATEGY, size, kwargs)
+
+    @classmethod
+    def build_batch_parallel(cls, size: int, workers: int, /, **kwargs) -> List[T]:
+        """Build a batch of instances from a pool of processes.
+
+        The instances will not be saved and persisted to any datastore.
+        Only Dict and List sub-factories are supported.
+
+        Args:
+            size (int): the number of instances to build
+            workers (int): the number of processes; see _generate_parallel().
+
+        Returns:
+            object list: the built instances
+        """
+        return cls._generate_parallel(enums.BUILD_STRATEGY, size, kwargs, workers)
+
+    @classmethod
+    def iter_build(cls, size: Optional[int] = None, **kwargs) -> Iterator[T]:
+        """Lazily build instances of the given class, with overridden attrs.
+
+        Instances are generated one at a time, as they are consumed; sequence
+        values are allocated at that time too.
+
+        Args:
+            size (int or None): the number of instances to build;
+                None for an endless stream
+
+        Returns:
+            object iterator: the built instances
+        """
+        return cls._generate_iter(enums.BUILD_STRATEGY, size, kwargs)
 
     @classmethod
     def create(cls, **kwargs) -> T:
@@ -550,7 +982,65 @@ class BaseFactory(Generic[T]):
         Returns:
             object list: the created instances
         """
-        return [cls.create(**kwargs) for _ in range(size)]
+        if _overrides(cls, 'create', BaseFactory):
+            return [cls.create(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.CREATE_STRATEGY, size, kwargs)
+
+    @classmethod
+    def create_batch_parallel(cls, size: int, workers: int, /, **kwargs) -> List[T]:
+        """Create a batch of instances, resolving their attributes from a pool of processes.
+
+        Instances are saved and persisted from the current process, where
+        post-generation declarations run too. Only Dict and List sub-factories
+        are supported.
+
+        Args:
+            size (int): the number of instances to create
+            workers (int): the number of processes; see _generate_parallel().
+
+        Returns:
+            object list: the created instances
+        """
+        return cls._generate_parallel(enums.CREATE_STRATEGY, size, kwargs, workers)
+
+    @classmethod
+    def iter_create(cls, size: Optional[int] = None, **kwargs) -> Iterator[T]:
+        """Lazily create instances of the given class, with overridden attrs.
+
+        Each instance is saved and persisted when it is consumed.
+
+        Args:
+            size (int or None): the number of instances to create;
+                None for an endless stream
+
+        Returns:
+            object iterator: the created instances
+        """
+        return cls._generate_iter(enums.CREATE_STRATEGY, size, kwargs)
+
+    @classmethod
+    async def acreate(cls, **kwargs) -> T:
+        """Asynchronously create an instance of the associated class, with overridden attrs.
+
+        The instance, and those of its sub-factories, are persisted through
+        _acreate(); independent sub-factories are created concurrently.
+        """
+        instances = await cls._agenerate_batch(enums.CREATE_STRATEGY, 1, kwargs)
+        return instances[0]
+
+    @classmethod
+    async def acreate_batch(cls, size: int, **kwargs) -> List[T]:
+        """Asynchronously create a batch of instances of the given class, with overridden attrs.
+
+        The instances are created concurrently.
+
+        Args:
+            size (int): the number of instances to create
+
+        Returns:
+            object list: the created instances
+        """
+        return await cls._agenerate_batch(enums.CREATE_STRATEGY, size, kwargs)
 
     @classmethod
     def stub(cls, **kwargs):
@@ -571,7 +1061,22 @@ class BaseFactory(Generic[T]):
         Returns:
             object list: the stubbed instances
         """
-        return [cls.stub(**kwargs) for _ in range(size)]
+        if _overrides(cls, 'stub', BaseFactory):
+            return [cls.stub(**kwargs) for _ in range(size)]
+        return cls._generate_batch(enums.STUB_STRATEGY, size, kwargs)
+
+    @classmethod
+    def iter_stub(cls, size: Optional[int] = None, **kwargs) -> Iterator[T]:
+        """Lazily stub instances of the given class, with overridden attrs.
+
+        Args:
+            size (int or None): the number of instances to stub;
+                None for an endless stream
+
+        Returns:
+            object iterator: the stubbed instances
+        """
+        return cls._generate_iter(enums.STUB_STRATEGY, size, kwargs)
 
     @classmethod
     def generate(cls, strategy, **kwargs):
@@ -640,6 +1145,43 @@ class BaseFactory(Generic[T]):
         return cls.generate_batch(strategy, size, **kwargs)
 
 
+def _overrides(factory_class, name, base):
+    """Whether a factory overrides the given classmethod of base.
+
+    Batches are generated in a single pass, unless a subclass overrides
+    build(), create() or stub(): they then call it for each instance.
+    """
+    return getattr(factory_class, name).__func__ is not getattr(base, name).__func__
+
+
+def _generate_chunk(factory_class, strategy, size, params, sequences, seed):
+    """Generate a chunk of a parallel batch, possibly in a worker process.
+
+    Sequences (a range reserved by the calling process) are handed out by a
+    process-local counter, leaving the factory's sequence backend untouched;
+    random values drawn outside of declarations use a seed derived from them.
+    Sub-factories would draw from the counters of the worker process, and
+    are rejected; Dict and List share the sequence of their parent.
+
+    With the 'create' strategy, only returns the (sequence, attributes) pairs
+    of the chunk.
+    """
+    from . import random
+
+    if sequences is not None:
+        factory_class._meta._counter = _Counter(seq=sequences.start, step=sequences.step)
+        random.reseed_random('%d:%d' % (seed, sequences.start))
+    token = builder.parallel_factory.set(factory_class)
+    try:
+        with random.keyed_random(seed):
+            if strategy == enums.CREATE_STRATEGY:
+                step_builder = builder.StepBuilder(factory_class._meta, dict(params), strategy)
+                return step_builder.resolve_batch(size)
+            return factory_class._generate_batch(strategy, size, params)
+    finally:
+        builder.parallel_factory.reset(token)
+
+
 class Factory(BaseFactory[T], metaclass=FactoryMetaClass):
     """Factory base with build and create support.
 
@@ -676,10 +1218,44 @@ class StubFactory(Factory):
     def build(cls, **kwargs):
         return cls.stub(**kwargs)
 
+    @classmethod
+    def build_batch(cls, size, **kwargs):
+        if _overrides(cls, 'build', StubFactory):
+            return [cls.build(**kwargs) for _ in range(size)]
+        return cls.stub_batch(size, **kwargs)
+
+    @classmethod
+    def build_batch_parallel(cls, size, workers, /, **kwargs):
+        return cls._generate_parallel(enums.STUB_STRATEGY, size, kwargs, workers)
+
     @classmethod
     def create(cls, **kwargs):
         raise errors.UnsupportedStrategy()
 
+    @classmethod
+    def create_batch(cls, size, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    def create_batch_parallel(cls, size, workers, /, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    def iter_build(cls, size=None, **kwargs):
+        return cls.iter_stub(size, **kwargs)
+
+    @classmethod
+    def iter_create(cls, size=None, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    async def acreate(cls, **kwargs):
+        raise errors.UnsupportedStrategy()
+
+    @classmethod
+    async def acreate_batch(cls, size, **kwargs):
+        raise errors.UnsupportedStrategy()
+
 
 class BaseDictFactory(Factory):
     """Factory for dictionary-like classes."""
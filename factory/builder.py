@@ -1,8 +1,49 @@
 """Build factory instances."""
 
 import collections
+import contextlib
+import contextvars
+import functools
+import itertools
+
+from . import enums, errors, random, utils
+
+#: The factory generating a parallel batch in the current context, if any.
+parallel_factory = contextvars.ContextVar('factory_parallel_factory', default=None)
+
+# The asynchronous fields being evaluated by the current task, outermost
+# first, as (resolver, name) pairs.
+_async_fields = contextvars.ContextVar('factory_async_fields', default=())
+
+# The functions wrapping the evaluation of declarations; see add_evaluation_hook().
+_evaluation_hooks = ()
+
+
+def add_evaluation_hook(hook):
+    """Wrap the synchronous evaluation of each declaration, e.g. to time it.
+
+    The hook is called as ``hook(step, name, evaluate)``, where ``step`` is
+    the BuildStep holding the declaration and ``name`` its field name; it
+    must return ``evaluate()``. Hooks apply to all threads.
+    """
+    global _evaluation_hooks
+    _evaluation_hooks += (hook,)
+
+
+def remove_evaluation_hook(hook):
+    """Unregister a hook added by add_evaluation_hook()."""
+    global _evaluation_hooks
+    hooks = list(_evaluation_hooks)
+    hooks.remove(hook)
+    _evaluation_hooks = tuple(hooks)
+
+
+def _evaluate_hooked(step, name, evaluate):
+    """Run evaluate() through the registered hooks, the first one outermost."""
+    for hook in reversed(_evaluation_hooks):
+        evaluate = functools.partial(hook, step, name, evaluate)
+    return evaluate()
 
-from . import enums, errors, utils
 
 DeclarationWithContext = collections.namedtuple(
     'DeclarationWithContext',
@@ -55,7 +96,32 @@ class DeclarationSet:
         return enums.SPLITTER.join((root, subkey))
 
     def copy(self):
-        return self.__class__(self.as_dict())
+        return self.extend(())
+
+    def extend(self, entries):
+        """Build a copy of this set, with additional declarations.
+
+        Args:
+            entries (iterable of (root, subkey, declaration)): the pre-split
+                declarations to add.
+        """
+        new = self.__class__()
+        new.declarations = dict(self.declarations)
+        # Nested contexts are shared with this set until they get altered.
+        new.contexts = collections.defaultdict(dict, self.contexts)
+
+        altered_roots = set()
+        for root, sub, value in entries:
+            if sub is None:
+                new.declarations[root] = value
+                continue
+            if root not in altered_roots:
+                new.contexts[root] = dict(self.contexts.get(root, ()))
+                altered_roots.add(root)
+            new.contexts[root][sub] = value
+
+        new._check_contexts(altered_roots)
+        return new
 
     def update(self, values):
         """Add new declarations to this set/
@@ -70,7 +136,11 @@ class DeclarationSet:
             else:
                 self.contexts[root][sub] = v
 
-        extra_context_keys = set(self.contexts) - set(self.declarations)
+        self._check_contexts(self.contexts)
+
+    def _check_contexts(self, roots):
+        """Ensure that all nested contexts in ``roots`` relate to a known declaration."""
+        extra_context_keys = set(roots) - set(self.declarations)
         if extra_context_keys:
             raise errors.InvalidDeclarationError(
                 "Received deep context for unknown fields: %r (known=%r)" % (
@@ -108,7 +178,8 @@ class DeclarationSet:
         return DeclarationWithContext(
             name=key,
             declaration=self.declarations[key],
-            context=self.contexts[key],
+            # Don't use self.contexts[key]: it would alter a possibly shared set.
+            context=self.contexts.get(key, {}),
         )
 
     def __iter__(self):
@@ -134,6 +205,16 @@ class DeclarationSet:
         return '<DeclarationSet: %r>' % self.as_dict()
 
 
+def get_dependencies(declaration):
+    """Retrieve the names of sibling fields a declaration always reads."""
+    if enums.get_builder_phase(declaration) != enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
+        return ()
+    get_deps = getattr(declaration, 'get_dependencies', None)
+    if get_deps is None:
+        return ()
+    return get_deps()
+
+
 def _captures_overrides(declaration_with_context):
     declaration = declaration_with_context.declaration
     if enums.get_builder_phase(declaration) == enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
@@ -142,13 +223,21 @@ def _captures_overrides(declaration_with_context):
         return False
 
 
-def parse_declarations(decls, base_pre=None, base_post=None):
-    pre_declarations = base_pre.copy() if base_pre else DeclarationSet()
-    post_declarations = base_post.copy() if base_post else DeclarationSet()
+def _route_declarations(decls, pre_declarations, post_declarations):
+    """Dispatch call-time declarations among pre- and post-declarations.
+
+    The result only depends on the names in ``decls``, and on whether their
+    values are post-generation declarations.
+
+    Returns:
+        (dict, dict): for pre- and post-declarations, a mapping of the target
+            declaration name to the matching key in ``decls``.
+    """
+    pre_routes = {}
+    post_routes = {}
 
     # Inject extra declarations, splitting between known-to-be-post and undetermined
-    extra_post = {}
-    extra_maybenonpost = {}
+    maybenonpost = []
     for k, v in decls.items():
         if enums.get_builder_phase(v) == enums.BuilderPhase.POST_INSTANTIATION:
             if k in pre_declarations:
@@ -158,38 +247,111 @@ def parse_declarations(decls, base_pre=None, base_post=None):
                     "PostGenerationDeclaration %s=%r shadows declaration %r"
                     % (k, v, pre_declarations[k])
                 )
-            extra_post[k] = v
+            post_routes[k] = k
         elif k in post_declarations:
             # Passing in a scalar value to a PostGenerationDeclaration
             # Set it as `key__`
             magic_key = post_declarations.join(k, '')
-            extra_post[magic_key] = v
+            post_routes[magic_key] = k
         else:
-            extra_maybenonpost[k] = v
-
-    # Start with adding new post-declarations
-    post_declarations.update(extra_post)
-
-    # Fill in extra post-declaration context
-    extra_pre_declarations = {}
-    extra_post_declarations = {}
-    post_overrides = post_declarations.filter(extra_maybenonpost)
-    for k, v in extra_maybenonpost.items():
-        if k in post_overrides:
-            extra_post_declarations[k] = v
+            maybenonpost.append(k)
+
+    # New post-declarations may receive extra context as well
+    post_names = set(post_declarations.declarations)
+    post_names.update(
+        name for name in post_routes
+        if post_declarations.split(name)[1] is None
+    )
+
+    for k in maybenonpost:
+        if post_declarations.split(k)[0] in post_names:
+            post_routes[k] = k
         elif k in pre_declarations and _captures_overrides(pre_declarations[k]):
             # Send the overriding value to the existing declaration.
             # By symmetry with the behaviour of PostGenerationDeclaration,
             # we send it as `key__` -- i.e under the '' key.
             magic_key = pre_declarations.join(k, '')
-            extra_pre_declarations[magic_key] = v
+            pre_routes[magic_key] = k
         else:
             # Anything else is pre_declarations
-            extra_pre_declarations[k] = v
-    pre_declarations.update(extra_pre_declarations)
-    post_declarations.update(extra_post_declarations)
+            pre_routes[k] = k
+
+    return pre_routes, post_routes
+
 
-    return pre_declarations, post_declarations
+class DeclarationPlan:
+    """How to merge call-time declarations into a factory's declarations.
+
+    A plan is computed once for a given set of call-time declaration names,
+    and can then be applied to any call using the same names.
+
+    Attributes:
+        base_pre (DeclarationSet): the factory's pre-declarations
+        base_post (DeclarationSet): the factory's post-declarations
+        pre_routes (list of (key, root, subkey)): where call-time values go
+            among pre-declarations
+        post_routes (list of (key, root, subkey)): where call-time values go
+            among post-declarations
+        evaluation_order (str list or None): the order in which the first
+            build evaluated the pre-declarations; later builds follow it, so
+            that each declaration finds its dependencies already computed.
+        compiled (callable or None): for factories with ``Meta.compile``, the
+            function generated once the evaluation order is known.
+        compiled_hooked (callable or None): the same, running each
+            declaration through the evaluation hooks.
+    """
+
+    def __init__(self, decls, base_pre, base_post):
+        self.base_pre = base_pre
+        self.base_post = base_post
+        self.evaluation_order = None
+        self.compiled = None
+        self.compiled_hooked = None
+        pre_routes, post_routes = _route_declarations(decls, base_pre, base_post)
+        self.pre_routes = [
+            (key, *DeclarationSet.split(target))
+            for target, key in pre_routes.items()
+        ]
+        self.post_routes = [
+            (key, *DeclarationSet.split(target))
+            for target, key in post_routes.items()
+        ]
+
+    @classmethod
+    def get_key(cls, decls):
+        """Compute the cache key for a set of call-time declarations."""
+        return frozenset(
+            (k, enums.get_builder_phase(v) == enums.BuilderPhase.POST_INSTANTIATION)
+            for k, v in decls.items()
+        )
+
+    def apply(self, decls):
+        """Merge call-time declarations with the base ones.
+
+        When no call-time declarations are provided, the base sets are
+        returned as is; they must not be altered.
+
+        Returns:
+            (DeclarationSet, DeclarationSet): the pre- and post-declarations.
+        """
+        pre = self.base_pre
+        if self.pre_routes:
+            pre = pre.extend((root, sub, decls[key]) for key, root, sub in self.pre_routes)
+        post = self.base_post
+        if self.post_routes:
+            post = post.extend((root, sub, decls[key]) for key, root, sub in self.post_routes)
+        return pre, post
+
+
+def parse_declarations(decls, base_pre=None, base_post=None):
+    base_pre = base_pre if base_pre is not None else DeclarationSet()
+    base_post = base_post if base_post is not None else DeclarationSet()
+    pre, post = DeclarationPlan(decls, base_pre, base_post).apply(decls)
+    # Always provide fresh sets to callers.
+    return (
+        pre if pre is not base_pre else base_pre.copy(),
+        post if post is not base_post else base_post.copy(),
+    )
 
 
 class BuildStep:
@@ -198,39 +360,113 @@ class BuildStep:
         self.sequence = sequence
         self.attributes = {}
         self.parent_step = parent_step
+        self.depth = parent_step.depth + 1 if parent_step is not None else 0
+        # Within keyed_random(), the path of the field this step was started from.
+        self.keyed_path = random.get_keyed_path()
         self.stub = None
+        self._chain = None
+
+    def resolve(self, declarations, order=None):
+        """Compute all declarations.
+
+        Args:
+            declarations (DeclarationSet): the declarations to resolve
+            order (str list or None): an evaluation order, as provided by
+                a previous call's ``evaluation_order``
+
+        Returns:
+            str list: the order in which declarations were evaluated.
+        """
+        self.stub = Resolver(
+            declarations=declarations,
+            step=self,
+            sequence=self.sequence,
+        )
 
-    def resolve(self, declarations):
+        self.attributes, evaluation_order = self.stub._resolve_all(order)
+        return evaluation_order
+
+    async def aresolve(self, declarations, order=None):
+        """Compute all declarations, awaiting asynchronous ones concurrently.
+
+        See resolve().
+        """
         self.stub = Resolver(
             declarations=declarations,
             step=self,
             sequence=self.sequence,
         )
 
-        for field_name in declarations:
-            self.attributes[field_name] = getattr(self.stub, field_name)
+        self.attributes, evaluation_order = await self.stub._aresolve_all(order)
+        return evaluation_order
+
+    def resolve_context(self, context):
+        """Compute the lazy values of a declaration's context.
+
+        This matches building a DictFactory from the context, without the
+        full factory machinery: values are resolved in a nested step, whose
+        parent is the current step (hence ``SelfAttribute('..field')``).
+
+        Returns:
+            dict: the computed context.
+        """
+        from . import base
+        dict_builder = self.builder.recurse(base.DictFactory._meta, context)
+        if any(
+            enums.get_builder_phase(v) == enums.BuilderPhase.POST_INSTANTIATION
+            for v in context.values()
+        ):
+            # Post-generation declarations need an actual instance.
+            return dict_builder.build(parent_step=self, force_sequence=self.sequence)
+
+        step = BuildStep(builder=dict_builder, sequence=self.sequence, parent_step=self)
+        step.resolve(DeclarationSet(context))
+        return step.attributes
 
     @property
     def chain(self):
-        if self.parent_step:
-            parent_chain = self.parent_step.chain
-        else:
-            parent_chain = ()
-        return (self.stub,) + parent_chain
-
-    def recurse(self, factory, declarations, force_sequence=None, collect_instances=None):
+        """The resolvers of this step and its parents, innermost first."""
+        if self._chain is None:
+            parent_chain = self.parent_step.chain if self.parent_step is not None else ()
+            self._chain = (self.stub,) + parent_chain
+        return self._chain
+
+    def get_ancestor(self, level):
+        """Retrieve the resolver ``level`` steps up; equivalent to ``chain[level]``."""
+        if not 0 <= level <= self.depth:
+            raise IndexError("%r has no parent at level %d." % (self, level))
+        step = self
+        for _ in range(level):
+            step = step.parent_step
+        return step.stub
+
+    def _get_sub_builder(self, factory, declarations, force_sequence):
         from . import base
         if not issubclass(factory, base.BaseFactory):
             raise errors.AssociatedClassError(
                 "%r: Attempting to recursing into a non-factory object %r"
                 % (self, factory))
-        builder = self.builder.recurse(factory._meta, declarations)
+        parallel = parallel_factory.get()
+        if parallel is not None and force_sequence is None:
+            # Dict and List reuse the sequence of their parent; other
+            # sub-factories would draw from the counters of the worker.
+            raise errors.FactoryError(
+                "Parallel batches of %s don't support sub-factories with their own sequence; "
+                "%r recursed into %s." % (parallel.__name__, self, factory.__name__))
+        return self.builder.recurse(factory._meta, declarations)
+
+    def recurse(self, factory, declarations, force_sequence=None, collect_instances=None):
+        builder = self._get_sub_builder(factory, declarations, force_sequence)
         return builder.build(
             parent_step=self,
             force_sequence=force_sequence,
             collect_instances=collect_instances,
         )
 
+    async def arecurse(self, factory, declarations, force_sequence=None):
+        builder = self._get_sub_builder(factory, declarations, force_sequence)
+        return await builder.abuild(parent_step=self, force_sequence=force_sequence)
+
     def __repr__(self):
         return f"<BuildStep for {self.builder!r}>"
 
@@ -244,6 +480,7 @@ class StepBuilder:
     - factory: the factory class being built
     - strategy: the strategy to use
     """
+
     def __init__(self, factory_meta, extras, strategy):
         self.factory_meta = factory_meta
         self.strategy = strategy
@@ -252,54 +489,210 @@ class StepBuilder:
 
     def build(self, parent_step=None, force_sequence=None, collect_instances=None):
         """Build a factory instance."""
-        # TODO: Handle "batch build" natively
-        pre, post = parse_declarations(
-            self.extras,
-            base_pre=self.factory_meta.pre_declarations,
-            base_post=self.factory_meta.post_declarations,
-        )
+        return self.build_batch(
+            1,
+            parent_step=parent_step,
+            force_sequence=force_sequence,
+            collect_instances=collect_instances,
+        )[0]
 
-        if force_sequence is not None:
-            sequence = force_sequence
-        elif self.force_init_sequence is not None:
-            sequence = self.force_init_sequence
-        else:
-            sequence = self.factory_meta.next_sequence()
+    def build_batch(self, size, parent_step=None, force_sequence=None, collect_instances=None):
+        """Build a batch of factory instances.
+
+        Declarations are parsed once for the whole batch; every instance is
+        then resolved and instantiated against that plan, and post-generation
+        declarations are run in a single pass once all instances exist.
+        """
+        plan = self.factory_meta.get_declaration_plan(self.extras)
+        pre, post = plan.apply(self.extras)
+        sequences = self._get_sequences(size, force_sequence)
+
+        steps = []
+        instances = []
+        for sequence in sequences:
+            step, instance = self._instantiate(plan, pre, parent_step, sequence)
+            instances.append(instance)
+            steps.append(step)
+
+        if collect_instances is not None:
+            collect_instances.extend(instances)
+            return instances
+
+        post_names = post.sorted()
+        for step, instance in zip(steps, instances):
+            self._postgenerate(post, post_names, step, instance)
+
+        return instances
 
+    def resolve_batch(self, size):
+        """Resolve the declarations of a batch, without instantiating it.
+
+        Returns:
+            (int, dict) list: the sequence and resolved attributes of each
+                instance of the batch.
+        """
+        plan = self.factory_meta.get_declaration_plan(self.extras)
+        pre, _post = plan.apply(self.extras)
+
+        resolved = []
+        for sequence in self._get_sequences(size, None):
+            step = BuildStep(builder=self, sequence=sequence, parent_step=None)
+            evaluation_order = step.resolve(pre, order=plan.evaluation_order)
+            if plan.evaluation_order is None:
+                plan.evaluation_order = evaluation_order
+            resolved.append((sequence, step.attributes))
+        return resolved
+
+    def iter_build(self, size=None, parent_step=None, force_sequence=None):
+        """Lazily build factory instances.
+
+        Like build_batch(), but each instance is fully generated (including
+        its post-generation declarations) only when requested.
+
+        Args:
+            size (int or None): the number of instances; None for an endless stream
+        """
+        plan = self.factory_meta.get_declaration_plan(self.extras)
+        pre, post = plan.apply(self.extras)
+        post_names = post.sorted()
+
+        counter = itertools.count() if size is None else range(size)
+        for _ in counter:
+            step, instance = self._instantiate(plan, pre, parent_step, self._get_sequence(force_sequence))
+            self._postgenerate(post, post_names, step, instance)
+            yield instance
+
+    async def abuild(self, parent_step=None, force_sequence=None):
+        """Asynchronously build a factory instance."""
+        instances = await self.abuild_batch(1, parent_step=parent_step, force_sequence=force_sequence)
+        return instances[0]
+
+    async def abuild_batch(self, size, parent_step=None, force_sequence=None):
+        """Asynchronously build a batch of factory instances.
+
+        Instances are generated concurrently; within each of them, the
+        declarations waiting for other objects (e.g. SubFactory,
+        RelatedFactory) are evaluated concurrently.
+        """
+        import asyncio
+        plan = self.factory_meta.get_declaration_plan(self.extras)
+        pre, post = plan.apply(self.extras)
+        post_names = post.sorted()
+
+        return list(await asyncio.gather(*(
+            self._agenerate(plan, pre, post, post_names, parent_step, sequence)
+            for sequence in self._get_sequences(size, force_sequence)
+        )))
+
+    async def _agenerate(self, plan, pre, post, post_names, parent_step, sequence):
+        import asyncio
         step = BuildStep(
             builder=self,
             sequence=sequence,
             parent_step=parent_step,
         )
-        step.resolve(pre)
+        evaluation_order = await step.aresolve(pre, order=plan.evaluation_order)
+        if plan.evaluation_order is None:
+            plan.evaluation_order = evaluation_order
 
         args, kwargs = self.factory_meta.prepare_arguments(step.attributes)
 
-        instance = self.factory_meta.instantiate(
+        instance = await self.factory_meta.ainstantiate(
             step=step,
             args=args,
             kwargs=kwargs,
         )
 
-        if collect_instances is None:
-            postgen_results = {}
-            for declaration_name in post.sorted():
-                declaration = post[declaration_name]
-                postgen_results[declaration_name] = declaration.declaration.evaluate_post(
-                    instance=instance,
-                    step=step,
-                    overrides=declaration.context,
-                )
-            self.factory_meta.use_postgeneration_results(
+        # Synchronous post-generation declarations run first, in order;
+        # the others are then awaited concurrently.
+        postgen_results = {}
+        pending = {}
+        for declaration_name in post_names:
+            declaration = post[declaration_name]
+            if getattr(declaration.declaration, 'ASYNC_EVALUATION', False):
+                pending[declaration_name] = declaration
+            else:
+                postgen_results[declaration_name] = self._evaluate_post(declaration, step, instance)
+        pending_results = await asyncio.gather(*(
+            declaration.declaration.aevaluate_post(
                 instance=instance,
                 step=step,
-                results=postgen_results,
+                overrides=declaration.context,
             )
-        else:
-            collect_instances.append(instance)
+            for declaration in pending.values()
+        ))
+        postgen_results.update(zip(pending, pending_results))
 
+        await self.factory_meta.ause_postgeneration_results(
+            instance=instance,
+            step=step,
+            results={name: postgen_results[name] for name in post_names},
+        )
         return instance
 
+    def _instantiate(self, plan, pre, parent_step, sequence):
+        step = BuildStep(
+            builder=self,
+            sequence=sequence,
+            parent_step=parent_step,
+        )
+        if self.factory_meta.compile and plan.evaluation_order is not None:
+            if _evaluation_hooks:
+                if plan.compiled_hooked is None:
+                    plan.compiled_hooked = self.factory_meta.compile_plan(plan, pre, hooked=True)
+                compiled = plan.compiled_hooked
+            else:
+                if plan.compiled is None:
+                    plan.compiled = self.factory_meta.compile_plan(plan, pre)
+                compiled = plan.compiled
+            args, kwargs = compiled(step, pre)
+        else:
+            evaluation_order = step.resolve(pre, order=plan.evaluation_order)
+            if plan.evaluation_order is None:
+                plan.evaluation_order = evaluation_order
+            args, kwargs = self.factory_meta.prepare_arguments(step.attributes)
+
+        instance = self.factory_meta.instantiate(
+            step=step,
+            args=args,
+            kwargs=kwargs,
+        )
+        return step, instance
+
+    def _postgenerate(self, post, post_names, step, instance):
+        postgen_results = {}
+        for declaration_name in post_names:
+            postgen_results[declaration_name] = self._evaluate_post(post[declaration_name], step, instance)
+        self.factory_meta.use_postgeneration_results(
+            instance=instance,
+            step=step,
+            results=postgen_results,
+        )
+
+    def _evaluate_post(self, declaration, step, instance, hooked=True):
+        if hooked and _evaluation_hooks:
+            return _evaluate_hooked(
+                step, declaration.name, functools.partial(self._evaluate_post, declaration, step, instance, False))
+        return declaration.declaration.evaluate_post(
+            instance=instance,
+            step=step,
+            overrides=declaration.context,
+        )
+
+    def _get_sequences(self, size, force_sequence=None):
+        if force_sequence is not None or self.force_init_sequence is not None or size <= 1:
+            return [self._get_sequence(force_sequence) for _ in range(size)]
+        # Claim sequence IDs for the whole batch at once.
+        return self.factory_meta.reserve_sequences(size)
+
+    def _get_sequence(self, force_sequence=None):
+        if force_sequence is not None:
+            return force_sequence
+        elif self.force_init_sequence is not None:
+            return self.force_init_sequence
+        else:
+            return self.factory_meta.next_sequence()
+
     def recurse(self, factory_meta, extras):
         """Recurse into a sub-factory call."""
         return self.__class__(factory_meta, extras, strategy=self.strategy)
@@ -323,6 +716,11 @@ class Resolver:
         __step (BuildStep): the BuildStep related to this resolver.
             This allows to have the value of a field depend on the value of
             another field
+        __async_tasks (dict): maps the names of the attributes being
+            evaluated asynchronously to their task
+        __async_waits (dict): maps the names of the attributes being
+            evaluated asynchronously to the set of sibling attributes they
+            wait for. This allows to detect cyclic definitions.
     """
 
     __initialized = False
@@ -333,6 +731,8 @@ class Resolver:
 
         self.__values = {}
         self.__pending = []
+        self.__async_tasks = {}
+        self.__async_waits = {}
 
         self.__initialized = True
 
@@ -349,26 +749,23 @@ class Resolver:
         This will compute it if needed, unless it is already on the list of
         attributes being computed.
         """
-        if name in self.__pending:
+        if name in self.__values:
+            return self.__values[name]
+        elif name in self.__async_tasks:
+            raise errors.FactoryError(
+                "Attribute %r is being evaluated asynchronously, and can't be read synchronously; "
+                "depend on it through a SelfAttribute instead." % name)
+        elif name in self.__pending:
             raise errors.CyclicDefinitionError(
                 "Cyclic lazy attribute definition for %r; cycle found in %r." %
                 (name, self.__pending))
-        elif name in self.__values:
-            return self.__values[name]
         elif name in self.__declarations:
-            declaration = self.__declarations[name]
-            value = declaration.declaration
-            if enums.get_builder_phase(value) == enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
-                self.__pending.append(name)
-                try:
-                    value = value.evaluate_pre(
-                        instance=self,
-                        step=self.__step,
-                        overrides=declaration.context,
-                    )
-                finally:
-                    last = self.__pending.pop()
-                assert name == last
+            self.__pending.append(name)
+            try:
+                value = self.__evaluate(name)
+            finally:
+                last = self.__pending.pop()
+            assert name == last
 
             self.__values[name] = value
             return value
@@ -377,6 +774,137 @@ class Resolver:
                 "The parameter %r is unknown. Evaluated attributes are %r, "
                 "definitions are %r." % (name, self.__values, self.__declarations))
 
+    def _lookup(self, name, default):
+        """Retrieve an attribute's value, or ``default`` if it is unknown.
+
+        Unlike getattr(), a miss doesn't build a detailed error message.
+        """
+        if name in self.__values or name in self.__declarations:
+            return getattr(self, name)
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            return default
+
+    def __evaluate(self, name, hooked=True):
+        if hooked and _evaluation_hooks:
+            return _evaluate_hooked(self.__step, name, functools.partial(self.__evaluate, name, False))
+        declaration = self.__declarations[name]
+        value = declaration.declaration
+        if enums.get_builder_phase(value) == enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
+            keyed = random.get_keyed_random()
+            if keyed is None:
+                return value.evaluate_pre(
+                    instance=self,
+                    step=self.__step,
+                    overrides=declaration.context,
+                )
+            step = self.__step
+            with keyed.draw(step.builder.factory_meta.factory, name, step.sequence, step.keyed_path):
+                value = value.evaluate_pre(
+                    instance=self,
+                    step=self.__step,
+                    overrides=declaration.context,
+                )
+        return value
+
+    def _resolve_all(self, order=None):
+        """Compute all declarations.
+
+        Names from ``order`` are evaluated first, without tracking pending
+        attributes: their dependencies are expected to be computed already.
+        A name reached otherwise goes through the usual, lazy resolution.
+
+        Returns:
+            (dict, str list): the computed values, in declaration order;
+                the names in the order they were computed.
+        """
+        if order is not None:
+            for name in order:
+                if name not in self.__values:
+                    self.__values[name] = self.__evaluate(name)
+
+        attributes = {name: getattr(self, name) for name in self.__declarations}
+        return attributes, list(self.__values)
+
+    async def _aresolve_all(self, order=None):
+        """Compute all declarations, awaiting asynchronous ones concurrently.
+
+        Declarations flagged with ASYNC_EVALUATION are evaluated first,
+        concurrently; the other ones are then computed as in _resolve_all().
+
+        While they run, their task is recorded: a SelfAttribute pointing at such
+        a field from a nested factory awaits it, instead of evaluating it again.
+        """
+        import asyncio
+        await self.__await_ancestors()
+        tasks = self.__async_tasks
+        for name in self.__declarations:
+            if getattr(self.__declarations[name].declaration, 'ASYNC_EVALUATION', False):
+                tasks[name] = asyncio.ensure_future(self.__aevaluate(name))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            tasks.clear()
+            self.__async_waits.clear()
+        return self._resolve_all(order)
+
+    async def __await_ancestors(self):
+        """Wait for the asynchronous fields of parent factories read by SelfAttribute declarations."""
+        from . import declarations
+        for declaration in self.__declarations.values():
+            value = declaration.declaration
+            if not isinstance(value, declarations.SelfAttribute) or value.depth <= 1:
+                continue
+            if value.depth - 1 > self.__step.depth:
+                continue
+            ancestor = self.__step.get_ancestor(value.depth - 1)
+            name = value._path[0]
+            task = ancestor.__async_tasks.get(name)
+            if task is None:
+                continue
+            for resolver, waiting in _async_fields.get():
+                if resolver is ancestor:
+                    ancestor.__add_async_wait(waiting, name)
+                    break
+            await task
+
+    def __add_async_wait(self, waiting, name):
+        """Record that the asynchronous field ``waiting`` waits for ``name``.
+
+        Raises CyclicDefinitionError if ``name`` already waits for ``waiting``.
+        """
+        seen = set()
+        names = [name]
+        while names:
+            current = names.pop()
+            if current == waiting:
+                raise errors.CyclicDefinitionError(
+                    "Cyclic lazy attribute definition for %r; cycle found in %r." %
+                    (name, [waiting, name]))
+            if current not in seen:
+                seen.add(current)
+                names.extend(self.__async_waits.get(current, ()))
+        self.__async_waits.setdefault(waiting, set()).add(name)
+
+    async def __aevaluate(self, name):
+        declaration = self.__declarations[name]
+        keyed = random.get_keyed_random()
+        step = self.__step
+        draw = contextlib.nullcontext() if keyed is None else keyed.draw(
+            step.builder.factory_meta.factory, name, step.sequence, step.keyed_path)
+        token = _async_fields.set(_async_fields.get() + ((self, name),))
+        try:
+            with draw:
+                value = await declaration.declaration.aevaluate_pre(
+                    instance=self,
+                    step=self.__step,
+                    overrides=declaration.context,
+                )
+        finally:
+            _async_fields.reset(token)
+        self.__values[name] = value
+
     def __setattr__(self, name, value):
         """Prevent setting attributes once __init__ is done."""
         if not self.__initialized:
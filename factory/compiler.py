@@ -0,0 +1,169 @@
+# Copyright: See the LICENSE file.
+
+"""Generate build functions specialised to a factory's declarations."""
+
+from . import builder, declarations, enums
+
+
+def compile(factory):
+    """Build the instances of a factory through generated functions.
+
+    Equivalent to setting ``compile = True`` in the factory's ``class Meta``;
+    factories declared afterwards inherit that setting.
+
+    Returns the factory, allowing to use this function as a class decorator.
+    """
+    factory._meta.compile = True
+    return factory
+
+
+class _Generator:
+    """Write the source code of a build function.
+
+    Values referenced by the generated code (declarations, functions,
+    constants) are stored in its namespace.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            'Resolver': builder.Resolver,
+            'SKIP': declarations.SKIP,
+        }
+
+    def emit(self, line):
+        self.lines.append('    ' + line)
+
+    def bind(self, value):
+        name = '_v%d' % len(self.namespace)
+        self.namespace[name] = value
+        return name
+
+    def build(self, name):
+        source = 'def %s(step, pre):\n%s\n' % (name, '\n'.join(self.lines))
+        exec(source, self.namespace)
+        function = self.namespace[name]
+        function.source = source
+        return function
+
+
+def _specialise(gen, declaration):
+    """Write the expression computing a declaration, if it can be inlined.
+
+    Returns:
+        (str, bool) or None: the expression, and whether the value is always
+            computed; None for declarations left to the generic engine.
+    """
+    if enums.get_builder_phase(declaration) is None:
+        return gen.bind(declaration), True
+
+    if getattr(declaration, '_defaults', None):
+        return None
+    kind = type(declaration)
+    if kind is declarations.LazyFunction:
+        return '%s()' % gen.bind(declaration.function), False
+    if kind is declarations.LazyAttribute:
+        return '%s(resolver)' % gen.bind(declaration.function), False
+    if kind is declarations.Sequence:
+        return '%s(int(step.sequence))' % gen.bind(declaration.function), False
+    if (kind is declarations.SelfAttribute
+            and declaration.depth <= 1
+            and declaration.default is declarations._UNSPECIFIED):
+        expression = 'resolver'
+        for attribute in declaration._path:
+            expression = 'getattr(%s, %r)' % (expression, attribute)
+        return expression, False
+    return None
+
+
+def _can_fold_arguments(factory_meta):
+    from . import base
+    return (
+        type(factory_meta).prepare_arguments is base.FactoryOptions.prepare_arguments
+        and factory_meta.factory._adjust_kwargs.__func__ is base.BaseFactory._adjust_kwargs.__func__
+    )
+
+
+def compile_plan(factory_meta, plan, pre, hooked=False):
+    """Generate the function resolving the declarations of a DeclarationPlan.
+
+    The declarations are evaluated in the plan's recorded order. Plain values
+    and common lazy declarations are inlined; other declarations, and those
+    receiving call-time values or a nested context, go through the generic
+    Resolver. Unless the factory customises it, prepare_arguments() is folded
+    in as well.
+
+    Args:
+        factory_meta (FactoryOptions): the options of the factory
+        plan (builder.DeclarationPlan): a plan whose evaluation order is known
+        pre (builder.DeclarationSet): the pre-declarations of a call using
+            that plan
+        hooked (bool): whether inlined declarations go through the
+            evaluation hooks (see builder.add_evaluation_hook())
+
+    Returns:
+        callable(step, pre) => (args, kwargs): fills the BuildStep as
+            BuildStep.resolve() would, then prepares the arguments of the
+            instantiation.
+    """
+    gen = _Generator()
+    gen.namespace['hooked'] = builder._evaluate_hooked
+    routed = {root for _key, root, _sub in plan.pre_routes}
+    names = list(pre)
+    order = [name for name in plan.evaluation_order if name in pre]
+    order += [name for name in names if name not in order]
+
+    gen.emit('resolver = step.stub = Resolver(declarations=pre, step=step, sequence=step.sequence)')
+    gen.emit('values = resolver._Resolver__values')
+    gen.emit('evaluate = resolver._Resolver__evaluate')
+
+    constants = set()
+    for name in order:
+        key = repr(name)
+        specialised = None
+        if name not in routed and not pre.contexts.get(name):
+            specialised = _specialise(gen, pre.declarations[name])
+
+        if specialised is None:
+            gen.emit('if %s not in values:' % key)
+            gen.emit('    values[%s] = evaluate(%s)' % (key, key))
+            continue
+
+        expression, constant = specialised
+        if hooked:
+            expression = 'hooked(step, %s, lambda: %s)' % (key, expression)
+        if constant:
+            constants.add(name)
+            gen.emit('values[%s] = %s' % (key, expression))
+        else:
+            gen.emit('if %s not in values:' % key)
+            gen.emit('    values[%s] = %s' % (key, expression))
+
+    gen.emit('step.attributes = attributes = {%s}' % ', '.join(
+        '%r: values[%r]' % (name, name) for name in names
+    ))
+
+    if not _can_fold_arguments(factory_meta):
+        gen.emit('return meta.prepare_arguments(attributes)')
+        gen.namespace['meta'] = factory_meta
+        return gen.build('build_%s' % factory_meta.factory.__name__)
+
+    gen.emit('kwargs = {}')
+    for name in names:
+        if name in factory_meta.exclude or name in factory_meta.parameters:
+            continue
+        key = repr(name)
+        if name in constants and pre.declarations[name] is not declarations.SKIP:
+            gen.emit('kwargs[%s] = values[%s]' % (key, key))
+        elif name not in constants:
+            gen.emit('value = values[%s]' % key)
+            gen.emit('if value is not SKIP:')
+            gen.emit('    kwargs[%s] = value' % key)
+    for old_name, new_name in factory_meta.rename.items():
+        gen.emit('if %r in kwargs:' % (old_name,))
+        gen.emit('    kwargs[%r] = kwargs.pop(%r)' % (new_name, old_name))
+    gen.emit('args = (%s)' % ''.join(
+        'kwargs.pop(%r), ' % (arg_name,) for arg_name in factory_meta.inline_args
+    ))
+    gen.emit('return args, kwargs')
+    return gen.build('build_%s' % factory_meta.factory.__name__)
@@ -1,11 +1,11 @@
 # Copyright: See the LICENSE file.
 
 
-import itertools
+import inspect
 import logging
 import typing as T
 
-from . import enums, errors, utils
+from . import builder, enums, errors, random, utils
 
 logger = logging.getLogger('factory.generate')
 
@@ -29,6 +29,11 @@ class BaseDeclaration(utils.OrderedBase):
     #: Set to False on declarations that perform their own unrolling.
     UNROLL_CONTEXT_BEFORE_EVALUATION = True
 
+    #: Whether evaluating this declaration may wait for objects to be created,
+    #: with the asynchronous API (e.g. SubFactory); those declarations are
+    #: evaluated concurrently, through aevaluate_pre() / aevaluate_post().
+    ASYNC_EVALUATION = False
+
     def __init__(self, **defaults):
         super().__init__()
         self._defaults = defaults or {}
@@ -44,9 +49,7 @@ class BaseDeclaration(utils.OrderedBase):
             # Optimization for simple contexts - don't do anything.
             return full_context
 
-        import factory.base
-        subfactory = factory.base.DictFactory
-        return step.recurse(subfactory, full_context, force_sequence=step.sequence)
+        return step.resolve_context(full_context)
 
     def _unwrap_evaluate_pre(self, wrapped, *, instance, step, overrides):
         """Evaluate a wrapped pre-declaration.
@@ -66,6 +69,22 @@ class BaseDeclaration(utils.OrderedBase):
         context = self.unroll_context(instance, step, overrides)
         return self.evaluate(instance, step, context)
 
+    async def aevaluate_pre(self, instance, step, overrides):
+        """Asynchronous counterpart of evaluate_pre(), for ASYNC_EVALUATION declarations."""
+        return self.evaluate_pre(instance=instance, step=step, overrides=overrides)
+
+    async def aevaluate_post(self, instance, step, overrides):
+        """Asynchronous counterpart of evaluate_post(), for ASYNC_EVALUATION declarations."""
+        return self.evaluate_post(instance=instance, step=step, overrides=overrides)
+
+    def get_dependencies(self):
+        """Retrieve the names of sibling fields this declaration always reads.
+
+        Used to detect cyclic definitions when the factory is declared;
+        dependencies that can't be known in advance are simply omitted.
+        """
+        return ()
+
     def evaluate(self, instance, step, extra):
         """Evaluate this declaration.
 
@@ -143,6 +162,8 @@ class Transformer(BaseDeclaration):
 
     def evaluate_pre(self, instance, step, overrides):
         # The call-time value, if present, is set under the "" key.
+        # Work on a copy: the same overrides are shared by a whole batch.
+        overrides = dict(overrides)
         value_or_declaration = overrides.pop("", self.default)
 
         if isinstance(value_or_declaration, self.Force):
@@ -182,12 +203,29 @@ def deepgetattr(obj, name, default=_UNSPECIFIED):
     Raises:
         AttributeError: if obj has no 'name' attribute.
     """
+    return _getattr_path(obj, name.split('.'), default)
+
+
+def _getattr_path(obj, path, default=_UNSPECIFIED):
+    """Follow a pre-split attribute path, as deepgetattr() does.
+
+    When a default is provided, fields missing from a Resolver are detected
+    without building the AttributeError raised by a plain getattr().
+
+    Args:
+        obj (object): the object of which an attribute should be read
+        path (str list): the successive attribute names to look up
+        default (object): the default value to use if an attribute wasn't found
+    """
     try:
-        if '.' in name:
-            attr, subname = name.split('.', 1)
-            return deepgetattr(getattr(obj, attr), subname, default)
-        else:
-            return getattr(obj, name)
+        for name in path:
+            if default is not _UNSPECIFIED and isinstance(obj, builder.Resolver):
+                obj = obj._lookup(name, _UNSPECIFIED)
+                if obj is _UNSPECIFIED:
+                    return default
+            else:
+                obj = getattr(obj, name)
+        return obj
     except AttributeError:
         if default is _UNSPECIFIED:
             raise
@@ -216,16 +254,22 @@ class SelfAttribute(BaseDeclaration):
         self.depth = depth
         self.attribute_name = attribute_name
         self.default = default
+        self._path = tuple(attribute_name.split('.'))
 
     def evaluate(self, instance, step, extra):
         if self.depth > 1:
             # Fetching from a parent
-            target = step.chain[self.depth - 1]
+            target = step.get_ancestor(self.depth - 1)
         else:
             target = instance
 
         logger.debug("SelfAttribute: Picking attribute %r on %r", self.attribute_name, target)
-        return deepgetattr(target, self.attribute_name, self.default)
+        return _getattr_path(target, self._path, self.default)
+
+    def get_dependencies(self):
+        if self.depth > 1:
+            return ()
+        return (self.attribute_name.split('.', 1)[0],)
 
     def __repr__(self):
         return '<%s(%r, default=%r)>' % (
@@ -242,27 +286,30 @@ class Iterator(BaseDeclaration):
 
     Attributes:
         iterator (iterable): the iterator whose value should be used.
+        cycle (bool): whether to start again once the iterator is exhausted
         getter (callable or None): a function to parse returned values
+        resettable (bool): whether the values of a one-shot iterator are kept
+            for reset(); without cycle, they are then streamed.
     """
 
-    def __init__(self, iterator, cycle=True, getter=None):
+    def __init__(self, iterator, cycle=True, getter=None, resettable=True):
         super().__init__()
         self.getter = getter
         self.iterator = None
-
-        if cycle:
-            self.iterator_builder = lambda: utils.ResetableIterator(itertools.cycle(iterator))
-        else:
-            self.iterator_builder = lambda: utils.ResetableIterator(iterator)
+        self.iterator_builder = lambda: utils.CyclingIterator(iterator, cycle=cycle, resettable=resettable)
 
     def evaluate(self, instance, step, extra):
         # Begin unrolling as late as possible.
-        # This helps with ResetableIterator(MyModel.objects.all())
+        # This helps with Iterator(MyModel.objects.all())
         if self.iterator is None:
             self.iterator = self.iterator_builder()
 
-        logger.debug("Iterator: Fetching next value from %r", self.iterator)
-        value = next(iter(self.iterator))
+        if random.get_keyed_draw() is not None:
+            # Within keyed_random(), the value depends on the sequence only.
+            value = self.iterator.value_at(int(step.sequence))
+        else:
+            logger.debug("Iterator: Fetching next value from %r", self.iterator)
+            value = next(self.iterator)
         if self.getter is None:
             return value
         return self.getter(value)
@@ -331,8 +378,8 @@ class ContainerAttribute(BaseDeclaration):
                 being evaluated in a chain, each item being a future field of
                 next one.
         """
-        # Strip the current instance from the chain
-        chain = step.chain[1:]
+        # The chain of containers, without the current instance
+        chain = step.parent_step.chain if step.parent_step is not None else ()
         if self.strict and not chain:
             raise TypeError(
                 "A ContainerAttribute in 'strict' mode can only be used "
@@ -429,6 +476,7 @@ class SubFactory(BaseDeclaration):
     # factory's sequence counter
     FORCE_SEQUENCE = False
     UNROLL_CONTEXT_BEFORE_EVALUATION = False
+    ASYNC_EVALUATION = True
 
     def __init__(self, factory, **kwargs):
         super().__init__(**kwargs)
@@ -456,6 +504,12 @@ class SubFactory(BaseDeclaration):
         force_sequence = step.sequence if self.FORCE_SEQUENCE else None
         return step.recurse(subfactory, extra, force_sequence=force_sequence)
 
+    async def aevaluate_pre(self, instance, step, overrides):
+        extra = self.unroll_context(instance, step, overrides)
+        subfactory = self.get_factory()
+        force_sequence = step.sequence if self.FORCE_SEQUENCE else None
+        return await step.arecurse(subfactory, extra, force_sequence=force_sequence)
+
 
 class Dict(SubFactory):
     """Fill a dict with usual declarations."""
@@ -484,6 +538,10 @@ class Skip:
     def __bool__(self):
         return False
 
+    def __reduce__(self):
+        # Unpickle to the SKIP singleton, e.g. from a parallel batch worker.
+        return 'SKIP'
+
 
 SKIP = Skip()
 
@@ -510,9 +568,12 @@ class Maybe(BaseDeclaration):
             raise TypeError(f"Inconsistent phases for {self!r}: {phases!r}")
 
         self.FACTORY_BUILDER_PHASE = used_phases.pop() if used_phases else enums.BuilderPhase.ATTRIBUTE_RESOLUTION
+        self.ASYNC_EVALUATION = any(
+            getattr(declaration, 'ASYNC_EVALUATION', False)
+            for declaration in (yes_declaration, no_declaration)
+        )
 
-    def evaluate_post(self, instance, step, overrides):
-        """Handle post-generation declarations"""
+    def _choose_post(self, instance, step, overrides):
         decider_phase = enums.get_builder_phase(self.decider)
         if decider_phase == enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
             # Note: we work on the *builder stub*, not on the actual instance.
@@ -524,7 +585,11 @@ class Maybe(BaseDeclaration):
             choice = self.decider.evaluate_post(
                 instance=instance, step=step, overrides={})
 
-        target = self.yes if choice else self.no
+        return self.yes if choice else self.no
+
+    def evaluate_post(self, instance, step, overrides):
+        """Handle post-generation declarations"""
+        target = self._choose_post(instance, step, overrides)
         if enums.get_builder_phase(target) == enums.BuilderPhase.POST_INSTANTIATION:
             return target.evaluate_post(
                 instance=instance,
@@ -535,6 +600,12 @@ class Maybe(BaseDeclaration):
             # Flat value (can't be ATTRIBUTE_RESOLUTION, checked in __init__)
             return target
 
+    async def aevaluate_post(self, instance, step, overrides):
+        target = self._choose_post(instance, step, overrides)
+        if enums.get_builder_phase(target) == enums.BuilderPhase.POST_INSTANTIATION:
+            return await target.aevaluate_post(instance=instance, step=step, overrides=overrides)
+        return target
+
     def evaluate_pre(self, instance, step, overrides):
         choice = self.decider.evaluate_pre(instance=instance, step=step, overrides={})
         target = self.yes if choice else self.no
@@ -547,6 +618,19 @@ class Maybe(BaseDeclaration):
             overrides=overrides,
         )
 
+    async def aevaluate_pre(self, instance, step, overrides):
+        choice = self.decider.evaluate_pre(instance=instance, step=step, overrides={})
+        target = self.yes if choice else self.no
+        if isinstance(target, BaseDeclaration):
+            return await target.aevaluate_pre(instance=instance, step=step, overrides=overrides)
+        return target
+
+    def get_dependencies(self):
+        # Only the decider is always evaluated.
+        if enums.get_builder_phase(self.decider) != enums.BuilderPhase.ATTRIBUTE_RESOLUTION:
+            return ()
+        return getattr(self.decider, 'get_dependencies', tuple)()
+
     def __repr__(self):
         return f'Maybe({self.decider!r}, yes={self.yes!r}, no={self.no!r})'
 
@@ -616,6 +700,21 @@ class Trait(Parameter):
             )
         return overrides
 
+    def as_static_declarations(self, field_name, declarations, enabled):
+        """Compute the overrides when the trait's state is known in advance.
+
+        Each Maybe is replaced with its chosen branch, unless that would change
+        how the field is handled: another builder phase, or a declaration
+        capturing call-time overrides (which a Maybe doesn't).
+        """
+        overrides = self.as_declarations(field_name, declarations)
+        for maybe_field, maybe in overrides.items():
+            chosen = maybe.yes if enabled else maybe.no
+            phase = enums.get_builder_phase(chosen) or enums.BuilderPhase.ATTRIBUTE_RESOLUTION
+            if phase == maybe.FACTORY_BUILDER_PHASE and not getattr(chosen, 'CAPTURE_OVERRIDES', False):
+                overrides[maybe_field] = chosen
+        return overrides
+
     def get_revdeps(self, parameters):
         """This might alter fields it's injecting."""
         return [param for param in parameters if param in self.overrides]
@@ -642,14 +741,23 @@ class PostGenerationDeclaration(BaseDeclaration):
 
     FACTORY_BUILDER_PHASE = enums.BuilderPhase.POST_INSTANTIATION
 
-    def evaluate_post(self, instance, step, overrides):
+    def _get_context(self, instance, step, overrides):
         context = self.unroll_context(instance, step, overrides)
-        postgen_context = PostGenerationContext(
+        return PostGenerationContext(
             value_provided=bool('' in context),
             value=context.get(''),
             extra={k: v for k, v in context.items() if k != ''},
         )
-        return self.call(instance, step, postgen_context)
+
+    def evaluate_post(self, instance, step, overrides):
+        return self.call(instance, step, self._get_context(instance, step, overrides))
+
+    async def aevaluate_post(self, instance, step, overrides):
+        return await self.acall(instance, step, self._get_context(instance, step, overrides))
+
+    async def acall(self, instance, step, context):
+        """Asynchronous counterpart of call(); defaults to call()."""
+        return self.call(instance, step, context)
 
     def call(self, instance, step, context):  # pragma: no cover
         """Call this hook; no return value is expected.
@@ -668,6 +776,7 @@ class PostGeneration(PostGenerationDeclaration):
     def __init__(self, function):
         super().__init__()
         self.function = function
+        self.ASYNC_EVALUATION = inspect.iscoroutinefunction(function)
 
     def call(self, instance, step, context):
         logger.debug(
@@ -683,6 +792,12 @@ class PostGeneration(PostGenerationDeclaration):
         return self.function(
             instance, create, context.value, **context.extra)
 
+    async def acall(self, instance, step, context):
+        result = self.call(instance, step, context)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
 
 class RelatedFactory(PostGenerationDeclaration):
     """Calls a factory once the object has been generated.
@@ -695,6 +810,7 @@ class RelatedFactory(PostGenerationDeclaration):
     """
 
     UNROLL_CONTEXT_BEFORE_EVALUATION = False
+    ASYNC_EVALUATION = True
 
     def __init__(self, factory, factory_related_name='', **defaults):
         super().__init__()
@@ -707,6 +823,20 @@ class RelatedFactory(PostGenerationDeclaration):
         """Retrieve the wrapped factory.Factory subclass."""
         return self.factory_wrapper.get()
 
+    def _get_kwargs(self, factory, instance, step, context):
+        passed_kwargs = dict(self.defaults)
+        passed_kwargs.update(context.extra)
+        if self.name:
+            passed_kwargs[self.name] = instance
+
+        logger.debug(
+            "RelatedFactory: Generating %s.%s(%s)",
+            factory.__module__,
+            factory.__name__,
+            utils.log_pprint((step,), passed_kwargs),
+        )
+        return passed_kwargs
+
     def call(self, instance, step, context):
         factory = self.get_factory()
 
@@ -719,18 +849,14 @@ class RelatedFactory(PostGenerationDeclaration):
             )
             return context.value
 
-        passed_kwargs = dict(self.defaults)
-        passed_kwargs.update(context.extra)
-        if self.name:
-            passed_kwargs[self.name] = instance
+        return step.recurse(factory, self._get_kwargs(factory, instance, step, context))
 
-        logger.debug(
-            "RelatedFactory: Generating %s.%s(%s)",
-            factory.__module__,
-            factory.__name__,
-            utils.log_pprint((step,), passed_kwargs),
-        )
-        return step.recurse(factory, passed_kwargs)
+    async def acall(self, instance, step, context):
+        if context.value_provided:
+            return self.call(instance, step, context)
+
+        factory = self.get_factory()
+        return await step.arecurse(factory, self._get_kwargs(factory, instance, step, context))
 
 
 class RelatedFactoryList(RelatedFactory):
@@ -756,6 +882,14 @@ class RelatedFactoryList(RelatedFactory):
             for i in range(self.size if isinstance(self.size, int) else self.size())
         ]
 
+    async def acall(self, instance, step, context):
+        import asyncio
+        parent = super()
+        return list(await asyncio.gather(*(
+            parent.acall(instance, step, context)
+            for i in range(self.size if isinstance(self.size, int) else self.size())
+        )))
+
 
 class NotProvided:
     pass
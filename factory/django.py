@@ -4,7 +4,9 @@
 """factory_boy extensions for use with the Django framework."""
 
 
+import collections.abc
 import functools
+import inspect
 import io
 import logging
 import os
@@ -12,12 +14,13 @@ import warnings
 from collections import defaultdict
 from typing import Dict, TypeVar
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.hashers import make_password
 from django.core import files as django_files
 from django.db import IntegrityError, connections, models
 from django.db.models.sql import InsertQuery
 
-from . import base, builder, declarations, enums, errors
+from . import base, builder, declarations, enums, errors, fuzzy
 
 logger = logging.getLogger('factory.generate')
 
@@ -140,10 +143,37 @@ class DjangoModelFactory(base.Factory[T]):
         return super()._generate(strategy, params)
 
     @classmethod
-    def _get_or_create(cls, model_class, *args, **kwargs):
-        """Create an instance of the model through objects.get_or_create."""
-        manager = cls._get_manager(model_class)
+    def _generate_batch(cls, strategy, size, params):
+        cls._original_params = params
+        return super()._generate_batch(strategy, size, params)
+
+    @classmethod
+    def _generate_iter(cls, strategy, size, params):
+        return cls._iter_with_original_params(super()._generate_iter(strategy, size, params), params)
+
+    @classmethod
+    def _iter_with_original_params(cls, instances, params):
+        # Factory calls made while the iterator is paused overwrite
+        # _original_params: restore it before each instance.
+        try:
+            while True:
+                cls._original_params = params
+                try:
+                    instance = next(instances)
+                except StopIteration:
+                    return
+                yield instance
+        finally:
+            instances.close()
+
+    @classmethod
+    async def _agenerate_batch(cls, strategy, size, params):
+        cls._original_params = params
+        return await super()._agenerate_batch(strategy, size, params)
 
+    @classmethod
+    def _get_or_create_fields(cls, kwargs):
+        """Split kwargs into the get_or_create() lookup fields and defaults."""
         assert 'defaults' not in cls._meta.django_get_or_create, (
             "'defaults' is a reserved keyword for get_or_create "
             "(in %s._meta.django_get_or_create=%r)"
@@ -158,27 +188,55 @@ class DjangoModelFactory(base.Factory[T]):
                     (field, cls.__name__))
             key_fields[field] = kwargs.pop(field)
         key_fields['defaults'] = kwargs
+        return key_fields
+
+    @classmethod
+    def _get_or_create_lookup(cls, error):
+        """Lookup for the existing instance, after get_or_create() failed on error."""
+        if cls._original_params is None:
+            raise error
+
+        get_or_create_params = {
+            lookup: value
+            for lookup, value in cls._original_params.items()
+            if lookup in cls._meta.django_get_or_create
+        }
+        if not get_or_create_params:
+            raise error
+        return get_or_create_params
+
+    @classmethod
+    def _get_or_create(cls, model_class, *args, **kwargs):
+        """Create an instance of the model through objects.get_or_create."""
+        manager = cls._get_manager(model_class)
+        key_fields = cls._get_or_create_fields(kwargs)
 
         try:
             instance, _created = manager.get_or_create(*args, **key_fields)
         except IntegrityError as e:
-
-            if cls._original_params is None:
+            get_or_create_params = cls._get_or_create_lookup(e)
+            try:
+                instance = manager.get(**get_or_create_params)
+            except manager.model.DoesNotExist:
+                # Original params are not a valid lookup and triggered a create(),
+                # that resulted in an IntegrityError. Follow Django’s behavior.
                 raise e
 
-            get_or_create_params = {
-                lookup: value
-                for lookup, value in cls._original_params.items()
-                if lookup in cls._meta.django_get_or_create
-            }
-            if get_or_create_params:
-                try:
-                    instance = manager.get(**get_or_create_params)
-                except manager.model.DoesNotExist:
-                    # Original params are not a valid lookup and triggered a create(),
-                    # that resulted in an IntegrityError. Follow Django’s behavior.
-                    raise e
-            else:
+        return instance
+
+    @classmethod
+    async def _aget_or_create(cls, model_class, *args, **kwargs):
+        """Create an instance of the model through objects.aget_or_create."""
+        manager = cls._get_manager(model_class)
+        key_fields = cls._get_or_create_fields(kwargs)
+
+        try:
+            instance, _created = await manager.aget_or_create(*args, **key_fields)
+        except IntegrityError as e:
+            get_or_create_params = cls._get_or_create_lookup(e)
+            try:
+                instance = await manager.aget(**get_or_create_params)
+            except manager.model.DoesNotExist:
                 raise e
 
         return instance
@@ -199,7 +257,9 @@ class DjangoModelFactory(base.Factory[T]):
     @classmethod
     def create_batch(cls, size, **kwargs):
         if not cls.supports_bulk_insert():
-            return super().create_batch(size, **kwargs)
+            if base._overrides(cls, 'create', DjangoModelFactory):
+                return [cls.create(**kwargs) for _ in range(size)]
+            return cls._generate_batch(enums.CREATE_STRATEGY, size, kwargs)
 
         return cls._bulk_create(size, **kwargs)
 
@@ -238,11 +298,9 @@ class DjangoModelFactory(base.Factory[T]):
                 "Ensure %(f)s.Meta.model is set and %(f)s.Meta.abstract "
                 "is either not set or False." % dict(f=cls.__name__))
 
-        models_to_return = []
         instances = []
-        for _ in range(size):
-            step = builder.StepBuilder(cls._meta, kwargs, enums.BUILD_STRATEGY)
-            models_to_return.append(step.build(collect_instances=instances))
+        step = builder.StepBuilder(cls._meta, kwargs, enums.BUILD_STRATEGY)
+        models_to_return = step.build_batch(size, collect_instances=instances)
 
         for model_cls, objs in dependency_insert_order(instances):
             manager = cls._get_manager(model_cls)
@@ -275,10 +333,37 @@ class DjangoModelFactory(base.Factory[T]):
         manager = cls._get_manager(model_class)
         return manager.create(*args, **kwargs)
 
-    # DEPRECATED. Remove this override with the next major release.
+    @classmethod
+    async def _acreate(cls, model_class, *args, **kwargs):
+        """Create an instance of the model through Django's asynchronous ORM.
+
+        An overridden _create() (e.g. calling ``create_user()``) is run
+        through sync_to_async() instead, so that acreate() matches create().
+        """
+        if inspect.unwrap(cls._create.__func__) is not DjangoModelFactory._create.__func__:
+            return await sync_to_async(cls._create)(model_class, *args, **kwargs)
+
+        if cls._meta.django_get_or_create:
+            return await cls._aget_or_create(model_class, *args, **kwargs)
+
+        manager = cls._get_manager(model_class)
+        return await manager.acreate(*args, **kwargs)
+
+    # DEPRECATED. Remove these overrides with the next major release.
     @classmethod
     def _after_postgeneration(cls, instance, create, results=None):
         """Save again the instance if creating and at least one hook ran."""
+        if cls._needs_postgeneration_save(create, results):
+            # Some post-generation hooks ran, and may have modified us.
+            instance.save()
+
+    @classmethod
+    async def _aafter_postgeneration(cls, instance, create, results=None):
+        if cls._needs_postgeneration_save(create, results):
+            await instance.asave()
+
+    @classmethod
+    def _needs_postgeneration_save(cls, create, results):
         if create and results and not cls._meta.skip_postgeneration_save:
             warnings.warn(
                 f"{cls.__name__}._after_postgeneration will stop saving the instance "
@@ -289,8 +374,8 @@ class DjangoModelFactory(base.Factory[T]):
                 "postgeneration hooks or override _after_postgeneration.",
                 DeprecationWarning,
             )
-            # Some post-generation hooks ran, and may have modified us.
-            instance.save()
+            return True
+        return False
 
 
 class Password(declarations.Transformer):
@@ -373,6 +458,101 @@ class ImageField(FileField):
         return thumb_io.getvalue()
 
 
+class _QuerysetSource(collections.abc.Sequence):
+    """The rows of a queryset, fetched in chunks on each iteration.
+
+    Indexing, as used within factory.random.keyed_random(), fetches the
+    primary keys of the rows once, then a single row by primary key.
+    """
+
+    def __init__(self, queryset, fields, chunk_size):
+        self.queryset = queryset
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self._pks = None
+
+    def get_ordered_queryset(self):
+        queryset = self.queryset.all()
+        if not queryset.ordered:
+            # Unordered rows may come back in any order, from one query to the next.
+            queryset = queryset.order_by('pk')
+        return queryset
+
+    def get_queryset(self):
+        queryset = self.get_ordered_queryset()
+        if self.fields is None:
+            return queryset
+        if isinstance(self.fields, str):
+            return queryset.values_list(self.fields, flat=True)
+        return queryset.values_list(*self.fields)
+
+    def get_pks(self):
+        if self._pks is None:
+            self._pks = list(self.get_ordered_queryset().values_list('pk', flat=True))
+        return self._pks
+
+    def __iter__(self):
+        # Rows may have been added since the previous iteration.
+        self._pks = None
+        return self.get_queryset().iterator(chunk_size=self.chunk_size)
+
+    def __len__(self):
+        return len(self.get_pks())
+
+    def __getitem__(self, index):
+        return self.get_queryset().get(pk=self.get_pks()[index])
+
+    def __repr__(self):
+        return '<_QuerysetSource for %r>' % self.queryset
+
+
+class QuerysetIterator(declarations.Iterator):
+    """Fill a field with the rows of a queryset, fetched in chunks.
+
+    Rows are streamed through QuerySet.iterator(), without being cached;
+    each cycle issues the query again.
+
+    Args:
+        queryset (QuerySet or Manager): the rows to iterate over
+        fields (str, str list or None): fetch only these fields, as values
+            for a single field name or as tuples, instead of model instances
+        chunk_size (int): the number of rows fetched at once
+        cycle (bool): whether to issue the query again once exhausted
+        getter (callable or None): a function to parse returned values
+    """
+
+    def __init__(self, queryset, fields=None, chunk_size=2000, cycle=True, getter=None):
+        super().__init__(_QuerysetSource(queryset, fields, chunk_size), cycle=cycle, getter=getter)
+
+
+class FuzzyQuerysetChoice(fuzzy.BaseFuzzyRowChoice):
+    """Random choice among the rows of a queryset.
+
+    Only the primary keys of the rows are loaded; chosen objects are
+    fetched by batches, through QuerySet.in_bulk().
+
+    Args:
+        queryset (QuerySet or Manager): the rows to choose from
+        weights (str or None): a field holding the weight of each row
+        fetch (bool): whether to yield model instances, or their primary keys
+        batch_size (int): the number of objects fetched at once
+        refresh_every (int or None): reload the primary keys after that many draws
+    """
+
+    def __init__(self, queryset, weights=None, fetch=True, batch_size=100, refresh_every=None):
+        super().__init__(weights=weights, fetch=fetch, batch_size=batch_size, refresh_every=refresh_every)
+        self.queryset = queryset
+
+    def fetch_pks(self):
+        queryset = self.queryset.all()
+        if self.weights is None:
+            return queryset.values_list('pk', flat=True).iterator()
+        return queryset.values_list('pk', self.weights).iterator()
+
+    def fetch_objects(self, pks):
+        return self.queryset.all().in_bulk(pks)
+
+
 def dependency_insert_order(data):
     """This is almost the same function from django/core/serializers/__init__.py:sort_dependencies with a slight
     modification on `if hasattr(rel_model, 'natural_key') and rel_model != model:` that was removed, so we have the
@@ -506,6 +686,9 @@ class mute_signals:
             callable_obj._create = self.wrap_method(callable_obj._create.__func__)
             callable_obj._bulk_create = self.wrap_method(callable_obj._bulk_create.__func__)
             callable_obj._generate = self.wrap_method(callable_obj._generate.__func__)
+            callable_obj._generate_batch = self.wrap_method(callable_obj._generate_batch.__func__)
+            callable_obj._generate_iter = self.wrap_generator_method(callable_obj._generate_iter.__func__)
+            callable_obj._agenerate_batch = self.wrap_coroutine_method(callable_obj._agenerate_batch.__func__)
             callable_obj._after_postgeneration = self.wrap_method(
                 callable_obj._after_postgeneration.__func__
             )
@@ -527,3 +710,33 @@ class mute_signals:
             with self.copy():
                 return method(*args, **kwargs)
         return wrapped_method
+
+    def wrap_coroutine_method(self, method):
+        @classmethod
+        @functools.wraps(method)
+        async def wrapped_method(*args, **kwargs):
+            with self.copy():
+                return await method(*args, **kwargs)
+        return wrapped_method
+
+    def wrap_generator_method(self, method):
+        @classmethod
+        @functools.wraps(method)
+        def wrapped_method(*args, **kwargs):
+            # Mute signals while the generator runs, but not while it is
+            # paused: the caller may save other objects between two values.
+            with self.copy():
+                generator = method(*args, **kwargs)
+            try:
+                value = None
+                while True:
+                    with self.copy():
+                        try:
+                            item = generator.send(value)
+                        except StopIteration as e:
+                            return e.value
+                    value = yield item
+            finally:
+                with self.copy():
+                    generator.close()
+        return wrapped_method
@@ -27,3 +27,7 @@ class InvalidDeclarationError(FactoryError):
     This means that the user declared 'foo__bar' without adding a declaration
     at 'foo'.
     """
+
+
+class UniqueValueError(FactoryError):
+    """Raised when a declaration with ``unique=True`` can't find a new value."""
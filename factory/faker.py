@@ -13,13 +13,137 @@ Usage:
 """
 
 
+import collections
 import contextlib
-from typing import Dict
+import contextvars
+import threading
+from typing import Dict, List, Tuple
 
 import faker
 import faker.config
 
-from . import declarations
+from . import declarations, enums, random, uniqueness
+
+random.sync_faker_random()
+
+
+class _ValuePool:
+    """A buffer of values generated in bulk by a Faker provider.
+
+    The buffer is filled by chunks, growing from a few values up to ``size``:
+    a provider used once or twice doesn't generate a whole buffer.
+
+    Buffered values are dropped when factory.random is reseeded, as they were
+    generated from the previous random state.
+    """
+
+    INITIAL_CHUNK = 16
+
+    def __init__(self, generate, size):
+        self.generate = generate
+        self.size = size
+        self.chunk = min(self.INITIAL_CHUNK, size)
+        self.values = collections.deque()
+        self.lock = threading.Lock()
+        self.version = random.state_version
+
+    def pop(self):
+        while True:
+            if self.version != random.state_version:
+                with self.lock:
+                    self._reset()
+            try:
+                return self.values.popleft()
+            except IndexError:
+                self.refill()
+
+    def _reset(self):
+        self.values.clear()
+        self.chunk = min(self.INITIAL_CHUNK, self.size)
+        self.version = random.state_version
+
+    def needs_refill(self):
+        return len(self.values) < self.size // 2
+
+    def refill(self):
+        with self.lock:
+            if self.version != random.state_version:
+                self._reset()
+            version = self.version
+            count = min(self.chunk, self.size - len(self.values))
+            generate = self.generate
+            values = [generate() for _ in range(count)]
+            # Values generated while the random state was reset are stale.
+            if version == random.state_version:
+                self.values.extend(values)
+                self.chunk = min(self.chunk * 2, self.size)
+
+
+class _PoolRegistry:
+    """The value pools of Faker declarations, per (faker, provider, parameters).
+
+    Attributes:
+        size (int): the maximal number of buffered values per pool
+        max_pools (int): beyond this number of pools, values are generated
+            one by one; this bounds the memory used by providers called with
+            varying parameters.
+    """
+
+    def __init__(self, size, background=False, max_pools=1024):
+        self.size = size
+        self.max_pools = max_pools
+        self.pools = {}
+        self._refill_needed = threading.Event()
+        self._closed = False
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._refill_loop, name='factory-faker-pools', daemon=True)
+            self._thread.start()
+
+    def get(self, subfaker, provider, kwargs):
+        """Retrieve the pool for a provider call, or None if it can't be pooled."""
+        try:
+            key = (subfaker, provider, tuple(sorted(kwargs.items())))
+            pool = self.pools.get(key)
+        except TypeError:
+            # Unhashable parameters
+            return None
+        if pool is None:
+            if len(self.pools) >= self.max_pools:
+                return None
+            pool = self.pools.setdefault(key, _ValuePool(self._make_generator(subfaker, provider, kwargs), self.size))
+        if self._thread is not None and pool.needs_refill():
+            self._refill_needed.set()
+        return pool
+
+    def _make_generator(self, subfaker, provider, kwargs):
+        get_formatter = getattr(subfaker, 'get_formatter', None)
+        if get_formatter is None:
+            return lambda: subfaker.format(provider, **kwargs)
+        # Skip the lookup of the provider on each call.
+        formatter = get_formatter(provider)
+        return lambda: formatter(**kwargs)
+
+    def _refill_loop(self):
+        while True:
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+            if self._closed:
+                return
+            for pool in list(self.pools.values()):
+                if pool.needs_refill():
+                    pool.refill()
+
+    def close(self):
+        self._closed = True
+        if self._thread is not None:
+            self._refill_needed.set()
+            self._thread.join()
+        self.pools.clear()
+
+
+# The _PoolRegistry set by Faker.pooled() in the current thread or task, if any.
+_pools = contextvars.ContextVar('factory_faker_pools', default=None)
 
 
 class Faker(declarations.BaseDeclaration):
@@ -28,6 +152,8 @@ class Faker(declarations.BaseDeclaration):
     Args:
         provider (str): the name of the Faker field
         locale (str): the locale to use for the faker
+        unique (bool or uniqueness.UniqueFilter): whether generated values
+            must be distinct
 
         All other kwargs will be passed to the underlying provider
         (e.g ``factory.Faker('ean', length=10)``
@@ -38,19 +164,54 @@ class Faker(declarations.BaseDeclaration):
     """
     def __init__(self, provider, **kwargs):
         locale = kwargs.pop('locale', None)
+        self.unique_filter = uniqueness.get_filter(kwargs.pop('unique', False))
         self.provider = provider
         super().__init__(
             locale=locale,
             **kwargs)
+        # Parameters computed for each object would defeat pooling.
+        self._poolable = not any(enums.get_builder_phase(v) for v in kwargs.values())
 
     def evaluate(self, instance, step, extra):
         locale = extra.pop('locale')
         subfaker = self._get_faker(locale)
+        if self.unique_filter is None:
+            return self._generate(subfaker, extra)
+        return self.unique_filter.generate(lambda: self._generate(subfaker, extra))
+
+    def _generate(self, subfaker, extra):
+        pools = _pools.get()
+        if pools is not None and self._poolable and random.get_keyed_draw() is None:
+            pool = pools.get(subfaker, self.provider, extra)
+            if pool is not None:
+                return pool.pop()
         return subfaker.format(self.provider, **extra)
 
     _FAKER_REGISTRY: Dict[str, faker.Faker] = {}
+    # Providers added through add_provider(), as (provider, locale) pairs.
+    _PROVIDERS: List[Tuple[type, str]] = []
     _DEFAULT_LOCALE = faker.config.DEFAULT_LOCALE
 
+    @classmethod
+    @contextlib.contextmanager
+    def pooled(cls, size=1000, background=False):
+        """Generate the values of Faker declarations in bulk, within the block.
+
+        Each provider, with a given locale and parameters, draws from a buffer
+        of up to ``size`` values; with ``background=True``, a thread refills
+        the buffers as they get consumed. Pools only apply to the current
+        thread or asyncio task.
+        """
+        if size < 1:
+            raise ValueError("Faker pools must hold at least one value, got size=%r." % size)
+        pools = _PoolRegistry(size, background=background)
+        token = _pools.set(pools)
+        try:
+            yield
+        finally:
+            _pools.reset(token)
+            pools.close()
+
     @classmethod
     @contextlib.contextmanager
     def override_default_locale(cls, locale):
@@ -66,13 +227,45 @@ class Faker(declarations.BaseDeclaration):
         if locale is None:
             locale = cls._DEFAULT_LOCALE
 
-        if locale not in cls._FAKER_REGISTRY:
+        draw = random.get_keyed_draw()
+        if draw is not None:
+            subfaker = cls._get_registered_faker(random.get_keyed_random().fakers, locale)
+            # Draw from the stream of the field being evaluated.
+            subfaker.random = draw
+            return subfaker
+
+        local = random.get_local_random()
+        if local is None:
+            return cls._get_registered_faker(cls._FAKER_REGISTRY, locale)
+        return cls._get_registered_faker(local.fakers, locale, seed='%s:%s' % (local.seed, locale))
+
+    @classmethod
+    def _get_registered_faker(cls, registry, locale, seed=None):
+        if locale not in registry:
             subfaker = faker.Faker(locale=locale)
-            cls._FAKER_REGISTRY[locale] = subfaker
+            if seed is not None:
+                subfaker.seed_instance(seed)
+            for provider, provider_locale in cls._PROVIDERS:
+                if provider_locale == locale:
+                    subfaker.add_provider(provider)
+            registry[locale] = subfaker
 
-        return cls._FAKER_REGISTRY[locale]
+        return registry[locale]
 
     @classmethod
     def add_provider(cls, provider, locale=None):
         """Add a new Faker provider for the specified locale"""
-        cls._get_faker(locale).add_provider(provider)
+        if locale is None:
+            locale = cls._DEFAULT_LOCALE
+        if (provider, locale) in cls._PROVIDERS:
+            return
+        cls._PROVIDERS.append((provider, locale))
+        local = random.get_local_random()
+        keyed = random.get_keyed_random()
+        for registry in (
+            cls._FAKER_REGISTRY,
+            local.fakers if local is not None else {},
+            keyed.fakers if keyed is not None else {},
+        ):
+            if locale in registry:
+                registry[locale].add_provider(provider)
@@ -4,12 +4,20 @@
 """Additional declarations for "fuzzy" attribute definitions."""
 
 
+import array
+import bisect
+import collections
+import contextlib
+import contextvars
 import datetime
 import decimal
+import functools
 import string
+import threading
 import warnings
+import weakref
 
-from . import declarations, random
+from . import declarations, random, uniqueness
 
 random_seed_warning = (
     "Setting a specific random seed for {} can still have varying results "
@@ -17,18 +25,127 @@ random_seed_warning = (
     "see https://github.com/FactoryBoy/factory_boy/issues/331"
 )
 
+_INT64_MAX = 2 ** 63 - 1
+
+# The _BlockEngine set by use_numpy() in the current thread or task, if any.
+_block_engine = contextvars.ContextVar('factory_block_engine', default=None)
+
+
+class _Block:
+    """The pre-generated values of a declaration, for a random generator."""
+
+    def __init__(self, version, size):
+        self.version = version
+        self.size = size
+        self.values = collections.deque()
+
+
+class _BlockEngine:
+    """Generate the values of fuzzy declarations with NumPy, by blocks.
+
+    Each declaration gets a buffer per random generator, refilled by blocks
+    growing from a few values up to ``size``. Each block is drawn from a
+    NumPy generator seeded by the current random generator: values stay
+    reproducible under random.reseed_random() and random.local_random().
+    """
+
+    INITIAL_BLOCK = 16
+
+    def __init__(self, numpy, size):
+        self.numpy = numpy
+        self.size = size
+        # Maps random generators to {declaration: _Block}; the blocks of a
+        # generator (e.g. of a finished local_random() block) are dropped with it.
+        self.blocks = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    def next_value(self, declaration):
+        randgen = random.get_randgen()
+        # Values drawn before a reseed of the global generator are discarded.
+        version = random.state_version if randgen is random.randgen else 0
+        with self.lock:
+            blocks = self.blocks.get(randgen)
+            if blocks is None:
+                blocks = self.blocks[randgen] = weakref.WeakKeyDictionary()
+            block = blocks.get(declaration)
+            if block is None or block.version != version:
+                block = blocks[declaration] = _Block(version, min(self.INITIAL_BLOCK, self.size))
+            if not block.values:
+                numpy_random = self.numpy.random.default_rng(randgen.getrandbits(64))
+                block.values.extend(declaration.fuzz_block(numpy_random, block.size))
+                block.size = min(block.size * 2, self.size)
+            return block.values.popleft()
+
+
+@functools.lru_cache(maxsize=None)
+def _supports_blocks(fuzzy_class):
+    """Whether fuzz_block() generates the same values as fuzz() for a class.
+
+    A subclass overriding fuzz() without overriding fuzz_block() doesn't.
+    """
+    for klass in fuzzy_class.__mro__:
+        if 'fuzz_block' in vars(klass):
+            return klass is not BaseFuzzyAttribute
+        if 'fuzz' in vars(klass):
+            return False
+    return False  # pragma: no cover
+
+
+@contextlib.contextmanager
+def use_numpy(block_size=4096):
+    """Generate the values of fuzzy declarations with NumPy, within the block.
+
+    Declarations implementing fuzz_block() draw their values by blocks of up
+    to ``block_size`` values. This applies to the current thread or task.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        raise RuntimeError("use_numpy() requires NumPy, which is not installed.")
+    if block_size < 1:
+        raise ValueError("Blocks must hold at least one value, got block_size=%r." % block_size)
+    token = _block_engine.set(_BlockEngine(numpy, block_size))
+    try:
+        yield
+    finally:
+        _block_engine.reset(token)
+
 
 class BaseFuzzyAttribute(declarations.BaseDeclaration):
     """Base class for fuzzy attributes.
 
     Custom fuzzers should override the `fuzz()` method.
+
+    Args:
+        unique (bool or uniqueness.UniqueFilter): whether generated values
+            must be distinct; a filter shared between declarations, or
+            processes, may be provided instead.
     """
 
+    def __init__(self, unique=False, **kwargs):
+        super().__init__(**kwargs)
+        self.unique_filter = uniqueness.get_filter(unique)
+
     def fuzz(self):  # pragma: no cover
         raise NotImplementedError()
 
+    def fuzz_block(self, numpy_random, size):  # pragma: no cover
+        """Generate ``size`` values at once, within a use_numpy() block.
+
+        Args:
+            numpy_random (numpy.random.Generator): the randomness source
+            size (int): the number of values to generate
+        """
+        raise NotImplementedError()
+
     def evaluate(self, instance, step, extra):
-        return self.fuzz()
+        fuzz = self.fuzz
+        engine = _block_engine.get()
+        if engine is not None and random.get_keyed_draw() is None and _supports_blocks(type(self)):
+            fuzz = functools.partial(engine.next_value, self)
+        if self.unique_filter is None:
+            return fuzz()
+        return self.unique_filter.generate(fuzz)
 
 
 class FuzzyAttribute(BaseFuzzyAttribute):
@@ -59,20 +176,23 @@ class FuzzyText(BaseFuzzyAttribute):
         length (int): the length of the random part
         suffix (text): An optional suffix to append to the random string
         chars (str list): the chars to choose from
+        unique (bool or uniqueness.UniqueFilter): whether to generate
+            distinct values
 
     Useful for generating unique attributes where the exact value is
     not important.
     """
 
-    def __init__(self, prefix='', length=12, suffix='', chars=string.ascii_letters):
-        super().__init__()
+    def __init__(self, prefix='', length=12, suffix='', chars=string.ascii_letters, unique=False):
+        super().__init__(unique=unique)
         self.prefix = prefix
         self.suffix = suffix
         self.length = length
         self.chars = tuple(chars)  # Unroll iterators
 
     def fuzz(self):
-        chars = [random.randgen.choice(self.chars) for _i in range(self.length)]
+        choice = random.get_randgen().choice
+        chars = [choice(self.chars) for _i in range(self.length)]
         return self.prefix + ''.join(chars) + self.suffix
 
 
@@ -94,16 +214,118 @@ class FuzzyChoice(BaseFuzzyAttribute):
     def fuzz(self):
         if self.choices is None:
             self.choices = list(self.choices_generator)
-        value = random.randgen.choice(self.choices)
+        value = random.get_randgen().choice(self.choices)
         if self.getter is None:
             return value
         return self.getter(value)
 
 
+class BaseFuzzyRowChoice(BaseFuzzyAttribute):
+    """Random choice among the rows of a database query.
+
+    Only the primary keys of the rows are kept, in an array('q') when they are
+    integers; chosen objects are fetched by batches of ``batch_size``.
+
+    Subclasses implement fetch_pks() and fetch_objects().
+
+    Args:
+        weights (str or None): a field holding the weight of each row; rows
+            are chosen uniformly otherwise
+        fetch (bool): whether to yield objects, or their primary keys
+        batch_size (int): the number of primary keys drawn, then fetched, at once
+        refresh_every (int or None): reload the primary keys after that many draws
+    """
+
+    def __init__(self, weights=None, fetch=True, batch_size=100, refresh_every=None):
+        if batch_size < 1:
+            raise ValueError("Batches must hold at least one object, got batch_size=%r." % batch_size)
+        super().__init__()
+        self.weights = weights
+        self.fetch = fetch
+        self.batch_size = batch_size
+        self.refresh_every = refresh_every
+        self.pks = None
+        self.cumulative_weights = None
+        self.draws = 0
+        # Objects of pre-drawn primary keys, and the generator they were drawn from.
+        self.objects = collections.deque()
+        self.objects_source = None
+        self.lock = threading.Lock()
+
+    def fetch_pks(self):  # pragma: no cover
+        """Retrieve the primary keys of the rows, as (pk, weight) pairs if weighted."""
+        raise NotImplementedError()
+
+    def fetch_objects(self, pks):  # pragma: no cover
+        """Retrieve the objects of a set of primary keys, as a {pk: object} dict."""
+        raise NotImplementedError()
+
+    def load(self):
+        """Load the primary keys of the rows, and their weights.
+
+        Rows are streamed into the arrays, without building intermediate lists.
+        """
+        pks = array.array('q')
+        weights = None if self.weights is None else array.array('d')
+        total = 0.0
+        for row in self.fetch_pks():
+            if weights is None:
+                pk = row
+            else:
+                pk, weight = row
+                # Weights may be Decimal, e.g. from a DecimalField.
+                total += float(weight)
+                weights.append(total)
+            try:
+                pks.append(pk)
+            except (TypeError, OverflowError):
+                # Primary keys that aren't 64-bits integers
+                pks = list(pks)
+                pks.append(pk)
+        self.pks = pks
+        self.cumulative_weights = weights
+        self.draws = 0
+
+    def draw_pk(self, randgen):
+        if self.pks is None or (self.refresh_every is not None and self.draws >= self.refresh_every):
+            self.load()
+        if not self.pks:
+            raise IndexError("Cannot choose from an empty set of rows.")
+        self.draws += 1
+        if self.cumulative_weights is None:
+            return self.pks[randgen.randrange(len(self.pks))]
+        index = bisect.bisect_right(self.cumulative_weights, randgen.random() * self.cumulative_weights[-1])
+        return self.pks[min(index, len(self.pks) - 1)]
+
+    def fuzz(self):
+        randgen = random.get_randgen()
+        with self.lock:
+            if not self.fetch:
+                return self.draw_pk(randgen)
+            if random.get_keyed_draw() is not None:
+                # Within keyed_random(), each value uses its own stream.
+                pk = self.draw_pk(randgen)
+                return self.fetch_objects([pk])[pk]
+
+            # Drop objects drawn from another generator, or from a previous state.
+            source = (randgen, random.state_version)
+            if self.objects_source != source:
+                self.objects.clear()
+                self.objects_source = source
+            while not self.objects:
+                pks = [self.draw_pk(randgen) for _i in range(self.batch_size)]
+                objects = self.fetch_objects(set(pks))
+                if len(objects) < len(set(pks)):
+                    # Some rows were deleted.
+                    self.pks = None
+                self.objects.extend(objects[pk] for pk in pks if pk in objects)
+            return self.objects.popleft()
+
+
 class FuzzyInteger(BaseFuzzyAttribute):
     """Random integer within a given range."""
 
-    def __init__(self, low, high=None, step=1):
+    def __init__(self, low, high=None, step=1, unique=False):
         if high is None:
             high = low
             low = 0
@@ -112,10 +334,17 @@ class FuzzyInteger(BaseFuzzyAttribute):
         self.high = high
         self.step = step
 
-        super().__init__()
+        super().__init__(unique=unique)
 
     def fuzz(self):
-        return random.randgen.randrange(self.low, self.high + 1, self.step)
+        return random.get_randgen().randrange(self.low, self.high + 1, self.step)
+
+    def fuzz_block(self, numpy_random, size):
+        count = len(range(self.low, self.high + 1, self.step))
+        if count > _INT64_MAX:
+            return [self.fuzz() for _i in range(size)]
+        low, step = self.low, self.step
+        return [low + step * index for index in numpy_random.integers(0, count, size).tolist()]
 
 
 class FuzzyDecimal(BaseFuzzyAttribute):
@@ -133,9 +362,18 @@ class FuzzyDecimal(BaseFuzzyAttribute):
         super().__init__()
 
     def fuzz(self):
-        base = decimal.Decimal(str(random.randgen.uniform(self.low, self.high)))
+        base = decimal.Decimal(str(random.get_randgen().uniform(self.low, self.high)))
         return base.quantize(decimal.Decimal(10) ** -self.precision)
 
+    def fuzz_block(self, numpy_random, size):
+        # Same rule as fuzz(): uniform floats, quantized to the precision.
+        quantum = decimal.Decimal(10) ** -self.precision
+        Decimal = decimal.Decimal
+        return [
+            Decimal(str(value)).quantize(quantum)
+            for value in numpy_random.uniform(self.low, self.high, size).tolist()
+        ]
+
 
 class FuzzyFloat(BaseFuzzyAttribute):
     """Random float within a given range."""
@@ -152,9 +390,13 @@ class FuzzyFloat(BaseFuzzyAttribute):
         super().__init__()
 
     def fuzz(self):
-        base = random.randgen.uniform(self.low, self.high)
+        base = random.get_randgen().uniform(self.low, self.high)
         return float(format(base, '.%dg' % self.precision))
 
+    def fuzz_block(self, numpy_random, size):
+        spec = '.%dg' % self.precision
+        return [float(format(base, spec)) for base in numpy_random.uniform(self.low, self.high, size).tolist()]
+
 
 class FuzzyDate(BaseFuzzyAttribute):
     """Random date within a given date range."""
@@ -162,7 +404,7 @@ class FuzzyDate(BaseFuzzyAttribute):
     def __init__(self, start_date, end_date=None):
         super().__init__()
         if end_date is None:
-            if random.randgen.state_set:
+            if random.get_randgen().state_set:
                 cls_name = self.__class__.__name__
                 warnings.warn(random_seed_warning.format(cls_name), stacklevel=2)
             end_date = datetime.date.today()
@@ -176,7 +418,11 @@ class FuzzyDate(BaseFuzzyAttribute):
         self.end_date = end_date.toordinal()
 
     def fuzz(self):
-        return datetime.date.fromordinal(random.randgen.randint(self.start_date, self.end_date))
+        return datetime.date.fromordinal(random.get_randgen().randint(self.start_date, self.end_date))
+
+    def fuzz_block(self, numpy_random, size):
+        ordinals = numpy_random.integers(self.start_date, self.end_date, size, endpoint=True)
+        return [datetime.date.fromordinal(ordinal) for ordinal in ordinals.tolist()]
 
 
 class BaseFuzzyDateTime(BaseFuzzyAttribute):
@@ -201,7 +447,7 @@ class BaseFuzzyDateTime(BaseFuzzyAttribute):
         super().__init__()
 
         if end_dt is None:
-            if random.randgen.state_set:
+            if random.get_randgen().state_set:
                 cls_name = self.__class__.__name__
                 warnings.warn(random_seed_warning.format(cls_name), stacklevel=2)
             end_dt = self._now()
@@ -218,11 +464,19 @@ class BaseFuzzyDateTime(BaseFuzzyAttribute):
         self.force_second = force_second
         self.force_microsecond = force_microsecond
 
-    def fuzz(self):
+    def _span(self):
+        """The number of microseconds between the bounds."""
         delta = self.end_dt - self.start_dt
-        microseconds = delta.microseconds + 1000000 * (delta.seconds + (delta.days * 86400))
+        return delta.microseconds + 1000000 * (delta.seconds + (delta.days * 86400))
+
+    def fuzz(self):
+        return self._from_offset(random.get_randgen().randint(0, self._span()))
+
+    def fuzz_block(self, numpy_random, size):
+        offsets = numpy_random.integers(0, self._span(), size, endpoint=True)
+        return [self._from_offset(offset) for offset in offsets.tolist()]
 
-        offset = random.randgen.randint(0, microseconds)
+    def _from_offset(self, offset):
         result = self.start_dt + datetime.timedelta(microseconds=offset)
 
         if self.force_year is not None:
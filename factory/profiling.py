@@ -0,0 +1,171 @@
+# Copyright: See the LICENSE file.
+
+"""Measure the time spent in each declaration of a factory."""
+
+import contextlib
+import contextvars
+import threading
+import time
+
+from . import base, builder
+
+
+class DeclarationTiming:
+    """Aggregated timings of a factory field.
+
+    Attributes:
+        factory (type): the factory holding the declaration
+        name (str): the name of the field; for fields of Dict and List
+            declarations, their dotted path from that factory
+        calls (int): the number of evaluations
+        total (float): the time spent evaluating the field, in seconds
+        own (float): the time spent evaluating the field, excluding the
+            time spent in other declarations it triggered (fields it depends
+            on, fields of its sub-factories)
+    """
+
+    def __init__(self, factory, name):
+        self.factory = factory
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.own = 0.0
+
+    @property
+    def label(self):
+        return '%s.%s' % (self.factory.__name__, self.name)
+
+    def __repr__(self):
+        return '<DeclarationTiming %s: %d calls, total=%.6fs, own=%.6fs>' % (
+            self.label, self.calls, self.total, self.own)
+
+
+class Profile:
+    """Timings collected by profile().
+
+    Attributes:
+        timings (dict): maps (factory, field name) to a DeclarationTiming
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._local = threading.local()
+
+    def _measure(self, step, name, evaluate):
+        # Each frame holds the key of a declaration being evaluated, and
+        # accumulates the time spent in nested declarations.
+        stack = self._local.__dict__.setdefault('stack', [])
+        factory = step.builder.factory_meta.factory
+        if stack and issubclass(factory, (base.BaseDictFactory, base.BaseListFactory)):
+            # Fields of a Dict or List belong to the enclosing declaration.
+            factory, path = stack[-1][0]
+            name = '%s.%s' % (path, name)
+        frame = [(factory, name), 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return evaluate()
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+
+            timing = self.timings.get((factory, name))
+            if timing is None:
+                timing = self.timings[factory, name] = DeclarationTiming(factory, name)
+            timing.calls += 1
+            timing.total += elapsed
+            timing.own += elapsed - frame[1]
+
+    def sorted(self, key='own'):
+        """List the timings, most expensive first.
+
+        Args:
+            key (str): the attribute to sort on, 'own', 'total' or 'calls'
+        """
+        return sorted(self.timings.values(), key=lambda timing: getattr(timing, key), reverse=True)
+
+    def as_dict(self, key='own'):
+        """Map 'Factory.field' labels to their calls, total and own times, most expensive first."""
+        return {
+            timing.label: {'calls': timing.calls, 'total': timing.total, 'own': timing.own}
+            for timing in self.sorted(key)
+        }
+
+    def report(self, key='own', limit=None):
+        """Format the timings as a table, most expensive first."""
+        timings = self.sorted(key)[:limit]
+        width = max([len('declaration')] + [len(timing.label) for timing in timings])
+        lines = ['%-*s %10s %12s %12s' % (width, 'declaration', 'calls', 'total (s)', 'own (s)')]
+        lines.extend(
+            '%-*s %10d %12.6f %12.6f' % (width, timing.label, timing.calls, timing.total, timing.own)
+            for timing in timings
+        )
+        return '\n'.join(lines)
+
+
+# The Profile collecting the timings of the current thread or task.
+_active_profile = contextvars.ContextVar('factory_profile', default=None)
+
+# The evaluation hook is registered by the first active profile() block, and
+# removed by the last one to exit, whatever the order.
+_hook_lock = threading.Lock()
+_hook_users = 0
+
+
+def _profile_hook(step, name, evaluate):
+    prof = _active_profile.get()
+    if prof is None:
+        return evaluate()
+    return prof._measure(step, name, evaluate)
+
+
+def _install_hook():
+    global _hook_users
+    with _hook_lock:
+        _hook_users += 1
+        if _hook_users == 1:
+            builder.add_evaluation_hook(_profile_hook)
+
+
+def _uninstall_hook():
+    global _hook_users
+    with _hook_lock:
+        _hook_users -= 1
+        if not _hook_users:
+            builder.remove_evaluation_hook(_profile_hook)
+
+
+@contextlib.contextmanager
+def profile():
+    """Time the evaluation of each declaration within the block.
+
+    The time spent in a sub-factory is counted in the 'total' time of the
+    SubFactory / RelatedFactory field, and in the 'own' times of the
+    sub-factory's fields. Fields of Dict and List declarations are timed
+    under their path, e.g. 'UserFactory.address.city'.
+
+    Only declarations evaluated by the current thread or task are timed;
+    blocks running in other threads collect their own timings, and a nested
+    block takes over from the enclosing one until it exits.
+
+    Declarations evaluated concurrently by the asynchronous API (e.g. SubFactory
+    with acreate()) are not timed, but their sub-factories' fields are.
+
+    The builder is only instrumented while a block is active, and runs at full
+    speed otherwise.
+
+    Example:
+        with factory.profile() as prof:
+            UserFactory.create_batch(100)
+        print(prof.report())
+    """
+    prof = Profile()
+    _install_hook()
+    token = _active_profile.set(prof)
+    try:
+        yield prof
+    finally:
+        _active_profile.reset(token)
+        _uninstall_hook()
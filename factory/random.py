@@ -1,26 +1,68 @@
+import contextlib
+import contextvars
+import hashlib
 import random
-
-import faker.generator
+import sys
+import threading
 
 randgen = random.Random()
 
-randgen.state_set = False
+randgen.state_set = False  # type: ignore[attr-defined]
+
+# The LocalRandom of the current thread or task, set by local_random().
+_local_random = contextvars.ContextVar('factory_local_random', default=None)
+
+# The KeyedRandom of the current thread or task, set by keyed_random().
+_keyed_random = contextvars.ContextVar('factory_keyed_random', default=None)
+
+# The CounterRandom of the declaration being evaluated within keyed_random().
+_keyed_draw = contextvars.ContextVar('factory_keyed_draw', default=None)
+
+# The path of the declaration being evaluated within keyed_random(), from the
+# outermost factory: fields of nested steps get distinct streams.
+_keyed_path = contextvars.ContextVar('factory_keyed_path', default=())
+
+# A state set before Faker was loaded; applied by sync_faker_random().
+_pending_faker_state = None
+
+# Incremented whenever the state of randgen is set, to discard values
+# pre-generated from a previous state.
+state_version = 0
+
+
+def _set_faker_state(state):
+    global _pending_faker_state
+    generator = sys.modules.get('faker.generator')
+    if generator is None:
+        # Importing Faker is expensive: only do it when it is used.
+        _pending_faker_state = state
+    else:
+        _pending_faker_state = None
+        generator.random.setstate(state)
+
+
+def sync_faker_random():
+    """Apply to Faker's random generator a state set before it was loaded."""
+    if _pending_faker_state is not None:
+        _set_faker_state(_pending_faker_state)
 
 
 def get_random_state():
     """Retrieve the state of factory.fuzzy's random generator."""
     state = randgen.getstate()
     # Returned state must represent both Faker and factory_boy.
-    faker.generator.random.setstate(state)
+    _set_faker_state(state)
     return state
 
 
 def set_random_state(state):
     """Force-set the state of factory.fuzzy's random generator."""
+    global state_version
+    state_version += 1
     randgen.state_set = True
     randgen.setstate(state)
 
-    faker.generator.random.setstate(state)
+    _set_faker_state(state)
 
 
 def reseed_random(seed):
@@ -28,3 +70,172 @@ def reseed_random(seed):
     r = random.Random(seed)
     random_internal_state = r.getstate()
     set_random_state(random_internal_state)
+
+
+class LocalRandom:
+    """The random generators used within a local_random() block.
+
+    Attributes:
+        seed (str): the seed of the block, derived from its root seed and key
+        randgen (random.Random): used instead of the global randgen
+        fakers (dict): the Faker instances of the block, per locale
+    """
+
+    def __init__(self, seed, key):
+        self.seed = '%r:%r' % (seed, key)
+        self.randgen = random.Random(self.seed)
+        self.randgen.state_set = True
+        self.fakers = {}
+
+
+def get_local_random():
+    """Retrieve the LocalRandom of the current thread or task, if any."""
+    return _local_random.get()
+
+
+def get_randgen():
+    """Retrieve the random generator of the current thread or task."""
+    draw = _keyed_draw.get()
+    if draw is not None:
+        return draw
+    local = _local_random.get()
+    return randgen if local is None else local.randgen
+
+
+@contextlib.contextmanager
+def local_random(seed, key=None):
+    """Use random generators private to the current thread or task.
+
+    Within the block, factory.fuzzy and factory.Faker draw from generators
+    seeded from ``seed`` and ``key``, instead of the shared global ones.
+
+    Args:
+        seed: the root seed, shared by all threads or tasks
+        key: identifies the thread or task; defaults to the thread's name
+    """
+    if key is None:
+        key = threading.current_thread().name
+    local = LocalRandom(seed, key)
+    token = _local_random.set(local)
+    try:
+        yield local
+    finally:
+        _local_random.reset(token)
+
+
+class CounterRandom(random.Random):
+    """A counter-based random generator.
+
+    Its n-th block of random bytes is a keyed hash of n: the generator has no
+    state beyond its key and position, and is cheap to create.
+
+    Attributes:
+        key (bytes): the key of the stream, up to 64 bytes
+        counter (int): the number of blocks computed so far
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.counter = 0
+        self.state_set = True
+        self._buffer = b''
+        super().__init__()
+
+    def seed(self, a=None, version=2):
+        # Called by random.Random.__init__(); the stream is defined by its key.
+        self.counter = 0
+        self._buffer = b''
+
+    def getstate(self):
+        return self.key, self.counter, self._buffer
+
+    def setstate(self, state):
+        self.key, self.counter, self._buffer = state
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        nbytes = (k + 7) // 8
+        data = self._buffer
+        while len(data) < nbytes:
+            data += hashlib.blake2b(self.counter.to_bytes(8, 'little'), key=self.key).digest()
+            self.counter += 1
+        self._buffer = data[nbytes:]
+        return int.from_bytes(data[:nbytes], 'little') >> (nbytes * 8 - k)
+
+    def random(self):
+        return self.getrandbits(53) * 2.0 ** -53
+
+
+class KeyedRandom:
+    """The settings of a keyed_random() block.
+
+    Attributes:
+        seed: the root seed of the block
+        fakers (dict): the Faker instances of the block, per locale
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.fakers = {}
+
+    def stream(self, path):
+        """The CounterRandom of a field, given its path from the outermost factory."""
+        key = '%r:%s' % (self.seed, '/'.join(path))
+        return CounterRandom(hashlib.blake2b(key.encode(), digest_size=32).digest())
+
+    @contextlib.contextmanager
+    def draw(self, factory, name, sequence, parent_path=()):
+        """Draw random values from the stream of a field, within the block.
+
+        Args:
+            factory (type): the factory declaring the field
+            name (str): the name of the field
+            sequence (int): the sequence of the object being built
+            parent_path (tuple): the path of the field whose evaluation
+                started the current build step, as returned by get_keyed_path()
+        """
+        path = parent_path + ('%s.%s:%s:%r' % (factory.__module__, factory.__qualname__, name, sequence),)
+        draw_token = _keyed_draw.set(self.stream(path))
+        path_token = _keyed_path.set(path)
+        try:
+            yield
+        finally:
+            _keyed_path.reset(path_token)
+            _keyed_draw.reset(draw_token)
+
+
+def get_keyed_random():
+    """Retrieve the KeyedRandom of the current thread or task, if any."""
+    return _keyed_random.get()
+
+
+def get_keyed_draw():
+    """Retrieve the CounterRandom of the field being evaluated, if any."""
+    return _keyed_draw.get()
+
+
+def get_keyed_path():
+    """Retrieve the path of the field being evaluated within keyed_random(), if any."""
+    return _keyed_path.get()
+
+
+@contextlib.contextmanager
+def keyed_random(seed):
+    """Draw the random values of each field from its own stream.
+
+    Within the block, the random values of a field are drawn from a
+    CounterRandom keyed by ``seed``, the factory, the field name and the
+    sequence of the object being built, and those of the enclosing fields
+    for nested factories. They don't depend on the values
+    generated before: any slice of a dataset can be generated on its own.
+
+    Args:
+        seed: the root seed
+    """
+    keyed = KeyedRandom(seed)
+    token = _keyed_random.set(keyed)
+    try:
+        yield keyed
+    finally:
+        _keyed_random.reset(token)
@@ -0,0 +1,202 @@
+# Copyright: See the LICENSE file.
+
+"""Sequence backends, sharing sequence counters between processes.
+
+A backend is set on a factory through its ``Meta.sequence_backend`` option;
+it provides the counter used by the factory (and all factories sharing its
+counter) through :meth:`SequenceBackend.get_counter`.
+
+A counter has three methods:
+
+- ``next()``, returning the next value;
+- ``reserve(size)``, returning an iterable of ``size`` distinct values;
+- ``reset(next_value)``, setting the next value.
+
+Counters shared between processes never move backwards: other processes may
+already hold the values below the current one.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+class SequenceBackend:
+    """Provide the sequence counters of factories."""
+
+    def get_counter(self, factory, start):
+        """Retrieve the counter for a factory.
+
+        Args:
+            factory (Factory): the factory owning the counter
+            start (int): the first value of the counter, as returned by
+                the factory's ``_setup_next_sequence()``
+        """
+        raise NotImplementedError()
+
+
+class SharedMemorySequence(SequenceBackend):
+    """A single counter, stored in shared memory.
+
+    All factories using the backend draw from the same sequence; the counter
+    starts at the highest ``_setup_next_sequence()`` of those factories.
+
+    The backend must be created before starting the worker processes, which
+    inherit it through ``fork``.
+
+    Args:
+        context: the multiprocessing context used to allocate the counter
+    """
+
+    def __init__(self, context=None):
+        context = context or multiprocessing.get_context()
+        self._value = context.Value('q', 0)
+
+    def get_counter(self, factory, start):
+        with self._value.get_lock():
+            if self._value.value < start:
+                self._value.value = start
+        return self
+
+    def next(self):
+        return self.reserve(1)[0]
+
+    def reserve(self, size):
+        with self._value.get_lock():
+            value = self._value.value
+            self._value.value += size
+        return range(value, value + size)
+
+    def reset(self, next_value=0):
+        # Rewinding would hand out values already used by other processes.
+        with self._value.get_lock():
+            if self._value.value < next_value:
+                self._value.value = next_value
+
+
+class FileLockSequence(SequenceBackend):
+    """A single counter, stored in a file and protected by an exclusive lock.
+
+    All factories using the backend draw from the same sequence, even from
+    unrelated processes (e.g. pytest-xdist workers); the counter starts at the
+    highest ``_setup_next_sequence()`` of those factories.
+
+    Requires ``fcntl``, available on POSIX systems.
+
+    The file persists after the processes exit, and the next run continues
+    from its value: remove it to start over.
+
+    Args:
+        path (str): the file holding the next value; created if missing
+    """
+
+    def __init__(self, path):
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError("FileLockSequence requires fcntl, which is unavailable on this platform.")
+        self.path = os.fspath(path)
+        # flock() locks are per open file description: serialize threads too.
+        self._lock = threading.Lock()
+
+    def _update(self, update):
+        """Atomically replace the stored value.
+
+        Args:
+            update (callable): receives the current value, returns the new one
+
+        Returns:
+            int: the value before the update
+        """
+        with self._lock, open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read().strip()
+                value = int(content) if content else 0
+                f.seek(0)
+                f.truncate()
+                f.write(str(update(value)))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return value
+
+    def get_counter(self, factory, start):
+        self._update(lambda value: max(value, start))
+        return self
+
+    def next(self):
+        return self.reserve(1)[0]
+
+    def reserve(self, size):
+        value = self._update(lambda value: value + size)
+        return range(value, value + size)
+
+    def reset(self, next_value=0):
+        # Rewinding would hand out values already used by other processes.
+        self._update(lambda value: max(value, next_value))
+
+
+class StripedSequence(SequenceBackend):
+    """Give each worker process its own, interleaved, sequence values.
+
+    With ``workers`` processes, the worker ``worker_id`` receives the values
+    ``start + worker_id``, ``start + worker_id + workers``, ... No state is
+    shared between the processes.
+
+    Args:
+        worker_id (int): the index of the current worker, from 0; read from
+            the ``PYTEST_XDIST_WORKER`` environment variable (``gw<N>``) if unset
+        workers (int): the number of workers; read from the
+            ``PYTEST_XDIST_WORKER_COUNT`` environment variable if unset
+    """
+
+    def __init__(self, worker_id=None, workers=None):
+        self.worker_id = worker_id
+        self.workers = workers
+
+    def _get_worker(self):
+        worker_id, workers = self.worker_id, self.workers
+        if worker_id is None:
+            match = re.search(r'\d+', os.environ.get('PYTEST_XDIST_WORKER', ''))
+            worker_id = int(match.group()) if match else 0
+        if workers is None:
+            workers = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+        if not 0 <= worker_id < workers:
+            raise ValueError("Invalid worker %r, out of %r workers." % (worker_id, workers))
+        return worker_id, workers
+
+    def get_counter(self, factory, start):
+        worker_id, workers = self._get_worker()
+        return _StripedCounter(start, worker_id, workers)
+
+
+class _StripedCounter:
+    def __init__(self, start, worker_id, workers):
+        self.start = start
+        self.worker_id = worker_id
+        self.workers = workers
+        self.index = 0
+        self._lock = threading.Lock()
+
+    def _value(self, index):
+        return self.start + index * self.workers + self.worker_id
+
+    def next(self):
+        return self.reserve(1)[0]
+
+    def reserve(self, size):
+        with self._lock:
+            index = self.index
+            self.index += size
+        return range(self._value(index), self._value(index + size), self.workers)
+
+    def reset(self, next_value=0):
+        with self._lock:
+            self.start = next_value
+            self.index = 0
@@ -0,0 +1,255 @@
+# Copyright: See the LICENSE file.
+
+"""Filters remembering generated values, for declarations with ``unique=True``.
+
+A filter is set on a declaration through its ``unique`` parameter; the
+declaration draws new values until the filter accepts one, through
+:meth:`UniqueFilter.generate`.
+
+A filter never accepts a value twice, but may reject a value that was never
+generated (a false positive): this costs an extra attempt, not a duplicate.
+"""
+
+import hashlib
+import math
+import multiprocessing
+import threading
+
+from . import errors
+
+
+def _hash_value(value):
+    """Two stable 64-bit hashes of a value, identical across processes."""
+    digest = hashlib.blake2b(repr(value).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class _BloomSlice:
+    """A fixed-size bloom filter, sized for ``capacity`` values.
+
+    Args:
+        capacity (int): the number of values held at the given error rate
+        error_rate (float): the probability of a false positive once full
+        allocate (callable): receives a number of bytes, returns a mutable
+            buffer of that size, initialized to zero
+    """
+
+    def __init__(self, capacity, error_rate, allocate=bytearray):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = allocate((self.size + 7) // 8)
+
+    def _positions(self, hashes):
+        h1, h2 = hashes
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def __contains__(self, hashes):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(hashes))
+
+    def add(self, hashes):
+        """Set the bits of a value; return whether any of them was unset."""
+        bits = self.bits
+        added = False
+        for pos in self._positions(hashes):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        return added
+
+
+class UniqueFilter:
+    """Remember the values generated by a declaration.
+
+    Attributes:
+        max_attempts (int): the number of values drawn by :meth:`generate`
+            before giving up
+        attempts (int): the number of values drawn through :meth:`generate`
+        collisions (int): the number of drawn values rejected by the filter
+    """
+
+    def __init__(self, max_attempts=100):
+        self.max_attempts = max_attempts
+        self.attempts = 0
+        self.collisions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """The number of values accepted by the filter."""
+        raise NotImplementedError()
+
+    def add(self, value):
+        """Record a value; return False if it may have been seen already."""
+        raise NotImplementedError()
+
+    def clear(self):
+        """Forget all recorded values, and reset the statistics."""
+        self.attempts = 0
+        self.collisions = 0
+
+    @property
+    def collision_rate(self):
+        """The fraction of drawn values rejected by the filter."""
+        return self.collisions / self.attempts if self.attempts else 0.0
+
+    def stats(self):
+        return {
+            'values': len(self),
+            'attempts': self.attempts,
+            'collisions': self.collisions,
+            'collision_rate': self.collision_rate,
+        }
+
+    def generate(self, function):
+        """Call ``function`` until it returns a value accepted by the filter.
+
+        Raises:
+            errors.UniqueValueError: if no new value was found within
+                ``max_attempts`` calls
+        """
+        for _attempt in range(self.max_attempts):
+            value = function()
+            with self._lock:
+                self.attempts += 1
+                if self.add(value):
+                    return value
+                self.collisions += 1
+        raise errors.UniqueValueError(
+            "No unique value found after %d attempts, with %d values already generated."
+            % (self.max_attempts, len(self))
+        )
+
+
+class BloomFilter(UniqueFilter):
+    """Remember values in memory, in a few bytes per value.
+
+    The first ``exact_limit`` values are stored as is, which avoids false
+    positives on small sets of values (e.g. a ``FuzzyInteger(0, 100)``).
+    Beyond that, the values are moved to a series of bloom filters, each
+    twice as large as the previous one, with a decreasing error rate:
+    the overall false positive rate stays below ``error_rate``.
+
+    Args:
+        capacity (int): the number of values held by the first bloom filter
+        error_rate (float): the maximal probability of a false positive
+        exact_limit (int): the number of values stored exactly
+        max_attempts (int): see :attr:`UniqueFilter.max_attempts`
+    """
+
+    def __init__(self, capacity=65536, error_rate=0.001, exact_limit=10000, max_attempts=100):
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate must be between 0 and 1, got %r." % error_rate)
+        super().__init__(max_attempts=max_attempts)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_limit = exact_limit
+        self._exact = set()
+        self._slices = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _add_slice(self):
+        index = len(self._slices)
+        # The error rates of the slices form a series summing to error_rate.
+        self._slices.append(_BloomSlice(self.capacity * 2 ** index, self.error_rate / 2 ** (index + 1)))
+        self._slice_count = 0
+
+    def add(self, value):
+        exact = self._exact
+        if exact is not None:
+            try:
+                if value in exact:
+                    return False
+                if len(exact) < self.exact_limit:
+                    exact.add(value)
+                    self._count += 1
+                    return True
+            except TypeError:
+                # Unhashable values go straight to the bloom filters.
+                pass
+            self._exact = None
+            for previous in exact:
+                self._add_hashes(_hash_value(previous))
+        if not self._add_hashes(_hash_value(value)):
+            return False
+        self._count += 1
+        return True
+
+    def _add_hashes(self, hashes):
+        if any(hashes in bloom for bloom in self._slices):
+            return False
+        if not self._slices or self._slice_count >= self._slices[-1].capacity:
+            self._add_slice()
+        self._slices[-1].add(hashes)
+        self._slice_count += 1
+        return True
+
+    def clear(self):
+        super().clear()
+        self._exact = set()
+        self._slices = []
+        self._count = 0
+
+
+class SharedBloomFilter(UniqueFilter):
+    """A bloom filter stored in shared memory, for parallel worker processes.
+
+    All processes using the filter receive distinct values; the
+    :attr:`~UniqueFilter.attempts` and :attr:`~UniqueFilter.collisions`
+    statistics are counted per process.
+
+    The filter has a fixed size: beyond ``capacity`` values, its false
+    positive rate rises above ``error_rate``.
+
+    It must be created before starting the worker processes, which inherit it
+    through ``fork``.
+
+    Args:
+        capacity (int): the number of values held at the given error rate
+        error_rate (float): the probability of a false positive once full
+        context: the multiprocessing context used to allocate the filter
+        max_attempts (int): see :attr:`UniqueFilter.max_attempts`
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.001, context=None, max_attempts=100):
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate must be between 0 and 1, got %r." % error_rate)
+        super().__init__(max_attempts=max_attempts)
+        context = context or multiprocessing.get_context()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = _BloomSlice(capacity, error_rate, allocate=lambda size: context.RawArray('B', size))
+        self._count = context.Value('q', 0)
+
+    def __len__(self):
+        return self._count.value
+
+    def add(self, value):
+        hashes = _hash_value(value)
+        with self._count.get_lock():
+            if not self._bloom.add(hashes):
+                return False
+            self._count.value += 1
+        return True
+
+    def clear(self):
+        super().clear()
+        with self._count.get_lock():
+            self._bloom.bits[:] = bytes(len(self._bloom.bits))
+            self._count.value = 0
+
+
+def get_filter(unique):
+    """Convert the ``unique`` parameter of a declaration into a filter, or None."""
+    if isinstance(unique, UniqueFilter):
+        return unique
+    if unique is True:
+        return BloomFilter()
+    if unique is False or unique is None:
+        return None
+    raise TypeError("unique must be a boolean or a UniqueFilter, got %r." % (unique,))
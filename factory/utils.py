@@ -2,7 +2,9 @@
 
 
 import collections
+import collections.abc
 import importlib
+import itertools
 
 
 def import_object(module_name, attribute_name):
@@ -68,6 +70,96 @@ class ResetableIterator:
         self.next_elements.extend(self.past_elements)
 
 
+class CyclingIterator:
+    """Iterate over a source, possibly in cycles, holding at most one copy of its values.
+
+    Re-iterable sources (lists, querysets, ...) are iterated again for each
+    cycle and after reset(), without keeping their values. Values of one-shot
+    iterators (generators, files, ...) are kept in a single buffer, replayed by
+    cycles and reset(); with ``cycle=False, resettable=False``, they are
+    streamed without being kept.
+    """
+
+    def __init__(self, source, cycle=True, resettable=True):
+        self.source = source
+        self.cycle = cycle
+        self.reiterable = not isinstance(source, collections.abc.Iterator)
+        self.buffered = not self.reiterable and (cycle or resettable)
+        self.iterator = None
+        # Values of a one-shot source, and the position of the next one to replay.
+        self.buffer = []
+        self.position = 0
+        # Values of a re-iterable source accessed by index, read as far as needed.
+        self.indexed = None
+        self.indexed_iterator = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.position < len(self.buffer):
+            value = self.buffer[self.position]
+            self.position += 1
+            return value
+        if self.iterator is None:
+            self.iterator = iter(self.source)
+        try:
+            value = next(self.iterator)
+        except StopIteration:
+            if not self.cycle:
+                raise
+            if self.reiterable:
+                self.iterator = iter(self.source)
+                return next(self.iterator)
+            if not self.buffer:
+                raise
+            self.position = 1
+            return self.buffer[0]
+        if self.buffered:
+            self.buffer.append(value)
+            self.position += 1
+        return value
+
+    def reset(self):
+        """Restart from the first value of the source."""
+        if self.reiterable:
+            # Release the resources of a partially consumed iteration, e.g. a database cursor.
+            close = getattr(self.iterator, 'close', None)
+            if close is not None:
+                close()
+            self.iterator = None
+        elif not self.buffered:
+            raise ValueError("Cannot reset a non-resettable iterator over %r." % self.source)
+        self.position = 0
+
+    def value_at(self, index):
+        """Retrieve the value at a given position, regardless of the current one.
+
+        Sequences (lists, QuerysetIterator sources, ...) are indexed directly;
+        other sources are read up to ``index``, and the values read are kept.
+        """
+        if self.reiterable and isinstance(self.source, collections.abc.Sequence):
+            values = self.source
+        else:
+            if self.reiterable:
+                if self.indexed is None:
+                    self.indexed, self.indexed_iterator = [], iter(self.source)
+                values, iterator = self.indexed, self.indexed_iterator
+            else:
+                if not self.buffered:
+                    raise ValueError("Cannot index a non-resettable iterator over %r." % self.source)
+                if self.iterator is None:
+                    self.iterator = iter(self.source)
+                values, iterator = self.buffer, self.iterator
+            if index >= len(values):
+                values.extend(itertools.islice(iterator, index + 1 - len(values)))
+        if index < len(values):
+            return values[index]
+        if self.cycle and values:
+            return values[index % len(values)]
+        raise StopIteration
+
+
 class OrderedBase:
     """Marks a class as being ordered.
 
@@ -2,6 +2,7 @@
 
 """Tests for factory_boy/SQLAlchemy interactions."""
 
+import array
 import unittest
 from unittest import mock
 
@@ -151,6 +152,22 @@ class SQLAlchemyGetOrCreateTests(TransactionTestCase):
             ["alt", "main"],
         )
 
+    def test_iter_create_original_params(self):
+        seen = []
+
+        class RecordingFactory(StandardFactory):
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                seen.append(cls._original_params)
+                return super()._create(model_class, *args, **kwargs)
+
+        objs = RecordingFactory.iter_create(2, foo='iter')
+        next(objs)
+        # Factory calls while the iterator is paused don't leak into it.
+        RecordingFactory.create(foo='other')
+        next(objs)
+        self.assertEqual([{'foo': 'iter'}, {'foo': 'other'}, {'foo': 'iter'}], seen)
+
 
 class MultipleGetOrCreateFieldsTest(TransactionTestCase):
     def test_one_defined(self):
@@ -221,6 +238,86 @@ class SQLAlchemySessionPersistenceTestCase(unittest.TestCase):
                     model = models.StandardModel
 
 
+class FakeAsyncSession:
+    """Mimic an AsyncSession, without requiring an async database driver."""
+
+    def __init__(self, session):
+        self.session = session
+        self.calls = []
+
+    def add(self, obj):
+        self.session.add(obj)
+
+    async def execute(self, statement):
+        self.calls.append('execute')
+        return self.session.execute(statement)
+
+    async def flush(self):
+        self.calls.append('flush')
+        self.session.flush()
+
+    async def commit(self):
+        self.calls.append('commit')
+        self.session.commit()
+
+    async def rollback(self):
+        self.calls.append('rollback')
+        self.session.rollback()
+
+
+class SQLAlchemyAsyncSessionTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        models.Base.metadata.create_all(models.engine)
+        self.async_session = FakeAsyncSession(models.session)
+
+    def tearDown(self):
+        models.session.remove()
+        models.Base.metadata.drop_all(models.engine)
+        super().tearDown()
+
+    async def test_acreate(self):
+        class AsyncStandardFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.async_session
+                sqlalchemy_session_persistence = 'flush'
+
+        objs = await AsyncStandardFactory.acreate_batch(3)
+        self.assertEqual(['flush'] * 3, self.async_session.calls)
+        self.assertEqual(3, models.session.query(models.StandardModel).count())
+        self.assertEqual({obj.id for obj in objs}, {obj.id for obj in models.session.query(models.StandardModel)})
+
+    async def test_aget_or_create(self):
+        class AsyncGetOrCreateFactory(WithGetOrCreateFieldFactory):
+            class Meta:
+                sqlalchemy_session = self.async_session
+
+        obj1 = await AsyncGetOrCreateFactory.acreate(foo='foo1')
+        obj2 = await AsyncGetOrCreateFactory.acreate(foo='foo1')
+        self.assertEqual(obj1, obj2)
+        self.assertEqual(['execute', 'commit', 'execute'], self.async_session.calls)
+
+    async def test_overridden_create(self):
+        class OverriddenCreateFactory(StandardFactory):
+            class Meta:
+                sqlalchemy_session = self.async_session
+
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                kwargs['foo'] = 'overridden'
+                obj = model_class(*args, **kwargs)
+                models.session.add(obj)
+                return obj
+
+        obj = await OverriddenCreateFactory.acreate(foo='ignored')
+        self.assertEqual('overridden', obj.foo)
+        self.assertEqual([], self.async_session.calls)
+
+    async def test_sync_session(self):
+        obj = await StandardFactory.acreate()
+        self.assertEqual(obj, models.session.query(models.StandardModel).one())
+
+
 class SQLAlchemyNonIntegerPkTestCase(TransactionTestCase):
     def tearDown(self):
         super().tearDown()
@@ -323,3 +420,83 @@ class NameConflictTests(TransactionTestCase):
 
         get_or_created_child = SpecialFieldWithGetOrCreateFactory()
         self.assertEqual(get_or_created_child.session, "")
+
+
+class QueryIteratorTestCase(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        StandardFactory.reset_sequence()
+        StandardFactory.create_batch(3)
+        models.session.flush()
+        self.iterators = []
+
+    def tearDown(self):
+        # Close the cursors of unfinished iterations.
+        for iterator in self.iterators:
+            iterator.reset()
+        super().tearDown()
+
+    def make_factory(self, **kwargs):
+        class PointerFactory(factory.Factory):
+            class Meta:
+                model = dict
+
+            pointed = factory.alchemy.QueryIterator(**kwargs)
+
+        self.iterators.append(PointerFactory._meta.declarations['pointed'])
+        return PointerFactory
+
+    def test_select(self):
+        statement = sqlalchemy.select(models.StandardModel).order_by(models.StandardModel.id)
+        pointer_factory = self.make_factory(query=statement, session=models.session, chunk_size=2)
+        values = [obj['pointed'].foo for obj in pointer_factory.build_batch(4)]
+        self.assertEqual(['foo0', 'foo1', 'foo2', 'foo0'], values)
+
+    def test_columns(self):
+        ids = sqlalchemy.select(models.StandardModel.id).order_by(models.StandardModel.id)
+        pointer_factory = self.make_factory(query=ids, session_factory=lambda: models.session)
+        self.assertEqual([0, 1, 2, 0], [obj['pointed'] for obj in pointer_factory.build_batch(4)])
+
+        rows = sqlalchemy.select(models.StandardModel.id, models.StandardModel.foo).order_by(models.StandardModel.id)
+        pointer_factory = self.make_factory(query=rows, session=models.session)
+        self.assertEqual((1, 'foo1'), tuple(pointer_factory.build_batch(2)[1]['pointed']))
+
+    def test_query(self):
+        query = models.session.query(models.StandardModel.foo).order_by(models.StandardModel.id)
+        pointer_factory = self.make_factory(query=query, getter=lambda row: row.foo)
+        self.assertEqual(['foo0', 'foo1', 'foo2', 'foo0'], [obj['pointed'] for obj in pointer_factory.build_batch(4)])
+
+    def test_keyed_random(self):
+        statement = sqlalchemy.select(models.StandardModel.id).order_by(models.StandardModel.id)
+        pointer_factory = self.make_factory(query=statement, session=models.session)
+        pointer_factory.reset_sequence(4)
+        with factory.random.keyed_random(1):
+            self.assertEqual([1, 2], [obj['pointed'] for obj in pointer_factory.build_batch(2)])
+
+    def test_no_session(self):
+        pointer_factory = self.make_factory(query=sqlalchemy.select(models.StandardModel))
+        with self.assertRaises(RuntimeError):
+            pointer_factory.build()
+
+
+class FuzzyQueryChoiceTestCase(TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        StandardFactory.reset_sequence()
+        StandardFactory.create_batch(3)
+        models.session.flush()
+
+    def test_model(self):
+        fuzz = factory.alchemy.FuzzyQueryChoice(models.StandardModel, session=models.session)
+        values = {factory.build(dict, pointed=fuzz)['pointed'] for _i in range(20)}
+        self.assertTrue(all(isinstance(value, models.StandardModel) for value in values))
+        self.assertEqual(array.array('q', [0, 1, 2]), fuzz.pks)
+
+    def test_statement(self):
+        statement = sqlalchemy.select(models.StandardModel).where(models.StandardModel.foo != 'foo1')
+        fuzz = factory.alchemy.FuzzyQueryChoice(statement, session_factory=lambda: models.session, fetch=False)
+        self.assertEqual({0, 2}, {factory.build(dict, pk=fuzz)['pk'] for _i in range(20)})
+
+    def test_weights(self):
+        fuzz = factory.alchemy.FuzzyQueryChoice(models.StandardModel, session=models.session, weights='id')
+        self.assertEqual({'foo1', 'foo2'}, {factory.build(dict, pointed=fuzz)['pointed'].foo for _i in range(20)})
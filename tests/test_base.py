@@ -1,5 +1,6 @@
 # Copyright: See the LICENSE file.
 
+import threading
 import unittest
 
 from factory import base, declarations, enums, errors
@@ -360,6 +361,28 @@ class FactorySequenceTestCase(unittest.TestCase):
         o4 = self.TestObjectFactory()
         self.assertEqual(1, o4.one)
 
+    def test_batch_reserves_contiguous_sequences(self):
+        self.TestObjectFactory()
+        objs = self.TestObjectFactory.build_batch(3)
+        self.assertEqual([1, 2, 3], [o.one for o in objs])
+        self.assertEqual(4, self.TestObjectFactory().one)
+
+    def test_concurrent_sequences(self):
+        results = []
+
+        def generate():
+            batch = self.TestObjectFactory.build_batch(50)
+            single = [self.TestObjectFactory() for _ in range(50)]
+            results.extend(o.one for o in batch + single)
+
+        threads = [threading.Thread(target=generate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(list(range(800)), sorted(results))
+
 
 class FactoryDefaultStrategyTestCase(unittest.TestCase):
     def test_build_strategy(self):
@@ -517,6 +540,68 @@ class FactoryCreationTestCase(unittest.TestCase):
         self.assertTrue(Test._meta.abstract)
 
 
+class DeferredFinalizationTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        base.defer_finalization()
+        self.addCleanup(base.defer_finalization, False)
+
+    def test_first_use(self):
+        class ParentFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+        class ChildFactory(ParentFactory):
+            class Params:
+                double = declarations.Trait(two=2)
+
+            three = declarations.LazyAttribute(lambda o: o.one + 2)
+
+        self.assertIsInstance(vars(ChildFactory)['_meta'], base._DeferredOptions)
+        self.assertIn(ChildFactory, base._deferred_factories)
+
+        obj = ChildFactory(double=True)
+        self.assertEqual((1, 2, 3), (obj.one, obj.two, obj.three))
+        # Parents are finalized first.
+        self.assertIsInstance(vars(ParentFactory)['_meta'], base.FactoryOptions)
+        self.assertIsInstance(vars(ChildFactory)['_meta'], base.FactoryOptions)
+        self.assertNotIn(ChildFactory, base._deferred_factories)
+
+    def test_errors_on_first_use(self):
+        class InvalidFactory(base.Factory):
+            class Meta:
+                model = TestObject
+                unknown = True
+
+        with self.assertRaises(TypeError):
+            InvalidFactory()
+        # The error is raised again on the next use.
+        with self.assertRaises(TypeError):
+            InvalidFactory()
+        base._deferred_factories.discard(InvalidFactory)
+
+    def test_declared_attributes(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+
+        TestObjectFactory.two = 2
+        self.assertEqual({'one': 1}, TestObjectFactory._meta.pre_declarations.as_dict())
+
+    def test_finalize_all(self):
+        class TestObjectFactory(base.Factory):
+            class Meta:
+                model = TestObject
+
+        base.finalize_all()
+        self.assertIsInstance(vars(TestObjectFactory)['_meta'], base.FactoryOptions)
+        self.assertEqual(TestObject, TestObjectFactory._meta.model)
+
+
 class PostGenerationParsingTestCase(unittest.TestCase):
 
     def test_extraction(self):
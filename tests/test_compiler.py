@@ -0,0 +1,132 @@
+# Copyright: See the LICENSE file.
+
+import unittest
+
+import factory
+from factory import declarations
+
+from .test_using import TestObject
+
+
+class Record:
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+
+
+class ChildFactory(factory.Factory):
+    class Meta:
+        model = Record
+
+    name = factory.Sequence(lambda n: 'child%d' % n)
+
+
+class GenericFactory(factory.Factory):
+    class Meta:
+        model = Record
+        exclude = ('hidden',)
+        rename = {'renamed': 'target'}
+        inline_args = ('first',)
+
+    class Params:
+        doubled = factory.Trait(score=factory.LazyAttribute(lambda o: o.hidden * 4))
+
+    first = factory.Sequence(int)
+    hidden = 3
+    score = factory.LazyAttribute(lambda o: o.hidden * 2)
+    renamed = factory.LazyFunction(lambda: 'moved')
+    label = factory.SelfAttribute('renamed')
+    skipped = factory.Maybe('hidden', declarations.SKIP, 'kept')
+    child = factory.SubFactory(ChildFactory, name=factory.SelfAttribute('..renamed'))
+    tags = factory.PostGeneration(lambda obj, create, extracted, **kwargs: extracted or ['default'])
+
+
+class CompiledFactory(GenericFactory):
+    class Meta:
+        compile = True
+
+
+class CompilerTestCase(unittest.TestCase):
+    def assertSameBuilds(self, **kwargs):
+        # Both factories share their sequence counter.
+        GenericFactory.reset_sequence()
+        expected = GenericFactory.build_batch(3, **kwargs)
+        GenericFactory.reset_sequence()
+        objs = CompiledFactory.build_batch(3, **kwargs)
+        for obj, reference in zip(objs, expected):
+            self.assertEqual(reference.args, obj.args)
+            self.assertEqual(
+                {k: v for k, v in reference.kwargs.items() if k != 'child'},
+                {k: v for k, v in obj.kwargs.items() if k != 'child'},
+            )
+            self.assertEqual(reference.kwargs['child'].kwargs, obj.kwargs['child'].kwargs)
+        return objs
+
+    def get_plan(self, factory_class, **kwargs):
+        return factory_class._meta.get_declaration_plan(kwargs)
+
+    def test_compiled(self):
+        objs = self.assertSameBuilds()
+
+        self.assertEqual((1,), objs[1].args)
+        self.assertEqual(
+            {'score': 6, 'label': 'moved', 'child': objs[1].kwargs['child'], 'target': 'moved'},
+            objs[1].kwargs,
+        )
+        plan = self.get_plan(CompiledFactory)
+        self.assertIsNotNone(plan.compiled)
+        self.assertIn("values['hidden'] = ", plan.compiled.source)
+        self.assertIsNone(self.get_plan(GenericFactory).compiled)
+
+    def test_overrides(self):
+        self.assertSameBuilds(hidden=5, score=factory.Sequence(lambda n: n * 10))
+        self.assertSameBuilds(child__name='other', doubled=True, tags=['a'])
+        objs = self.assertSameBuilds(skipped=factory.LazyAttribute(lambda o: o.score + 1), renamed='custom')
+        self.assertEqual(
+            {'score': 6, 'skipped': 7, 'label': 'custom', 'child': objs[0].kwargs['child'], 'target': 'custom'},
+            objs[0].kwargs,
+        )
+
+    def test_adjust_kwargs(self):
+        class AdjustedFactory(CompiledFactory):
+            @classmethod
+            def _adjust_kwargs(cls, **kwargs):
+                kwargs['score'] += 1
+                return kwargs
+
+        AdjustedFactory.build()
+        obj = AdjustedFactory.build()
+        self.assertEqual(7, obj.kwargs['score'])
+        self.assertIn("meta.prepare_arguments", self.get_plan(AdjustedFactory).compiled.source)
+
+    def test_compile_function(self):
+        @factory.compile
+        class PlainFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 1
+            two = factory.LazyAttribute(lambda o: o.one + 1)
+
+        class ExtendedFactory(PlainFactory):
+            three = factory.SelfAttribute('two')
+
+        self.assertTrue(PlainFactory._meta.compile)
+        self.assertTrue(ExtendedFactory._meta.compile)
+        ExtendedFactory.build(one=3)
+        obj = ExtendedFactory.build(one=2)
+        self.assertEqual((2, 3, 3), (obj.one, obj.two, obj.three))
+
+    def test_profiling(self):
+        CompiledFactory.build()
+        with factory.profile() as prof:
+            obj = CompiledFactory.build()
+        self.assertEqual(6, obj.kwargs['score'])
+        # Generated functions run inlined declarations through the hooks too.
+        plan = self.get_plan(CompiledFactory)
+        self.assertIn("hooked(step, 'renamed', lambda: ", plan.compiled_hooked.source)
+        self.assertNotIn('hooked(', plan.compiled.source)
+        timings = prof.as_dict()
+        self.assertEqual(1, timings['CompiledFactory.score']['calls'])
+        self.assertEqual(1, timings['CompiledFactory.renamed']['calls'])
+        self.assertEqual(1, timings['CompiledFactory.child']['calls'])
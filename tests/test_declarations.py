@@ -81,6 +81,20 @@ class SelfAttributeTestCase(unittest.TestCase):
         self.assertEqual('bar.baz', a.attribute_name)
         self.assertEqual(declarations._UNSPECIFIED, a.default)
 
+    def test_default_on_resolver(self):
+        class Loud:
+            def __repr__(self):
+                raise AssertionError("Unknown fields should not describe the computed values.")
+
+        loud = Loud()
+        obj = base.DictFactory(
+            loud=loud,
+            known=1,
+            missing=declarations.SelfAttribute('absent', 42),
+            nested=declarations.SelfAttribute('known.absent', 43),
+        )
+        self.assertEqual({'loud': loud, 'known': 1, 'missing': 42, 'nested': 43}, obj)
+
 
 class IteratorTestCase(unittest.TestCase):
     def test_cycle(self):
@@ -124,6 +138,15 @@ class IteratorTestCase(unittest.TestCase):
         with self.assertRaises(StopIteration):
             utils.evaluate_declaration(it, force_sequence=2)
 
+    def test_streaming(self):
+        it = declarations.Iterator(iter([1, 2]), cycle=False, resettable=False)
+        self.assertEqual(1, utils.evaluate_declaration(it, force_sequence=0))
+        self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=1))
+        with self.assertRaises(StopIteration):
+            utils.evaluate_declaration(it, force_sequence=2)
+        with self.assertRaises(ValueError):
+            it.reset()
+
     def test_getter(self):
         it = declarations.Iterator([(1, 2), (1, 3)], getter=lambda p: p[1])
         self.assertEqual(2, utils.evaluate_declaration(it, force_sequence=0))
@@ -22,7 +22,7 @@ from django.contrib.auth.hashers import check_password
 from django.core.management import call_command, color
 from django.core.management.commands.migrate import Command as MigrateCommand
 from django.db import IntegrityError, connections
-from django.db.models import signals
+from django.db.models import Case, Value, When, signals
 from django.test import utils as django_test_utils
 
 import factory
@@ -418,6 +418,123 @@ class ModelTests(django_test.TestCase):
         self.assertFalse(models.StandardModel.objects.exists())
         self.assertEqual(obj, models.StandardModel.objects.using('replica').get())
 
+    def test_iter_create_original_params(self):
+        seen = []
+
+        class RecordingFactory(StandardFactory):
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                seen.append(cls._original_params)
+                return super()._create(model_class, *args, **kwargs)
+
+        objs = RecordingFactory.iter_create(2, foo='iter')
+        next(objs)
+        # Factory calls while the iterator is paused don't leak into it.
+        RecordingFactory.create(foo='other')
+        next(objs)
+        self.assertEqual([{'foo': 'iter'}, {'foo': 'other'}, {'foo': 'iter'}], seen)
+
+    def test_create_batch_overridden_create(self):
+        class OverriddenCreateFactory(StandardFactory):
+            @classmethod
+            def create(cls, **kwargs):
+                return super().create(foo='overridden', **kwargs)
+
+        objs = OverriddenCreateFactory.create_batch(2)
+        self.assertEqual(['overridden', 'overridden'], [obj.foo for obj in objs])
+        self.assertEqual(2, models.StandardModel.objects.filter(foo='overridden').count())
+
+    async def test_acreate_overridden_create(self):
+        class OverriddenCreateFactory(StandardFactory):
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                kwargs['foo'] = 'overridden'
+                return super()._create(model_class, *args, **kwargs)
+
+        objs = await OverriddenCreateFactory.acreate_batch(2)
+        self.assertEqual(['overridden', 'overridden'], [obj.foo for obj in objs])
+        self.assertEqual(2, await models.StandardModel.objects.filter(foo='overridden').acount())
+
+
+class DjangoQuerysetIteratorTestCase(django_test.TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for foo in ('a', 'b', 'c'):
+            models.PointedModel.objects.create(foo=foo)
+
+    def make_factory(self, queryset, **kwargs):
+        class PointerFactory(factory.Factory):
+            class Meta:
+                model = dict
+
+            pointed = factory.django.QuerysetIterator(queryset, **kwargs)
+
+        return PointerFactory
+
+    def test_instances(self):
+        pointer_factory = self.make_factory(models.PointedModel.objects.order_by('foo'), chunk_size=2)
+        pointers = pointer_factory.build_batch(4)
+        self.assertEqual(['a', 'b', 'c', 'a'], [pointer['pointed'].foo for pointer in pointers])
+
+    def test_cycle_queries(self):
+        pointer_factory = self.make_factory(models.PointedModel.objects.order_by('foo'), fields='foo', chunk_size=2)
+        with self.assertNumQueries(1):
+            self.assertEqual(['a', 'b', 'c'], [obj['pointed'] for obj in pointer_factory.build_batch(3)])
+        # The next cycle issues the query again.
+        with self.assertNumQueries(1):
+            self.assertEqual('a', pointer_factory.build()['pointed'])
+
+    def test_fields(self):
+        pointed = models.PointedModel.objects.get(foo='b')
+        pointer_factory = self.make_factory(models.PointedModel.objects.filter(foo='b'), fields=('pk', 'foo'))
+        self.assertEqual((pointed.pk, 'b'), pointer_factory.build()['pointed'])
+
+    def test_manager(self):
+        pointer_factory = self.make_factory(models.PointedModel.objects, fields='foo', cycle=False)
+        self.assertEqual({'a', 'b', 'c'}, {obj['pointed'] for obj in pointer_factory.build_batch(3)})
+        with self.assertRaises(StopIteration):
+            pointer_factory.build()
+
+    def test_keyed_random(self):
+        pointer_factory = self.make_factory(models.PointedModel.objects.order_by('foo'), fields='foo')
+        pointer_factory.reset_sequence(4)
+        with factory.random.keyed_random(1), self.assertNumQueries(3):
+            # One query for the primary keys, then one per value.
+            self.assertEqual(['b', 'c'], [obj['pointed'] for obj in pointer_factory.build_batch(2)])
+
+    def test_keyed_random_unordered(self):
+        pointer_factory = self.make_factory(models.PointedModel.objects.all(), fields='foo')
+        foos = list(models.PointedModel.objects.order_by('pk').values_list('foo', flat=True))
+        with factory.random.keyed_random(1):
+            # Rows are indexed by primary key.
+            self.assertEqual(foos, [obj['pointed'] for obj in pointer_factory.build_batch(3)])
+
+
+class DjangoFuzzyQuerysetChoiceTestCase(django_test.TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for foo in ('a', 'b', 'c'):
+            models.PointedModel.objects.create(foo=foo)
+
+    def test_objects(self):
+        fuzz = factory.django.FuzzyQuerysetChoice(models.PointedModel.objects.exclude(foo='c'), batch_size=10)
+        with self.assertNumQueries(2):
+            values = [factory.build(dict, pointed=fuzz)['pointed'] for _i in range(10)]
+        self.assertEqual({'a', 'b'}, {value.foo for value in values})
+
+    def test_weights(self):
+        queryset = models.PointedModel.objects.annotate(
+            weight=Case(When(foo='b', then=Value(1)), default=Value(0)),
+        )
+        fuzz = factory.django.FuzzyQuerysetChoice(queryset, weights='weight')
+        self.assertEqual({'b'}, {factory.build(dict, pointed=fuzz)['pointed'].foo for _i in range(5)})
+
+    def test_non_integer_pks(self):
+        models.NonIntegerPk.objects.create(foo='x')
+        fuzz = factory.django.FuzzyQuerysetChoice(models.NonIntegerPk.objects, fetch=False)
+        self.assertEqual('x', factory.build(dict, pk=fuzz)['pk'])
+        self.assertEqual(['x'], fuzz.pks)
+
 
 class DjangoResetTestCase(django_test.TestCase):
     def reset_database_sequences(self, *models):
@@ -504,6 +621,12 @@ class DjangoGetOrCreateTests(django_test.TestCase):
             ["alt", "main"],
         )
 
+    async def test_acreate(self):
+        obj1 = await MultifieldModelFactory.acreate(slug='slug1')
+        obj2 = await MultifieldModelFactory.acreate(slug='slug1')
+        self.assertEqual(obj1, obj2)
+        self.assertEqual(1, await models.MultifieldModel.objects.acount())
+
 
 class MultipleGetOrCreateFieldsTest(django_test.TestCase):
     def test_one_defined(self):
@@ -748,6 +871,19 @@ class DjangoRelatedFieldTestCase(django_test.TestCase):
         self.assertEqual(pointed.pointer, models.PointerModel.objects.get())
         self.assertEqual(pointed.pointer.bar, 'bar')
 
+    async def test_acreate_pointer(self):
+        pointer = await self.PointerFactory.acreate(pointed__foo='async_foo')
+        self.assertEqual(pointer, await models.PointerModel.objects.aget())
+        self.assertEqual(pointer.pointed, await models.PointedModel.objects.aget())
+        self.assertEqual('async_foo', pointer.pointed.foo)
+
+    async def test_acreate_pointed_related(self):
+        pointed = await self.PointedRelatedFactory.acreate(pointer__bar='async_bar')
+        self.assertEqual(pointed, await models.PointedModel.objects.aget())
+        pointer = await models.PointerModel.objects.select_related('pointed').aget()
+        self.assertEqual('async_bar', pointer.bar)
+        self.assertEqual(pointed, pointer.pointed)
+
     def test_create_pointed_related_with_deep_context(self):
         pointed = self.PointedRelatedFactory(pointer__bar='new_new_bar')
         self.assertEqual(pointed, models.PointedModel.objects.get())
@@ -1232,6 +1368,55 @@ class PreventSignalsTestCase(django_test.TestCase):
 
         self.assertSignalsReactivated()
 
+    def test_class_decorator_iter_create(self):
+        @factory.django.mute_signals(signals.pre_save, signals.post_save)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+        objs = WithSignalsDecoratedFactory.iter_create(2)
+        self.assertEqual(self.handlers.pre_init.call_count, 0)
+        self.assertEqual(2, len(list(objs)))
+
+        self.assertEqual(self.handlers.pre_init.call_count, 2)
+        self.assertFalse(self.handlers.pre_save.called)
+        self.assertFalse(self.handlers.post_save.called)
+
+        self.assertSignalsReactivated()
+
+    def test_class_decorator_iter_create_between_values(self):
+        @factory.django.mute_signals(signals.pre_save, signals.post_save)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+        objs = WithSignalsDecoratedFactory.iter_create(2)
+        next(objs)
+        # Signals are live while the generator is paused.
+        self.assertSignalsReactivated()
+        next(objs)
+        objs.close()
+
+        self.assertEqual(1, self.handlers.pre_save.call_count)
+        self.assertEqual(1, self.handlers.post_save.call_count)
+
+    async def test_class_decorator_acreate(self):
+        @factory.django.mute_signals(signals.pre_save, signals.post_save)
+        class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
+            class Meta:
+                model = models.WithSignals
+
+        objs = await WithSignalsDecoratedFactory.acreate_batch(2)
+        self.assertEqual(2, len(objs))
+
+        self.assertEqual(self.handlers.pre_init.call_count, 2)
+        self.assertFalse(self.handlers.pre_save.called)
+        self.assertFalse(self.handlers.post_save.called)
+
+        await WithSignalsFactory.acreate()
+        self.assertEqual(self.handlers.pre_save.call_count, 1)
+        self.assertEqual(self.handlers.post_save.call_count, 1)
+
     def test_class_decorator_with_subfactory(self):
         @factory.django.mute_signals(signals.pre_save, signals.post_save)
         class WithSignalsDecoratedFactory(factory.django.DjangoModelFactory):
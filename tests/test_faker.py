@@ -1,9 +1,11 @@
 # Copyright: See the LICENSE file.
 
 import collections
+import concurrent.futures
 import datetime
 import random
 import unittest
+from unittest import mock
 
 import faker.providers
 
@@ -32,10 +34,13 @@ class AdvancedMockFaker:
 class FakerTests(unittest.TestCase):
     def setUp(self):
         self._real_fakers = factory.Faker._FAKER_REGISTRY
+        self._real_providers = factory.Faker._PROVIDERS
         factory.Faker._FAKER_REGISTRY = {}
+        factory.Faker._PROVIDERS = []
 
     def tearDown(self):
         factory.Faker._FAKER_REGISTRY = self._real_fakers
+        factory.Faker._PROVIDERS = self._real_providers
 
     def _setup_mock_faker(self, locale=None, **definitions):
         if locale is None:
@@ -132,6 +137,10 @@ class FakerTests(unittest.TestCase):
         self.assertEqual(":)", face.smiley)
         self.assertEqual("(:", face.french_smiley)
 
+        # Adding a provider twice registers it once.
+        factory.Faker.add_provider(SmileyProvider)
+        self.assertEqual(1, factory.Faker._PROVIDERS.count((SmileyProvider, factory.Faker._DEFAULT_LOCALE)))
+
     def test_faker_customization(self):
         """Factory declarations in Faker parameters should be accepted."""
         Trip = collections.namedtuple('Trip', ['departure', 'transfer', 'arrival'])
@@ -168,3 +177,137 @@ class FakerTests(unittest.TestCase):
         self.assertEqual(may_4th, trip.departure)
         self.assertEqual(october_19th, trip.transfer)
         self.assertEqual(may_25th, trip.arrival)
+
+    def test_faker_nested_customization(self):
+        """Faker parameters may refer to each other, without a nested factory build."""
+        Stay = collections.namedtuple('Stay', ['nights', 'checkout'])
+        may_4th = datetime.date(1977, 5, 4)
+
+        class StayFactory(factory.Factory):
+            class Meta:
+                model = Stay
+
+            nights = 3
+            checkout = factory.Faker(
+                'date_between_dates',
+                start_date=may_4th,
+                end_date=factory.LazyAttribute(
+                    lambda o: o.start_date + datetime.timedelta(days=o.factory_parent.nights),
+                ),
+            )
+
+        self._setup_advanced_mock_faker(
+            date_between_dates=lambda start_date, end_date: end_date,
+        )
+
+        with mock.patch.object(factory.DictFactory._meta, 'instantiate') as instantiate:
+            stay = StayFactory()
+        self.assertFalse(instantiate.called)
+        self.assertEqual(datetime.date(1977, 5, 7), stay.checkout)
+
+
+class FakerPoolTests(unittest.TestCase):
+    def setUp(self):
+        self._real_fakers = factory.Faker._FAKER_REGISTRY
+        self.calls = collections.Counter()
+
+        def counter(name):
+            def provider(**kwargs):
+                self.calls[name] += 1
+                return '%s%d' % (name, self.calls[name])
+            return provider
+
+        factory.Faker._FAKER_REGISTRY = {
+            factory.Faker._DEFAULT_LOCALE: AdvancedMockFaker({
+                'word': counter('word'),
+                'date': counter('date'),
+            }),
+        }
+
+    def tearDown(self):
+        factory.Faker._FAKER_REGISTRY = self._real_fakers
+
+    def test_pooled(self):
+        class WordFactory(factory.DictFactory):
+            word = factory.Faker('word')
+
+        with factory.Faker.pooled(size=100):
+            self.assertEqual({'word': 'word1'}, WordFactory())
+            # The first chunk was generated at once.
+            self.assertEqual(16, self.calls['word'])
+            words = [obj['word'] for obj in WordFactory.build_batch(20)]
+            self.assertEqual(['word%d' % i for i in range(2, 22)], words)
+            self.assertEqual(16 + 32, self.calls['word'])
+
+        self.assertIsNone(factory.faker._pools.get())
+        self.assertEqual({'word': 'word49'}, WordFactory())
+
+    def test_reseed(self):
+        class WordFactory(factory.DictFactory):
+            word = factory.Faker('word')
+
+        # Leave the global random generator as it was found.
+        randgen = factory.random.randgen
+        self.addCleanup(setattr, randgen, 'state_set', randgen.state_set)
+        self.addCleanup(factory.random.set_random_state, factory.random.get_random_state())
+
+        with factory.Faker.pooled(size=100):
+            self.assertEqual({'word': 'word1'}, WordFactory())
+            factory.random.reseed_random(1)
+            # Values buffered before reseeding are dropped.
+            self.assertEqual({'word': 'word17'}, WordFactory())
+            self.assertEqual(32, self.calls['word'])
+
+    def test_not_pooled(self):
+        class DateFactory(factory.DictFactory):
+            start = factory.Faker('date', after=factory.SelfAttribute('..word'))
+            end = factory.Faker('date', choices=['a', 'b'])
+            word = 'x'
+
+        with factory.Faker.pooled(size=100):
+            DateFactory.build_batch(3)
+        # Lazy and unhashable parameters are not pooled.
+        self.assertEqual(6, self.calls['date'])
+
+    def test_background(self):
+        class WordFactory(factory.DictFactory):
+            word = factory.Faker('word')
+
+        with factory.Faker.pooled(size=32, background=True):
+            pools = factory.faker._pools.get()
+            words = [obj['word'] for obj in WordFactory.build_batch(40)]
+        self.assertEqual(['word%d' % i for i in range(1, 41)], words)
+        self.assertFalse(pools._thread.is_alive())
+        self.assertEqual({}, pools.pools)
+
+    def test_other_threads(self):
+        class WordFactory(factory.DictFactory):
+            word = factory.Faker('word')
+
+        with factory.Faker.pooled(size=100):
+            WordFactory()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(WordFactory).result()
+        # Only the pooled thread generated a chunk of values.
+        self.assertEqual(16 + 1, self.calls['word'])
+
+    def test_unique(self):
+        fakers = factory.Faker._FAKER_REGISTRY
+        fakers[factory.Faker._DEFAULT_LOCALE].handlers['letter'] = iter('abaacdb').__next__
+        letter = factory.Faker('letter', unique=True)
+
+        class LetterFactory(factory.DictFactory):
+            value = letter
+
+        self.assertEqual(['a', 'b', 'c'], [obj['value'] for obj in LetterFactory.build_batch(3)])
+        with factory.Faker.pooled(size=2):
+            self.assertEqual({'value': 'd'}, LetterFactory())
+        self.assertEqual(
+            {'values': 4, 'attempts': 6, 'collisions': 2, 'collision_rate': 2 / 6},
+            letter.unique_filter.stats(),
+        )
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            with factory.Faker.pooled(size=0):
+                pass
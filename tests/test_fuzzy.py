@@ -1,16 +1,25 @@
 # Copyright: See the LICENSE file.
 
 
+import array
 import datetime
 import decimal
+import gc
+import threading
 import unittest
 import warnings
 from unittest import mock
 
-from factory import fuzzy, random
+from factory import errors, fuzzy, random
 
 from . import utils
 
+try:
+    import numpy  # noqa: F401
+    SKIP_NUMPY = False
+except ImportError:
+    SKIP_NUMPY = True
+
 
 class FuzzyAttributeTestCase(unittest.TestCase):
     def test_simple_call(self):
@@ -122,6 +131,15 @@ class FuzzyIntegerTestCase(unittest.TestCase):
 
         self.assertEqual((5 + 8 + 1) * 3, res)
 
+    def test_unique(self):
+        fuzz = fuzzy.FuzzyInteger(1, 20, unique=True)
+        values = [utils.evaluate_declaration(fuzz) for _i in range(20)]
+        self.assertEqual(list(range(1, 21)), sorted(values))
+        self.assertEqual(20, fuzz.unique_filter.stats()['values'])
+
+        with self.assertRaises(errors.UniqueValueError):
+            utils.evaluate_declaration(fuzz)
+
 
 class FuzzyDecimalTestCase(unittest.TestCase):
     def test_definition(self):
@@ -573,6 +591,15 @@ class FuzzyTextTestCase(unittest.TestCase):
 
         self.assertEqual('preaaaapost', res)
 
+    def test_unique(self):
+        fuzz = fuzzy.FuzzyText(length=3, chars='ab', unique=True)
+        values = {utils.evaluate_declaration(fuzz) for _i in range(8)}
+        self.assertEqual(8, len(values))
+
+        stats = fuzz.unique_filter.stats()
+        self.assertEqual(stats['attempts'] - 8, stats['collisions'])
+        self.assertEqual(stats['collisions'] / stats['attempts'], stats['collision_rate'])
+
     def test_generator(self):
         def options():
             yield 'a'
@@ -617,3 +644,185 @@ class FuzzyRandomTestCase(unittest.TestCase):
         random.set_random_state(state)
         value2 = utils.evaluate_declaration(fuzz)
         self.assertEqual(value, value2)
+
+
+@unittest.skipIf(SKIP_NUMPY, "NumPy is not installed.")
+class NumpyBlocksTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fuzzers = [
+            fuzzy.FuzzyInteger(-3, 50, step=4),
+            fuzzy.FuzzyDecimal(-2, 10.5, precision=3),
+            fuzzy.FuzzyFloat(0.5, 1.5, precision=4),
+            fuzzy.FuzzyDate(datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)),
+            fuzzy.FuzzyNaiveDateTime(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2)),
+        ]
+
+    def generate(self, count=50):
+        return [[utils.evaluate_declaration(fuzz) for _i in range(count)] for fuzz in self.fuzzers]
+
+    def test_values(self):
+        with fuzzy.use_numpy(block_size=32):
+            integers, decimals, floats, dates, datetimes = self.generate()
+        self.assertTrue(all(value in range(-3, 51, 4) for value in integers))
+        self.assertTrue(all(decimal.Decimal(-2) <= value <= decimal.Decimal('10.5') for value in decimals))
+        self.assertTrue(all(value.as_tuple().exponent == -3 for value in decimals))
+        self.assertTrue(all(0.5 <= value <= 1.5 and value == round(value, 4) for value in floats))
+        self.assertTrue(all(value.year == 2020 for value in dates))
+        self.assertTrue(all(value.date() == datetime.date(2020, 1, 1) for value in datetimes[:-1]))
+        self.assertGreater(len(set(integers)), 1)
+        self.assertEqual(int, type(integers[0]))
+
+    def test_decimal_bounds(self):
+        # Values rounded from the ends of the range may fall outside of it,
+        # with or without blocks.
+        fuzz = fuzzy.FuzzyDecimal(0.4, 2.6, precision=0)
+        scalar = {utils.evaluate_declaration(fuzz) for _i in range(500)}
+        with fuzzy.use_numpy(block_size=32):
+            blocks = {utils.evaluate_declaration(fuzz) for _i in range(500)}
+        self.assertEqual({decimal.Decimal(value) for value in range(4)}, scalar)
+        self.assertEqual(scalar, blocks)
+
+    def test_reseed(self):
+        with fuzzy.use_numpy(block_size=32):
+            random.reseed_random(42)
+            values = self.generate()
+            # Values pre-generated before the reseed are discarded.
+            random.reseed_random(42)
+            self.assertEqual(values, self.generate())
+
+    def test_local_random(self):
+        with fuzzy.use_numpy(block_size=32):
+            with random.local_random(1, key='a'):
+                values = self.generate()
+            self.assertNotEqual(values, self.generate())
+            with random.local_random(1, key='a'):
+                self.assertEqual(values, self.generate())
+
+    def test_local_random_blocks_released(self):
+        with fuzzy.use_numpy(block_size=32):
+            engine = fuzzy._block_engine.get()
+            for seed in range(3):
+                with random.local_random(seed) as local:
+                    self.generate(count=1)
+                    self.assertEqual([local.randgen], list(engine.blocks))
+            del local
+            gc.collect()
+            # Blocks are dropped with their random generator.
+            self.assertEqual(0, len(engine.blocks))
+
+    def test_threads(self):
+        values = {}
+
+        def generate():
+            values['thread'] = fuzzy._block_engine.get()
+
+        with fuzzy.use_numpy():
+            thread = threading.Thread(target=generate)
+            thread.start()
+            thread.join()
+        # Blocks only apply to the current thread.
+        self.assertIsNone(values['thread'])
+
+    def test_unique(self):
+        fuzz = fuzzy.FuzzyInteger(9, unique=True)
+        with fuzzy.use_numpy():
+            values = {utils.evaluate_declaration(fuzz) for _i in range(10)}
+        self.assertEqual(set(range(10)), values)
+
+    def test_overridden_fuzz(self):
+        class ConstantInteger(fuzzy.FuzzyInteger):
+            def fuzz(self):
+                return 42
+
+        with fuzzy.use_numpy():
+            self.assertEqual(42, utils.evaluate_declaration(ConstantInteger(10)))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            with fuzzy.use_numpy(block_size=0):
+                pass
+
+
+class FakeRowChoice(fuzzy.BaseFuzzyRowChoice):
+    def __init__(self, rows, **kwargs):
+        super().__init__(**kwargs)
+        self.rows = rows
+        self.loads = 0
+        self.fetches = []
+
+    def fetch_pks(self):
+        self.loads += 1
+        if self.weights is None:
+            return iter(self.rows)
+        return ((pk, self.rows[pk][self.weights]) for pk in self.rows)
+
+    def fetch_objects(self, pks):
+        self.fetches.append(pks)
+        return {pk: self.rows[pk] for pk in pks if pk in self.rows}
+
+
+class FuzzyRowChoiceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rows = {pk: {'pk': pk, 'weight': 0 if pk % 2 else 1} for pk in range(10)}
+
+    def test_objects(self):
+        fuzz = FakeRowChoice(self.rows, batch_size=8)
+        values = [utils.evaluate_declaration(fuzz) for _i in range(20)]
+        self.assertTrue(all(value is self.rows[value['pk']] for value in values))
+        self.assertEqual(1, fuzz.loads)
+        # Objects are fetched by batches.
+        self.assertEqual(3, len(fuzz.fetches))
+        self.assertEqual(array.array('q', range(10)), fuzz.pks)
+
+    def test_pks(self):
+        fuzz = FakeRowChoice(self.rows, fetch=False)
+        values = {utils.evaluate_declaration(fuzz) for _i in range(100)}
+        self.assertEqual(set(range(10)), values)
+        self.assertEqual([], fuzz.fetches)
+
+    def test_weights(self):
+        fuzz = FakeRowChoice(self.rows, weights='weight', fetch=False)
+        values = {utils.evaluate_declaration(fuzz) for _i in range(100)}
+        self.assertEqual({0, 2, 4, 6, 8}, values)
+
+    def test_decimal_weights(self):
+        rows = {pk: {'weight': decimal.Decimal(row['weight']) / 4} for pk, row in self.rows.items()}
+        fuzz = FakeRowChoice(rows, weights='weight', fetch=False)
+        values = {utils.evaluate_declaration(fuzz) for _i in range(100)}
+        self.assertEqual({0, 2, 4, 6, 8}, values)
+        self.assertEqual(1.25, fuzz.cumulative_weights[-1])
+
+    def test_load(self):
+        rows = {1: {'weight': 2}, 2 ** 64: {'weight': 1}, 'x': {'weight': 3}}
+        fuzz = FakeRowChoice(rows, weights='weight')
+        fuzz.load()
+        # Rows are streamed; primary keys that don't fit in an array are kept in a list.
+        self.assertEqual([1, 2 ** 64, 'x'], fuzz.pks)
+        self.assertEqual(array.array('d', [2, 3, 6]), fuzz.cumulative_weights)
+
+    def test_refresh(self):
+        fuzz = FakeRowChoice(self.rows, fetch=False, refresh_every=5)
+        for _i in range(11):
+            utils.evaluate_declaration(fuzz)
+        self.assertEqual(3, fuzz.loads)
+
+    def test_deleted_rows(self):
+        random.reseed_random(1)
+        fuzz = FakeRowChoice(self.rows, batch_size=4)
+        utils.evaluate_declaration(fuzz)
+        self.rows = fuzz.rows = {0: self.rows[0]}
+        fuzz.objects.clear()
+        values = [utils.evaluate_declaration(fuzz) for _i in range(10)]
+        self.assertEqual([{'pk': 0, 'weight': 1}] * 10, values)
+        self.assertEqual(2, fuzz.loads)
+
+    def test_reseed(self):
+        fuzz = FakeRowChoice(self.rows)
+        random.reseed_random(42)
+        values = [utils.evaluate_declaration(fuzz) for _i in range(5)]
+        random.reseed_random(42)
+        self.assertEqual(values, [utils.evaluate_declaration(fuzz) for _i in range(5)])
+
+    def test_empty(self):
+        with self.assertRaises(IndexError):
+            utils.evaluate_declaration(FakeRowChoice({}))
@@ -0,0 +1,47 @@
+# Copyright: See the LICENSE file.
+
+import subprocess
+import sys
+import textwrap
+import unittest
+
+import factory
+
+
+def run_python(code):
+    """Run some code in a fresh interpreter, return its output."""
+    return subprocess.run(
+        [sys.executable, '-c', textwrap.dedent(code)],
+        capture_output=True, check=True, text=True,
+    ).stdout.split()
+
+
+class LazyImportTestCase(unittest.TestCase):
+    def test_minimal_import(self):
+        loaded = run_python("""
+            import sys
+            import factory
+            for name in ('faker', 'django', 'sqlalchemy', 'mongoengine', 'asyncio'):
+                print(name in sys.modules)
+        """)
+        self.assertEqual(['False'] * 5, loaded)
+
+    def test_lazy_attributes(self):
+        from factory import faker
+        self.assertIs(faker.Faker, factory.Faker)
+        self.assertIn('Faker', dir(factory))
+        self.assertIn('django', dir(factory))
+        with self.assertRaises(AttributeError):
+            factory.unknown
+
+    def test_seed_before_faker_import(self):
+        code = """
+            import factory.random
+            {before}
+            factory.random.reseed_random(42)
+            {after}
+            print(factory.Faker('pyint').evaluate(None, None, {{'locale': None}}))
+        """
+        late = run_python(code.format(before='', after='import faker'))
+        early = run_python(code.format(before='import faker', after=''))
+        self.assertEqual(early, late)
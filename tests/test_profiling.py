@@ -0,0 +1,153 @@
+# Copyright: See the LICENSE file.
+
+import threading
+import unittest
+from unittest import mock
+
+import factory
+from factory import builder
+
+from .test_using import Dummy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def spend(self, duration, value=None):
+        def advance(*args, **kwargs):
+            self.now += duration
+            return value
+        return advance
+
+
+class ProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+        patcher = mock.patch('factory.profiling.time.perf_counter', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_factories(self):
+        clock = self.clock
+
+        class ChildFactory(factory.Factory):
+            class Meta:
+                model = Dummy
+
+            name = factory.LazyFunction(clock.spend(2, 'child'))
+
+        class ParentFactory(factory.Factory):
+            class Meta:
+                model = Dummy
+
+            derived = factory.LazyAttribute(lambda o: clock.spend(3)() or o.base + 1)
+            base = factory.LazyFunction(clock.spend(1, 10))
+            child = factory.SubFactory(ChildFactory)
+            hook = factory.PostGeneration(clock.spend(5))
+
+        return ChildFactory, ParentFactory
+
+    def test_timings(self):
+        ChildFactory, ParentFactory = self.make_factories()
+
+        with factory.profile() as prof:
+            objs = ParentFactory.build_batch(2, derived=factory.LazyAttribute(lambda o: o.base + 1))
+            ParentFactory.build()
+
+        self.assertEqual(11, objs[0].derived)
+        timings = prof.as_dict()
+        self.assertEqual({'calls': 3, 'total': 15.0, 'own': 15.0}, timings['ParentFactory.hook'])
+        self.assertEqual({'calls': 3, 'total': 6.0, 'own': 6.0}, timings['ChildFactory.name'])
+        # The child's fields are not counted in the SubFactory's own time.
+        self.assertEqual({'calls': 3, 'total': 6.0, 'own': 0.0}, timings['ParentFactory.child'])
+        self.assertEqual({'calls': 3, 'total': 3.0, 'own': 3.0}, timings['ParentFactory.base'])
+        # Overridden on the first two calls; the first evaluation of each
+        # batch triggers the evaluation of 'base'.
+        self.assertEqual({'calls': 3, 'total': 5.0, 'own': 3.0}, timings['ParentFactory.derived'])
+        self.assertEqual(
+            ['ParentFactory.hook', 'ChildFactory.name', 'ParentFactory.base', 'ParentFactory.derived',
+             'ParentFactory.child'],
+            list(timings),
+        )
+
+    def test_nested_declarations(self):
+        clock = self.clock
+
+        class AddressFactory(factory.Factory):
+            class Meta:
+                model = Dummy
+
+            location = factory.Dict({
+                'city': factory.LazyFunction(clock.spend(1, 'Paris')),
+                'lines': factory.List([factory.LazyFunction(clock.spend(2, 'street'))]),
+            })
+
+        with factory.profile() as prof:
+            obj = AddressFactory.build()
+
+        self.assertEqual({'city': 'Paris', 'lines': ['street']}, obj.location)
+        timings = prof.as_dict()
+        # Fields of Dict and List declarations are keyed by their path.
+        self.assertEqual({'calls': 1, 'total': 1.0, 'own': 1.0}, timings['AddressFactory.location.city'])
+        self.assertEqual({'calls': 1, 'total': 2.0, 'own': 2.0}, timings['AddressFactory.location.lines.0'])
+        self.assertEqual({'calls': 1, 'total': 2.0, 'own': 0.0}, timings['AddressFactory.location.lines'])
+        self.assertEqual({'calls': 1, 'total': 3.0, 'own': 0.0}, timings['AddressFactory.location'])
+
+    def test_report(self):
+        _ChildFactory, ParentFactory = self.make_factories()
+
+        with factory.profile() as prof:
+            ParentFactory.build()
+
+        lines = prof.report(limit=2).splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual(['declaration', 'calls', 'total', '(s)', 'own', '(s)'], lines[0].split())
+        self.assertEqual(['ParentFactory.hook', '1', '5.000000', '5.000000'], lines[1].split())
+        self.assertEqual(['ParentFactory.derived', '1', '4.000000', '3.000000'], lines[2].split())
+
+        self.assertEqual('ParentFactory.derived', prof.sorted('total')[1].label)
+
+    def test_disabled(self):
+        _ChildFactory, ParentFactory = self.make_factories()
+
+        with factory.profile() as prof:
+            self.assertEqual(1, len(builder._evaluation_hooks))
+            with factory.profile():
+                self.assertEqual(1, len(builder._evaluation_hooks))
+        ParentFactory.build()
+
+        self.assertEqual({}, prof.timings)
+        self.assertEqual((), builder._evaluation_hooks)
+
+    def test_threads(self):
+        _ChildFactory, ParentFactory = self.make_factories()
+        first_entered, second_entered, first_exited = threading.Event(), threading.Event(), threading.Event()
+        profiles = {}
+
+        def first():
+            with factory.profile() as prof:
+                first_entered.set()
+                second_entered.wait()
+                ParentFactory.build()
+            profiles['first'] = prof
+            first_exited.set()
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        first_entered.wait()
+        with factory.profile() as prof:
+            second_entered.set()
+            first_exited.wait()
+            # The block entered first exited first: the hooks are still installed.
+            ParentFactory.build_batch(2)
+        thread.join()
+
+        # Each block only timed its own thread.
+        self.assertEqual(1, profiles['first'].as_dict()['ParentFactory.base']['calls'])
+        self.assertEqual(2, prof.as_dict()['ParentFactory.base']['calls'])
+        self.assertEqual((), builder._evaluation_hooks)
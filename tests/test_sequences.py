@@ -0,0 +1,198 @@
+# Copyright: See the LICENSE file.
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import factory
+from factory import sequences
+
+
+class TestObject:
+    def __init__(self, one):
+        self.one = one
+
+
+shared_memory_backend = sequences.SharedMemorySequence()
+
+
+class SharedMemoryObjectFactory(factory.Factory):
+    class Meta:
+        model = TestObject
+        sequence_backend = shared_memory_backend
+
+    one = factory.Sequence(lambda n: n)
+
+
+class StripedObjectFactory(factory.Factory):
+    class Meta:
+        model = TestObject
+        sequence_backend = sequences.StripedSequence(worker_id=1, workers=2)
+
+    one = factory.Sequence(lambda n: n)
+
+
+# Factories used by forked worker processes, by name.
+_worker_factories = {'shared_memory': SharedMemoryObjectFactory}
+
+
+def _build_values(name, size):
+    factory_class = _worker_factories[name]
+    return [obj.one for obj in factory_class.build_batch(size)] + [factory_class().one]
+
+
+def _get_fork_context():
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:  # pragma: no cover
+        raise unittest.SkipTest("The fork start method is unavailable.")
+
+
+class SharedMemorySequenceTestCase(unittest.TestCase):
+    def test_sequence(self):
+        start = SharedMemoryObjectFactory().one
+        self.assertEqual([start + 1, start + 2, start + 3], [o.one for o in SharedMemoryObjectFactory.build_batch(3)])
+        SharedMemoryObjectFactory.reset_sequence(start + 10)
+        self.assertEqual(start + 10, SharedMemoryObjectFactory().one)
+        # The shared counter is never rewound.
+        SharedMemoryObjectFactory.reset_sequence()
+        self.assertEqual(start + 11, SharedMemoryObjectFactory().one)
+
+    def test_processes(self):
+        start = SharedMemoryObjectFactory().one + 1
+        with _get_fork_context().Pool(3) as pool:
+            results = pool.starmap(_build_values, [('shared_memory', 5)] * 6)
+
+        values = sorted(value for result in results for value in result)
+        self.assertEqual(list(range(start, start + 36)), values)
+        self.assertEqual(start + 36, SharedMemoryObjectFactory().one)
+
+    def test_start(self):
+        backend = sequences.SharedMemorySequence()
+
+        class AFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                sequence_backend = backend
+
+            one = factory.Sequence(lambda n: n)
+
+            @classmethod
+            def _setup_next_sequence(cls):
+                return 42
+
+        class BFactory(AFactory):
+            class Meta:
+                model = dict
+                sequence_backend = backend
+
+            @classmethod
+            def _setup_next_sequence(cls):
+                return 7
+
+        # Both factories draw from the same counter, starting after the highest value.
+        self.assertEqual(42, AFactory().one)
+        self.assertEqual(43, BFactory()['one'])
+
+
+class FileLockSequenceTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'sequence')
+
+        class FileObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                sequence_backend = sequences.FileLockSequence(self.path)
+
+            one = factory.Sequence(lambda n: n)
+
+        self.FileObjectFactory = FileObjectFactory
+
+    def test_sequence(self):
+        self.assertEqual(0, self.FileObjectFactory().one)
+        self.assertEqual([1, 2, 3], [o.one for o in self.FileObjectFactory.build_batch(3)])
+        with open(self.path) as f:
+            self.assertEqual('4', f.read())
+
+        self.FileObjectFactory.reset_sequence(10)
+        self.assertEqual(10, self.FileObjectFactory().one)
+        # The shared counter is never rewound.
+        self.FileObjectFactory.reset_sequence(2)
+        self.assertEqual(11, self.FileObjectFactory().one)
+
+    def test_shared(self):
+        """Unrelated backends on the same file share their counter."""
+        self.assertEqual(0, self.FileObjectFactory().one)
+
+        class OtherFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                sequence_backend = sequences.FileLockSequence(self.path)
+
+            one = factory.Sequence(lambda n: n)
+
+        self.assertEqual(1, OtherFactory().one)
+        self.assertEqual(2, self.FileObjectFactory().one)
+
+    def test_processes(self):
+        _worker_factories['file_lock'] = self.FileObjectFactory
+        self.addCleanup(_worker_factories.pop, 'file_lock')
+        with _get_fork_context().Pool(3) as pool:
+            results = pool.starmap(_build_values, [('file_lock', 5)] * 6)
+
+        values = sorted(value for result in results for value in result)
+        self.assertEqual(list(range(36)), values)
+
+
+class StripedSequenceTestCase(unittest.TestCase):
+    def make_factory(self, backend):
+        class ObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+                sequence_backend = backend
+
+            one = factory.Sequence(lambda n: n)
+
+            @classmethod
+            def _setup_next_sequence(cls):
+                return 100
+
+        return ObjectFactory
+
+    def test_sequence(self):
+        ObjectFactory = self.make_factory(sequences.StripedSequence(worker_id=1, workers=3))
+        self.assertEqual(101, ObjectFactory().one)
+        self.assertEqual([104, 107, 110], [o.one for o in ObjectFactory.build_batch(3)])
+        self.assertEqual(113, ObjectFactory().one)
+
+        ObjectFactory.reset_sequence(0)
+        self.assertEqual(1, ObjectFactory().one)
+
+    def test_xdist_worker(self):
+        ObjectFactory = self.make_factory(sequences.StripedSequence())
+        env = {'PYTEST_XDIST_WORKER': 'gw2', 'PYTEST_XDIST_WORKER_COUNT': '4'}
+        with mock.patch.dict(os.environ, env):
+            self.assertEqual([102, 106], [o.one for o in ObjectFactory.build_batch(2)])
+
+    def test_no_worker(self):
+        ObjectFactory = self.make_factory(sequences.StripedSequence())
+        with mock.patch.dict(os.environ):
+            os.environ.pop('PYTEST_XDIST_WORKER', None)
+            os.environ.pop('PYTEST_XDIST_WORKER_COUNT', None)
+            self.assertEqual([100, 101], [o.one for o in ObjectFactory.build_batch(2)])
+
+    def test_invalid_worker(self):
+        ObjectFactory = self.make_factory(sequences.StripedSequence(worker_id=3, workers=3))
+        with self.assertRaises(ValueError):
+            ObjectFactory()
+
+    def test_parallel_batch(self):
+        StripedObjectFactory.reset_sequence()
+        with mock.patch.object(factory.base, 'PARALLEL_CHUNK_SIZE', 2):
+            objs = StripedObjectFactory.build_batch_parallel(5, 2)
+        self.assertEqual([1, 3, 5, 7, 9], [o.one for o in objs])
+        self.assertEqual(11, StripedObjectFactory().one)
@@ -29,3 +29,8 @@ class TypingTests(unittest.TestCase):
         result = UserFactory.build()
         result = UserFactory.create()
         self.assertEqual(result.name, "John Doe")
+
+    def test_lazy_attributes(self) -> None:
+        # Loaded on first access, but visible to type checkers.
+        name: factory.Faker = factory.Faker('name')
+        self.assertIsInstance(name, factory.faker.Faker)
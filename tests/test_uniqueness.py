@@ -0,0 +1,100 @@
+# Copyright: See the LICENSE file.
+
+import multiprocessing
+import unittest
+
+import factory
+from factory import errors, fuzzy, random, uniqueness
+
+
+class TestObject:
+    def __init__(self, one):
+        self.one = one
+
+
+shared_filter = uniqueness.SharedBloomFilter(capacity=10000)
+
+
+class SharedUniqueFactory(factory.Factory):
+    class Meta:
+        model = TestObject
+
+    one = fuzzy.FuzzyInteger(0, 999, unique=shared_filter)
+
+
+def _build_values(seed, size):
+    random.reseed_random(seed)
+    return [obj.one for obj in SharedUniqueFactory.build_batch(size)]
+
+
+def _get_fork_context():
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:  # pragma: no cover
+        raise unittest.SkipTest("The fork start method is unavailable.")
+
+
+class BloomFilterTestCase(unittest.TestCase):
+    def test_exact(self):
+        unique = uniqueness.BloomFilter()
+        self.assertTrue(unique.add(1))
+        self.assertTrue(unique.add('1'))
+        self.assertFalse(unique.add(1))
+        self.assertEqual(2, len(unique))
+
+    def test_bloom(self):
+        unique = uniqueness.BloomFilter(capacity=100, error_rate=0.01, exact_limit=10)
+        added = [unique.add(i) for i in range(1000)]
+        # Values were moved to bloom filters, which grew beyond their capacity.
+        self.assertIsNone(unique._exact)
+        self.assertGreater(len(unique._slices), 1)
+        self.assertEqual(len(unique), sum(added))
+        self.assertGreater(sum(added), 980)
+        self.assertFalse(any(unique.add(i) for i in range(1000)))
+
+    def test_unhashable(self):
+        unique = uniqueness.BloomFilter()
+        self.assertTrue(unique.add(1))
+        self.assertTrue(unique.add([1]))
+        self.assertFalse(unique.add([1]))
+        self.assertFalse(unique.add(1))
+
+    def test_clear(self):
+        unique = uniqueness.BloomFilter()
+        self.assertEqual(1, unique.generate(lambda: 1))
+        unique.clear()
+        self.assertEqual({'values': 0, 'attempts': 0, 'collisions': 0, 'collision_rate': 0.0}, unique.stats())
+        self.assertEqual(1, unique.generate(lambda: 1))
+
+    def test_exhausted(self):
+        unique = uniqueness.BloomFilter(max_attempts=5)
+        unique.generate(lambda: 1)
+        with self.assertRaises(errors.UniqueValueError):
+            unique.generate(lambda: 1)
+        self.assertEqual(5, unique.collisions)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            uniqueness.BloomFilter(error_rate=1)
+        with self.assertRaises(TypeError):
+            fuzzy.FuzzyInteger(10, unique='yes')
+
+
+class SharedBloomFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        shared_filter.clear()
+
+    def test_filter(self):
+        unique = uniqueness.SharedBloomFilter(capacity=10)
+        self.assertTrue(unique.add('a'))
+        self.assertFalse(unique.add('a'))
+        self.assertEqual(1, len(unique))
+
+    def test_processes(self):
+        with _get_fork_context().Pool(4) as pool:
+            results = pool.starmap(_build_values, [(seed, 25) for seed in range(4)])
+
+        values = {value for result in results for value in result}
+        self.assertEqual(100, len(values))
+        self.assertEqual(100, len(shared_filter))
+        self.assertNotIn(SharedUniqueFactory().one, values)
@@ -3,14 +3,17 @@
 """Tests using factory."""
 
 
+import asyncio
 import collections
 import datetime
+import itertools
 import os
 import sys
 import unittest
+from unittest import mock
 
 import factory
-from factory import errors
+from factory import errors, fuzzy
 
 from . import utils
 
@@ -654,6 +657,182 @@ class UsingFactoryTestCase(unittest.TestCase):
             self.assertEqual(i, obj.two)
             self.assertTrue(obj.id)
 
+    def test_create_batch_parses_declarations_once(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            one = 'one'
+            two = factory.LazyAttribute(lambda o: o.one * 2)
+
+        with mock.patch.object(
+            factory.builder, '_route_declarations', wraps=factory.builder._route_declarations,
+        ) as route:
+            objs = TestModelFactory.create_batch(10, one='x')
+
+        self.assertEqual(1, route.call_count)
+        self.assertEqual(['xx'] * 10, [obj.two for obj in objs])
+
+    def test_declaration_plan_cache(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 'one'
+            two = factory.LazyAttribute(lambda o: o.one * 2)
+
+        with mock.patch.object(
+            factory.builder, '_route_declarations', wraps=factory.builder._route_declarations,
+        ) as route:
+            self.assertEqual('xx', TestObjectFactory(one='x').two)
+            self.assertEqual('yy', TestObjectFactory(one='y').two)
+            self.assertEqual(1, route.call_count)
+
+            self.assertEqual('oneone', TestObjectFactory().two)
+            self.assertEqual('z', TestObjectFactory(one='y', two='z').two)
+            self.assertEqual(3, route.call_count)
+
+        # Cached plans never alter the factory declarations.
+        self.assertEqual(
+            {'one': 'one', 'two': TestObjectFactory._meta.pre_declarations['two'].declaration},
+            TestObjectFactory._meta.pre_declarations.as_dict(),
+        )
+
+    def test_declaration_plan_cache_phase(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 'one'
+
+        obj = TestObjectFactory.build(two=2)
+        self.assertEqual(2, obj.two)
+
+        # Same name, but now a post-generation declaration: new plan.
+        obj = TestObjectFactory.build(two=factory.PostGeneration(lambda o, create, extracted: 3))
+        self.assertIsNone(obj.two)
+
+    def test_batch_transformer_override(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Transformer('a', transform=str.upper)
+
+        objs = TestObjectFactory.build_batch(3, one='b')
+        self.assertEqual(['B', 'B', 'B'], [obj.one for obj in objs])
+
+    def test_batch_overridden_create(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            one = 'one'
+
+            @classmethod
+            def create(cls, **kwargs):
+                obj = super().create(**kwargs)
+                obj.two = 'custom'
+                return obj
+
+        objs = TestModelFactory.create_batch(3)
+        self.assertEqual(['custom'] * 3, [obj.two for obj in objs])
+
+    def test_batch_overridden_build_and_stub(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            @classmethod
+            def build(cls, **kwargs):
+                return super().build(one='built', **kwargs)
+
+            @classmethod
+            def stub(cls, **kwargs):
+                return super().stub(one='stubbed', **kwargs)
+
+        self.assertEqual(['built'] * 2, [obj.one for obj in TestObjectFactory.build_batch(2)])
+        self.assertEqual(['stubbed'] * 2, [obj.one for obj in TestObjectFactory.stub_batch(2)])
+
+    def test_batch_postgeneration(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Sequence(int)
+
+            @factory.post_generation
+            def two(obj, create, extracted, **kwargs):
+                obj.two = (obj.one, create, extracted)
+
+        objs = TestObjectFactory.create_batch(3, two='x')
+        self.assertEqual(
+            [(0, True, 'x'), (1, True, 'x'), (2, True, 'x')],
+            [obj.two for obj in objs],
+        )
+
+    def test_iter_build(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Sequence(int)
+
+        objs = TestObjectFactory.iter_build(3, two='two')
+        # Nothing is generated until the iterator is consumed.
+        self.assertEqual(0, TestObjectFactory.build().one)
+
+        self.assertEqual([(1, 'two'), (2, 'two'), (3, 'two')], [(obj.one, obj.two) for obj in objs])
+        self.assertEqual(4, TestObjectFactory.build().one)
+
+    def test_iter_build_endless(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Sequence(int)
+
+        objs = TestObjectFactory.iter_build()
+        self.assertEqual(list(range(100)), [obj.one for obj in itertools.islice(objs, 100)])
+
+    def test_iter_create(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+            one = 'one'
+
+            @factory.post_generation
+            def two(obj, create, extracted, **kwargs):
+                obj.two = create
+
+        objs = list(TestModelFactory.iter_create(3))
+        self.assertEqual(3, len(objs))
+        for obj in objs:
+            self.assertEqual('one', obj.one)
+            self.assertTrue(obj.two)
+            self.assertTrue(obj.id)
+
+    def test_iter_stub(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = 'one'
+
+        objs = list(TestObjectFactory.iter_stub(2, two='two'))
+        self.assertEqual(2, len(objs))
+        for obj in objs:
+            self.assertIsInstance(obj, factory.base.StubObject)
+            self.assertEqual(('one', 'two'), (obj.one, obj.two))
+
+    def test_iter_build_abstract(self):
+        class TestObjectFactory(factory.Factory):
+            pass
+
+        with self.assertRaises(errors.FactoryError):
+            TestObjectFactory.iter_build(2)
+
     def test_generate_build(self):
         class TestModelFactory(FakeModelFactory):
             class Meta:
@@ -1303,6 +1482,42 @@ class TraitTestCase(unittest.TestCase):
             dict(one=True, two=True, three=True, four=None, five=True),
         )
 
+    def test_traits_resolved_statically(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            class Params:
+                even = factory.Trait(two=True, four=factory.LazyAttribute(lambda o: o.two))
+                odd = factory.Trait(one=True, three=True)
+
+            one = 1
+            two = 2
+
+        plan = TestObjectFactory._meta.get_declaration_plan({'even': True, 'odd': False})
+        pre, _post = plan.apply({'even': True, 'odd': False})
+        self.assertIs(True, pre['two'].declaration)
+        self.assertEqual(1, pre['one'].declaration)
+        self.assertIs(factory.declarations.SKIP, pre['three'].declaration)
+
+        # Variants are cached for each combination of trait states.
+        self.assertIs(plan, TestObjectFactory._meta.get_declaration_plan({'even': 1, 'odd': None}))
+        self.assertIsNot(plan, TestObjectFactory._meta.get_declaration_plan({'even': False, 'odd': False}))
+
+        self.assertEqual(
+            dict(one=1, two=True, three=None, four=True, five=None),
+            TestObjectFactory(even=True, odd=False).as_dict(),
+        )
+        self.assertEqual(
+            dict(one=True, two=2, three=True, four=None, five=None),
+            TestObjectFactory(even=False, odd=True).as_dict(),
+        )
+        # A lazy flag is still evaluated at build time.
+        self.assertEqual(
+            dict(one=1, two=True, three=None, four=True, five=None),
+            TestObjectFactory(even=factory.LazyFunction(lambda: True)).as_dict(),
+        )
+
     def test_post_generation_traits(self):
         @factory.post_generation
         def compute(obj, _create, _value, power=2, **kwargs):
@@ -1445,6 +1660,81 @@ class TraitTestCase(unittest.TestCase):
                     a = factory.Trait(b=True, one=True)
                     b = factory.Trait(a=True, two=True)
 
+    def test_prevent_cyclic_declarations(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.SelfAttribute('two')
+            two = factory.Maybe('three', factory.SelfAttribute('one'), 2)
+            three = factory.SelfAttribute('one.foo')
+
+        with self.assertRaisesRegex(errors.CyclicDefinitionError, 'one -> two -> three -> one'):
+            TestObjectFactory()
+        # Overriding any declaration of the cycle breaks it.
+        self.assertEqual(2, TestObjectFactory(three=False).one)
+        self.assertEqual(2, TestObjectFactory(one=1, three=False).two)
+
+    def test_cyclic_declarations_overridden(self):
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.SelfAttribute('two')
+            two = factory.SelfAttribute('one')
+
+        self.assertEqual((1, 1), (TestObjectFactory(one=1).one, TestObjectFactory(one=1).two))
+        self.assertEqual(2, TestObjectFactory(two=2).one)
+        with self.assertRaises(errors.CyclicDefinitionError):
+            TestObjectFactory.build_batch(2)
+
+    def test_cyclic_declarations_in_maybe_branches(self):
+        # Only deciders are always evaluated; branches may read each other.
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Maybe('five', factory.SelfAttribute('two'), 1)
+            two = factory.Maybe('five', 2, factory.SelfAttribute('one'))
+
+            class Params:
+                five = False
+
+        self.assertEqual(1, TestObjectFactory().two)
+        self.assertEqual(2, TestObjectFactory(five=True).one)
+
+    def test_evaluation_order(self):
+        calls = []
+
+        def record(name, value):
+            def fun(obj):
+                result = value(obj)
+                calls.append(name)
+                return result
+            return factory.LazyAttribute(fun)
+
+        class TestObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = record('one', lambda o: o.three + 1)
+            two = record('two', lambda o: o.one + 1)
+            three = record('three', lambda o: 1)
+
+        for _i in range(2):
+            del calls[:]
+            obj = TestObjectFactory.build()
+            self.assertEqual((2, 3, 1), (obj.one, obj.two, obj.three))
+            self.assertEqual(['three', 'one', 'two'], calls)
+
+        # Dependencies may differ from the recorded order.
+        obj = TestObjectFactory.build(one=5)
+        self.assertEqual((5, 6, 1), (obj.one, obj.two, obj.three))
+        obj = TestObjectFactory.build(one=factory.LazyAttribute(lambda o: o.three + 3))
+        self.assertEqual((4, 5, 1), (obj.one, obj.two, obj.three))
+        with self.assertRaises(errors.CyclicDefinitionError):
+            TestObjectFactory.build(one=factory.SelfAttribute('two'))
+
     def test_deep_traits(self):
         class TestObjectFactory(factory.Factory):
             class Meta:
@@ -1775,6 +2065,34 @@ class SubFactoryTestCase(unittest.TestCase):
         self.assertEqual(5, mtree_2.id)
         self.assertEqual('tree', mtree_2.label)
 
+    def test_deep_nested_self_attribute(self):
+        class LeafFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+            one = factory.SelfAttribute('...one')
+            two = factory.SelfAttribute('..two')
+            three = factory.ContainerAttribute(lambda obj, containers: len(containers))
+
+        class BranchFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+            two = 2
+            three = factory.SubFactory(LeafFactory)
+
+        class TreeFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+            one = 1
+            two = factory.SubFactory(BranchFactory)
+
+        tree = TreeFactory()
+        self.assertEqual(1, tree.two.three.one)
+        self.assertEqual(2, tree.two.three.two)
+        self.assertEqual(2, tree.two.three.three)
+
+        with self.assertRaises(IndexError):
+            BranchFactory()
+
     def test_sub_factory_and_inheritance(self):
         """Test inheriting from a factory with subfactories, overriding."""
         class TestObject:
@@ -2781,6 +3099,437 @@ class RepeatableRandomSeedFakerTests(unittest.TestCase):
         self.assertEqual(students_1[0].four, students_2[0].four)
 
 
+class LocalRandomTestCase(unittest.TestCase):
+    class RandomFactory(factory.Factory):
+        class Meta:
+            model = TestObject
+
+        one = fuzzy.FuzzyInteger(10 ** 6)
+        two = factory.Faker('name')
+        three = factory.Faker('name', locale='fr_FR')
+
+    def generate(self, key):
+        with factory.random.local_random(42, key=key):
+            return [(obj.one, obj.two, obj.three) for obj in self.RandomFactory.build_batch(5)]
+
+    def test_threads(self):
+        import concurrent.futures
+
+        state = factory.random.get_random_state()
+        serial = [self.generate(key) for key in range(4)]
+        self.assertEqual(state, factory.random.get_random_state())
+        self.assertNotEqual(serial[0], serial[1])
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = list(executor.map(self.generate, reversed(range(4))))
+        self.assertEqual(serial, threaded[::-1])
+
+    def test_nested(self):
+        with factory.random.local_random(1, key='outer') as outer:
+            self.assertIs(outer.randgen, factory.random.get_randgen())
+            with factory.random.local_random(1, key='inner') as inner:
+                self.assertIs(inner.randgen, factory.random.get_randgen())
+            self.assertIs(outer.randgen, factory.random.get_randgen())
+        self.assertIs(factory.random.randgen, factory.random.get_randgen())
+
+
+class KeyedRandomTestCase(unittest.TestCase):
+    class RandomFactory(factory.Factory):
+        class Meta:
+            model = TestObject
+
+        one = fuzzy.FuzzyInteger(10 ** 6)
+        two = factory.Faker('name')
+        three = factory.Iterator(['a', 'b', 'c'])
+        four = fuzzy.FuzzyInteger(10 ** 6)
+
+    def setUp(self):
+        self.RandomFactory.reset_sequence()
+
+    def generate(self, start, size, seed=42):
+        self.RandomFactory.reset_sequence(start)
+        with factory.random.keyed_random(seed):
+            return [obj.as_dict() for obj in self.RandomFactory.build_batch(size)]
+
+    def test_slices(self):
+        serial = self.generate(0, 10)
+        self.assertEqual(serial[6:], self.generate(6, 4))
+        self.assertEqual(serial[:3], self.generate(0, 3))
+        self.assertEqual(['a', 'b', 'c', 'a'], [obj['three'] for obj in serial[:4]])
+        self.assertNotEqual(serial, self.generate(0, 10, seed=43))
+
+    def test_fields(self):
+        obj, = self.generate(0, 1)
+        # Fields draw from distinct streams.
+        self.assertNotEqual(obj['one'], obj['four'])
+        # Values don't depend on the random values generated before.
+        factory.random.reseed_random(1)
+        fuzzy.FuzzyInteger(10).fuzz()
+        self.assertEqual([obj], self.generate(0, 1))
+
+    def test_nested_fields(self):
+        class Context(factory.declarations.BaseDeclaration):
+            def evaluate(self, instance, step, extra):
+                return extra['value']
+
+        class NestedFactory(factory.DictFactory):
+            one = Context(value=fuzzy.FuzzyInteger(10 ** 9))
+            two = Context(value=fuzzy.FuzzyInteger(10 ** 9))
+
+        with factory.random.keyed_random(42):
+            obj = NestedFactory()
+        # Nested fields draw from the stream of their full path.
+        self.assertNotEqual(obj['one'], obj['two'])
+
+    def test_counter_random(self):
+        randgen = factory.random.CounterRandom(b'key')
+        values = [randgen.getrandbits(k) for k in (0, 7, 64, 600)]
+        self.assertEqual(0, values[0])
+        self.assertTrue(all(0 <= value < 2 ** k for value, k in zip(values, (0, 7, 64, 600))))
+        randgen = factory.random.CounterRandom(b'key')
+        self.assertEqual(values, [randgen.getrandbits(k) for k in (0, 7, 64, 600)])
+        state = randgen.getstate()
+        value = randgen.random()
+        randgen.setstate(state)
+        self.assertEqual(value, randgen.random())
+
+
+class ParallelObjectFactory(factory.Factory):
+    class Meta:
+        model = TestObject
+
+    one = factory.Sequence(int)
+    two = fuzzy.FuzzyInteger(10 ** 6)
+    three = factory.Faker('name')
+
+
+class ParallelCreateFactory(ParallelObjectFactory):
+    four = factory.Dict({'one': factory.SelfAttribute('..one'), 'two': fuzzy.FuzzyInteger(10 ** 6)})
+    five = factory.List([factory.Maybe(factory.SelfAttribute('..extra'), 1, factory.declarations.SKIP)])
+    created = factory.PostGeneration(lambda obj, create, extracted, **kwargs: setattr(obj, 'created', extracted))
+
+    class Params:
+        extra = False
+        flag = factory.Trait(three='flagged')
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        obj = model_class(*args, **kwargs)
+        obj.pid = os.getpid()
+        return obj
+
+
+class ParallelBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        ParallelObjectFactory.reset_sequence()
+
+    def generate(self, workers):
+        factory.random.reseed_random(42)
+        ParallelObjectFactory.reset_sequence()
+        with mock.patch.object(factory.base, 'PARALLEL_CHUNK_SIZE', 3):
+            batch = ParallelObjectFactory.build_batch_parallel(10, workers)
+        return [vars(obj) for obj in batch]
+
+    def test_in_process(self):
+        objs = self.generate(workers=1)
+        self.assertEqual(list(range(10)), [obj['one'] for obj in objs])
+        self.assertEqual(objs, self.generate(workers=1))
+        self.assertEqual(10, ParallelObjectFactory.build().one)
+
+    def test_workers(self):
+        serial = self.generate(workers=1)
+        self.assertEqual(serial, self.generate(workers=2))
+        # Sequences used by the workers are reserved.
+        self.assertEqual(10, ParallelObjectFactory.build().one)
+
+    def test_stub(self):
+        class ParallelStubFactory(factory.StubFactory):
+            one = 1
+
+        objs = ParallelStubFactory.build_batch_parallel(2, 1, two=2)
+        self.assertEqual([{'one': 1, 'two': 2}] * 2, [vars(obj) for obj in objs])
+
+    def test_matches_serial_keyed_run(self):
+        with factory.random.keyed_random(1):
+            serial = [vars(obj) for obj in ParallelObjectFactory.build_batch(10)]
+            self.assertEqual(serial, self.generate(workers=2))
+            self.assertEqual(serial, self.generate(workers=3))
+
+    def test_model_field_named_workers(self):
+        objs = factory.DictFactory.build_batch_parallel(2, 1, workers=7)
+        self.assertEqual([{'workers': 7}, {'workers': 7}], objs)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            ParallelObjectFactory.build_batch_parallel(2, 0)
+
+    def test_dict_and_list(self):
+        with factory.random.keyed_random(1):
+            serial = [vars(obj) for obj in ParallelCreateFactory.build_batch(4, flag=True, extra=True)]
+            ParallelObjectFactory.reset_sequence()
+            batch = ParallelCreateFactory.build_batch_parallel(4, 2, flag=True, extra=True)
+        self.assertEqual(serial, [vars(obj) for obj in batch])
+        self.assertEqual({'one': 3, 'two': batch[3].four['two']}, batch[3].four)
+        self.assertEqual(['flagged', [1]], [batch[0].three, batch[0].five])
+
+    def test_create(self):
+        with factory.random.keyed_random(1):
+            serial = [vars(obj) for obj in ParallelCreateFactory.create_batch(4, created=7)]
+            ParallelObjectFactory.reset_sequence()
+            with mock.patch.object(factory.base, 'PARALLEL_CHUNK_SIZE', 3):
+                batch = ParallelCreateFactory.create_batch_parallel(4, 2, created=7)
+        self.assertEqual(serial, [vars(obj) for obj in batch])
+        # Objects are created, and post-generation declarations run, in
+        # the calling process.
+        self.assertEqual([os.getpid()] * 4, [obj.pid for obj in batch])
+        self.assertEqual([7] * 4, [obj.created for obj in batch])
+        self.assertEqual([[]] * 4, [obj.five for obj in batch])
+        self.assertEqual(4, ParallelCreateFactory.build().one)
+
+    def test_create_stub(self):
+        with self.assertRaises(errors.UnsupportedStrategy):
+            factory.StubFactory.create_batch_parallel(2, 1)
+
+    def test_sub_factories(self):
+        class ParentFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.SubFactory(ParallelObjectFactory)
+
+        with self.assertRaisesRegex(errors.FactoryError, 'sub-factories'):
+            ParentFactory.build_batch_parallel(2, 1)
+        # Regular batches are unaffected.
+        self.assertEqual(2, len(ParentFactory.build_batch(2)))
+
+
+class AsyncObjectFactory(factory.Factory):
+    """Persist objects asynchronously, recording the order of operations."""
+
+    class Meta:
+        model = Dummy
+
+    @classmethod
+    async def _acreate(cls, model_class, *args, **kwargs):
+        log = kwargs['log']
+        log.append(('start', kwargs.get('name')))
+        await asyncio.sleep(0)
+        log.append(('end', kwargs.get('name')))
+        return model_class(*args, created=True, **kwargs)
+
+
+class AsyncFactoryTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        AsyncObjectFactory.reset_sequence()
+
+    async def test_acreate(self):
+        class ObjectFactory(AsyncObjectFactory):
+            log = factory.LazyFunction(list)
+            name = factory.Sequence(lambda n: 'obj%d' % n)
+
+        obj = await ObjectFactory.acreate()
+        self.assertTrue(obj.created)
+        self.assertEqual('obj0', obj.name)
+
+        obj = await ObjectFactory.acreate(name='custom')
+        self.assertEqual('custom', obj.name)
+
+    async def test_acreate_batch(self):
+        log = []
+
+        class ObjectFactory(AsyncObjectFactory):
+            name = factory.Sequence(lambda n: 'obj%d' % n)
+
+        objs = await ObjectFactory.acreate_batch(3, log=log)
+        self.assertEqual(['obj0', 'obj1', 'obj2'], [obj.name for obj in objs])
+        # Instances are persisted concurrently.
+        self.assertEqual(
+            [('start', 'obj0'), ('start', 'obj1'), ('start', 'obj2')],
+            log[:3],
+        )
+
+    async def test_subfactories(self):
+        log = []
+
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+
+        class ParentFactory(AsyncObjectFactory):
+            name = 'parent'
+            first = factory.SubFactory(ChildFactory, name='first')
+            second = factory.SubFactory(ChildFactory, name=factory.LazyAttribute(lambda o: o.factory_parent.name + '2'))
+
+        parent = await ParentFactory.acreate(log=log)
+        self.assertEqual('first', parent.first.name)
+        self.assertTrue(parent.first.created)
+        self.assertEqual('parent2', parent.second.name)
+        # Independent sub-factories are created concurrently, before their parent.
+        self.assertEqual(
+            [
+                ('start', 'first'), ('start', 'parent2'),
+                ('end', 'first'), ('end', 'parent2'),
+                ('start', 'parent'), ('end', 'parent'),
+            ],
+            log,
+        )
+
+    async def test_dependent_subfactory(self):
+        log = []
+
+        class AFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+            name = 'a'
+
+            @classmethod
+            def _create(cls, model_class, *args, **kwargs):
+                raise AssertionError("%s must be created asynchronously." % cls.__name__)
+
+        class BFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+            name = 'b'
+
+        class ParentFactory(AsyncObjectFactory):
+            name = 'parent'
+            a = factory.SubFactory(AFactory)
+            b = factory.SubFactory(BFactory, a=factory.SelfAttribute('..a'))
+
+        parent = await ParentFactory.acreate(log=log)
+        self.assertIs(parent.a, parent.b.a)
+        self.assertEqual(1, log.count(('start', 'a')))
+        # The dependent sub-factory waits for the one it depends on.
+        self.assertLess(log.index(('end', 'a')), log.index(('start', 'b')))
+
+    async def test_cyclic_subfactories(self):
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+
+        class ParentFactory(AsyncObjectFactory):
+            a = factory.SubFactory(ChildFactory, x=factory.SelfAttribute('..b'))
+            b = factory.SubFactory(ChildFactory, y=factory.SelfAttribute('..a'))
+
+        with self.assertRaises(factory.errors.CyclicDefinitionError):
+            ParentFactory.create(log=[])
+        with self.assertRaises(factory.errors.CyclicDefinitionError):
+            await asyncio.wait_for(ParentFactory.acreate(log=[]), timeout=5)
+
+    async def test_sync_read_of_async_field(self):
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+
+        class ReaderFactory(ChildFactory):
+            other = factory.LazyAttribute(lambda o: o.factory_parent.first)
+
+        class ParentFactory(AsyncObjectFactory):
+            first = factory.SubFactory(ChildFactory)
+            second = factory.SubFactory(ReaderFactory)
+
+        # Reading it synchronously would create it a second time.
+        with self.assertRaisesRegex(factory.errors.FactoryError, 'asynchronously'):
+            await ParentFactory.acreate(log=[])
+
+    async def test_maybe_subfactory(self):
+        log = []
+
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.SelfAttribute('..log')
+            name = 'child'
+
+        class ParentFactory(AsyncObjectFactory):
+            class Params:
+                with_child = factory.Trait(child=factory.SubFactory(ChildFactory))
+
+            name = 'parent'
+            child = None
+
+        parent = await ParentFactory.acreate(log=log)
+        self.assertIsNone(parent.child)
+
+        parent = await ParentFactory.acreate(log=log, with_child=True)
+        self.assertTrue(parent.child.created)
+
+    async def test_related_factories(self):
+        log = []
+
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.LazyAttribute(lambda o: o.parent.log)
+            name = factory.Sequence(lambda n: 'child%d' % n)
+
+        class ParentFactory(AsyncObjectFactory):
+            name = 'parent'
+            children = factory.RelatedFactoryList(ChildFactory, 'parent', size=2)
+            extra = factory.RelatedFactory(ChildFactory, 'parent', name='extra')
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                instance.children = results['children']
+                instance.extra = results['extra']
+
+        parent = await ParentFactory.acreate(log=log)
+        self.assertEqual([('start', 'parent'), ('end', 'parent')], log[:2])
+        # Related factories are created concurrently, once their parent exists.
+        self.assertEqual(['start'] * 3 + ['end'] * 3, [event for event, _name in log[2:]])
+        self.assertEqual('extra', parent.extra.name)
+        self.assertEqual(2, len(parent.children))
+        self.assertIs(parent, parent.children[0].parent)
+
+    async def test_postgeneration_results(self):
+        class ChildFactory(AsyncObjectFactory):
+            log = factory.LazyFunction(list)
+
+        class ParentFactory(AsyncObjectFactory):
+            log = factory.LazyFunction(list)
+            child = factory.RelatedFactory(ChildFactory, 'parent', name='child')
+
+            @factory.post_generation
+            async def tags(obj, create, extracted, **kwargs):
+                return extracted or ['default']
+
+            @classmethod
+            def _after_postgeneration(cls, instance, create, results=None):
+                instance.create = create
+                instance.results = results
+
+        parent = await ParentFactory.acreate(tags=['custom'])
+        self.assertTrue(parent.create)
+        self.assertEqual(['child', 'tags'], list(parent.results))
+        self.assertEqual('child', parent.results['child'].name)
+        self.assertEqual(['custom'], parent.results['tags'])
+
+    async def test_default_acreate(self):
+        class TestModelFactory(FakeModelFactory):
+            class Meta:
+                model = TestModel
+
+        class ObjectFactory(factory.Factory):
+            class Meta:
+                model = TestObject
+
+            one = factory.Sequence(lambda n: n)
+            two = factory.SubFactory(TestModelFactory)
+
+        obj = await ObjectFactory.acreate()
+        self.assertEqual(0, obj.one)
+        # FakeModelFactory._create() has been called.
+        self.assertEqual(1, obj.two.id)
+
+    async def test_abstract(self):
+        class AbstractFactory(factory.Factory):
+            pass
+
+        with self.assertRaises(errors.FactoryError):
+            await AbstractFactory.acreate()
+
+    async def test_stub_factory(self):
+        class StubFactory(factory.StubFactory):
+            one = 1
+
+        with self.assertRaises(errors.UnsupportedStrategy):
+            await StubFactory.acreate()
+        with self.assertRaises(errors.UnsupportedStrategy):
+            await StubFactory.acreate_batch(2)
+
+
 class SelfReferentialTests(unittest.TestCase):
     def test_no_parent(self):
         from .cyclic import self_ref
@@ -162,3 +162,58 @@ class ResetableIteratorTestCase(unittest.TestCase):
         self.assertEqual(2, next(iterator))
         self.assertEqual(3, next(iterator))
         self.assertEqual(4, next(iterator))
+
+
+class CyclingIteratorTestCase(unittest.TestCase):
+    def take(self, iterator, count):
+        return [next(iterator) for _i in range(count)]
+
+    def test_reiterable(self):
+        i = utils.CyclingIterator([1, 2, 3])
+        self.assertEqual([1, 2, 3, 1, 2], self.take(i, 5))
+        # Values of re-iterable sources are not kept.
+        self.assertEqual([], i.buffer)
+        i.reset()
+        self.assertEqual([1, 2], self.take(i, 2))
+
+    def test_one_shot(self):
+        i = utils.CyclingIterator(iter([1, 2, 3]))
+        self.assertEqual([1, 2], self.take(i, 2))
+        i.reset()
+        self.assertEqual([1, 2, 3, 1, 2, 3, 1], self.take(i, 7))
+        self.assertEqual([1, 2, 3], i.buffer)
+
+    def test_no_cycle(self):
+        i = utils.CyclingIterator(iter([1, 2]), cycle=False)
+        self.assertEqual([1, 2], list(i))
+        i.reset()
+        self.assertEqual([1, 2], list(i))
+
+    def test_streaming(self):
+        i = utils.CyclingIterator(iter([1, 2, 3]), cycle=False, resettable=False)
+        self.assertEqual([1, 2, 3], list(i))
+        self.assertEqual([], i.buffer)
+        with self.assertRaises(ValueError):
+            i.reset()
+
+    def test_empty(self):
+        for source in ([], iter([])):
+            with self.assertRaises(StopIteration):
+                next(utils.CyclingIterator(source))
+
+    def test_value_at(self):
+        for source in ([1, 2, 3], iter([1, 2, 3]), {1: None, 2: None, 3: None}):
+            i = utils.CyclingIterator(source)
+            self.assertEqual([3, 1, 2], [i.value_at(index) for index in (2, 3, 7)])
+            self.assertEqual(1, next(i))
+        i = utils.CyclingIterator([1, 2, 3], cycle=False)
+        with self.assertRaises(StopIteration):
+            i.value_at(3)
+
+    def test_value_at_reiterable(self):
+        source = {1: None, 2: None, 3: None, 4: None}
+        i = utils.CyclingIterator(source.keys())
+        self.assertEqual(2, i.value_at(1))
+        # The source is only read as far as needed.
+        self.assertEqual([1, 2], i.indexed)
+        self.assertEqual(1, i.value_at(4))